@@ -5,4 +5,6 @@ from .agents import (
     SendStrategy,
     StrategyAgent,
 )
+from .config import SimulationConfig
+from .engine import run_simulation
 from .runner import Runner
@@ -1,3 +1,4 @@
 from .base import BaseAgent
 from .strategy_based import AcceptStrategy, SendStrategy, StrategyAgent
 from .with_trust import AgentWithTrust
+from .memetic import MemeticAgent
@@ -9,6 +9,7 @@ from jmetal.core.solution import Solution
 class BaseAgent:
     POPULATION_PART_TO_SWAP = 0.1
     last_shared_solutions = None
+    last_filtered_migrants = []  # Migrants dropped as near-duplicates by the last use_shared_solutions
     id = -1
 
     def __init__(self, algorithm: GeneticAlgorithm, *args, **kwargs):
@@ -0,0 +1,102 @@
+from functools import cmp_to_key
+from typing import Optional
+
+import numpy as np
+
+from jmetal.core.problem import BinaryProblem
+from jmetal.core.solution import Solution
+from jmetal.util.termination_criterion import StoppingByEvaluations
+
+from ..local_search import pattern_search, tabu_search
+from .strategy_based import StrategyAgent
+
+
+class MemeticAgent(StrategyAgent):
+    """
+    StrategyAgent that refines solutions with a budgeted local search after every exchange: its best solutions
+    and the best migrants it accepted in the exchange. Float problems use coordinate / pattern search, LABS uses
+    single-flip tabu search. Local search evaluations are added to `algorithm.evaluations`, so they are paid from
+    the same budget as the generations of the GA (under a budget scheduler, from the island's allocation).
+    """
+
+    LOCAL_SEARCH_ELITES = 1  # Best solutions of the population refined after every exchange
+    LOCAL_SEARCH_MIGRANTS = 2  # Best accepted migrants refined after every exchange
+    LOCAL_SEARCH_EVALUATIONS = 150  # Evaluations of one local search
+    PATTERN_SEARCH_STEP = 0.01  # Initial step as part of the variable range, where the population has no spread
+    TABU_MAX_TENURE = 0.1  # Maximal tabu tenure as part of the sequence length
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.accepted_migrants = []
+        # Local search results that were not changed since, refining them again would waste evaluations
+        self.refined = []
+        self.local_search_evaluations = 0
+        self.local_searches = 0
+        self.local_search_improvements = 0
+
+    def use_shared_solutions(self, shared_solutions: list[Solution], agent_id_sharing_the_solution, population_cutoff):
+        offered = list(shared_solutions)  # extended in place by AcceptStrategy.Always
+        super().use_shared_solutions(shared_solutions, agent_id_sharing_the_solution, population_cutoff)
+        population_ids = {id(solution) for solution in self.algorithm.solutions}
+        self.accepted_migrants.extend(solution for solution in offered if id(solution) in population_ids)
+
+    def remaining_evaluations(self) -> int:
+        criterion = self.algorithm.termination_criterion
+        if not isinstance(criterion, StoppingByEvaluations):
+            return self.__class__.LOCAL_SEARCH_EVALUATIONS
+        return max(criterion.max_evaluations - self.algorithm.evaluations, 0)
+
+    def local_search(self, solution: Solution, max_evaluations: int) -> tuple[Solution, int]:
+        if isinstance(self.algorithm.problem, BinaryProblem):
+            return tabu_search(solution, max_evaluations, self.np_rng, self.__class__.TABU_MAX_TENURE)
+        population = np.array([solution.variables for solution in self.algorithm.solutions], dtype=float)
+        spread = population.std(axis=0)
+        default_step = self.__class__.PATTERN_SEARCH_STEP * (
+            np.asarray(self.algorithm.problem.upper_bound, dtype=float)
+            - np.asarray(self.algorithm.problem.lower_bound, dtype=float)
+        )
+        step = np.where(spread > 0, spread, default_step)
+        return pattern_search(solution, self.algorithm.problem, max_evaluations, step, self.np_rng)
+
+    def refine_solutions(self, max_evaluations: Optional[int] = None) -> None:
+        ### Called by the Runner after every exchange: local search on the elites and the accepted migrants, using at
+        ### most max_evaluations (None = what is left of the agent's own budget)
+        budget = self.remaining_evaluations() if max_evaluations is None else max_evaluations
+        solutions = self.algorithm.solutions
+        compare = cmp_to_key(self.algorithm.solution_comparator.compare)
+        # The refill of use_shared_solutions appends to the end of the population
+        solutions.sort(key=compare)
+        population_ids = {id(solution) for solution in solutions}
+        self.refined = [solution for solution in self.refined if id(solution) in population_ids]
+        refined_ids = {id(solution) for solution in self.refined}
+
+        migrants = sorted(
+            (solution for solution in self.accepted_migrants if id(solution) in population_ids), key=compare
+        )[: self.__class__.LOCAL_SEARCH_MIGRANTS]
+        self.accepted_migrants = []
+        elites = [solution for solution in solutions[: self.__class__.LOCAL_SEARCH_ELITES] if id(solution) not in refined_ids]
+        candidates = list({id(solution): solution for solution in elites + migrants}.values())
+
+        for candidate in candidates:
+            search_evaluations = min(self.__class__.LOCAL_SEARCH_EVALUATIONS, budget)
+            if search_evaluations <= 0:
+                break
+            result, evaluations = self.local_search(candidate, search_evaluations)
+            budget -= evaluations
+            self.algorithm.evaluations += evaluations
+            self.local_search_evaluations += evaluations
+            self.local_searches += 1
+            if result is not candidate:
+                self.local_search_improvements += 1
+                solutions[next(index for index, solution in enumerate(solutions) if solution is candidate)] = result
+            self.refined.append(result)
+        solutions.sort(key=compare)
+        # The termination criterion only sees the evaluations when notified (update_progress would add a step)
+        self.algorithm.observable.notify_all(**self.algorithm.observable_data())
+
+    def local_search_statistics(self) -> dict:
+        return {
+            "searches": self.local_searches,
+            "improvements": self.local_search_improvements,
+            "evaluations": self.local_search_evaluations,
+        }
@@ -12,6 +12,7 @@ from jmetal.algorithm.singleobjective import GeneticAlgorithm
 from jmetal.core.solution import Solution
 from jmetal.core.problem import BinaryProblem
 
+from ..duplicate_filter import DuplicateFilter
 from .base import BaseAgent
 
 
@@ -71,6 +72,9 @@ class StrategyAgent(BaseAgent):
         no_send_penalty: Optional[int] = 0,
         part_to_swap: Optional[float] = 0.1,
         id: int = -1,
+        rng: Optional[random.Random] = None,
+        np_rng: Optional[np.random.Generator] = None,
+        duplicate_radius: Optional[float] = None,
     ):
         self.algorithm = algorithm
         self.send_strategy = send_strategy
@@ -79,6 +83,11 @@ class StrategyAgent(BaseAgent):
         self.no_send_penalty = no_send_penalty
         self.part_to_swap = part_to_swap
         self.id = id
+        self.rng = rng if rng is not None else random
+        # NumPy stream of the island, for agents that draw NumPy random numbers
+        self.np_rng = np_rng if np_rng is not None else np.random.default_rng()
+        # Migrants within duplicate_radius of the population are not accepted (None = no filtering)
+        self.duplicate_filter = DuplicateFilter(duplicate_radius) if duplicate_radius is not None else None
 
         if trust_mechanism is None:
             self.trust = None
@@ -129,7 +138,7 @@ class StrategyAgent(BaseAgent):
                 ) : -index_of_best_solution_to_share
             ]
         elif self.send_strategy is SendStrategy.Random:
-            chosen_solutions = random.sample(
+            chosen_solutions = self.rng.sample(
                 self.algorithm.solutions, solutions_to_share
             )
         elif self.send_strategy is SendStrategy.Dont:
@@ -154,10 +163,20 @@ class StrategyAgent(BaseAgent):
         starting_solutions.sort(
             key=cmp_to_key(self.algorithm.solution_comparator.compare)
         )
+
+        # Near-duplicates of the population or of each other would only take population slots
+        migrants = shared_solutions
+        self.last_filtered_migrants = []
+        if self.duplicate_filter is not None and self.accept_strategy is not AcceptStrategy.Reject:
+            migrants = self.duplicate_filter.filter(shared_solutions, self.algorithm.solutions, self.algorithm.problem)
+            migrant_ids = {id(migrant) for migrant in migrants}
+            self.last_filtered_migrants = [
+                solution for solution in shared_solutions if id(solution) not in migrant_ids
+            ]
         
         if self.accept_strategy is AcceptStrategy.Always:
-            shared_solutions.extend(self.algorithm.solutions)
-            self.algorithm.solutions = shared_solutions[
+            migrants.extend(self.algorithm.solutions)
+            self.algorithm.solutions = migrants[
                 : population_cutoff
             ]
 
@@ -166,7 +185,7 @@ class StrategyAgent(BaseAgent):
                 key=cmp_to_key(self.algorithm.solution_comparator.compare)
             )
         elif self.accept_strategy is AcceptStrategy.Better:   
-            self.algorithm.solutions.extend(shared_solutions)
+            self.algorithm.solutions.extend(migrants)
             self.algorithm.solutions.sort(
                 key=cmp_to_key(self.algorithm.solution_comparator.compare)
             )
@@ -183,7 +202,7 @@ class StrategyAgent(BaseAgent):
                 positive_count = 0
                 negative_count = 0
                 if len(shared_solutions) > 0:
-                    for shared_solution in shared_solutions:
+                    for shared_solution in migrants:
                         if shared_solution in self.algorithm.solutions:
                             # A useful solution was shared.
                             positive_count += 1
@@ -204,7 +223,7 @@ class StrategyAgent(BaseAgent):
         elif self.accept_strategy is AcceptStrategy.Reject:
             pass
         elif self.accept_strategy is AcceptStrategy.Different:
-            self.algorithm.solutions.extend(shared_solutions)
+            self.algorithm.solutions.extend(migrants)
             self.algorithm.solutions = self.rank_outliers()[
                 : population_cutoff
             ]
@@ -222,7 +241,7 @@ class StrategyAgent(BaseAgent):
                 positive_count = 0
                 negative_count = 0
                 if len(shared_solutions) > 0:
-                    for shared_solution in shared_solutions:
+                    for shared_solution in migrants:
                         if shared_solution in self.algorithm.solutions:
                             # A useful solution was shared.
                             positive_count += 1
@@ -251,7 +270,7 @@ class StrategyAgent(BaseAgent):
             if candidate not in self.algorithm.solutions:
                 self.algorithm.solutions.append(candidate)
         # Fill in with new solutions if needed
-        if len(self.algorithm.solutions) < self.algorithm.population_size:
+        while len(self.algorithm.solutions) < self.algorithm.population_size:
             parents_for_crossover = (
                 self.algorithm.crossover_operator.get_number_of_parents()
             )
@@ -259,6 +278,14 @@ class StrategyAgent(BaseAgent):
                 : len(self.algorithm.solutions)
                 - len(self.algorithm.solutions) % parents_for_crossover
             ]
+            if len(mating_population) < self.algorithm.offspring_population_size:
+                # Too few solutions left (e.g. duplicates were dropped) for a full offspring population, reuse parents
+                mating_population = [
+                    self.algorithm.solutions[index % len(self.algorithm.solutions)]
+                    for index in range(
+                        ceil(self.algorithm.offspring_population_size / parents_for_crossover) * parents_for_crossover
+                    )
+                ]
             new_solutions = self.algorithm.reproduction(mating_population)
             self.algorithm.solutions.extend(
                 new_solutions[
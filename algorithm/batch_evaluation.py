@@ -0,0 +1,52 @@
+from functools import partial
+from multiprocessing import Pool
+from typing import Optional
+
+import numpy as np
+
+from jmetal.core.problem import Problem
+from jmetal.core.solution import Solution
+
+
+def evaluate_solutions(solutions: list[Solution], problem: Problem) -> list[Solution]:
+    """Evaluates the solutions with one vectorized call if the problem provides `evaluate_batch`."""
+    if hasattr(problem, "evaluate_batch"):
+        return problem.evaluate_batch(solutions)
+    for solution in solutions:
+        problem.evaluate(solution)
+    return solutions
+
+
+def _evaluate_chunk(solutions: list[Solution], problem: Problem) -> list[list[float]]:
+    return [solution.objectives for solution in evaluate_solutions(solutions, problem)]
+
+
+class BatchEvaluator:
+    """
+    Evaluates the offspring of all islands of one generation together, either in the current process
+    or split into chunks over a pool of `processes` workers.
+    """
+
+    def __init__(self, processes: Optional[int] = None):
+        self.processes = processes
+        self.pool = Pool(processes) if processes is not None else None
+
+    def evaluate(self, solutions: list[Solution], problem: Problem) -> list[Solution]:
+        if self.pool is None or len(solutions) < 2:
+            return evaluate_solutions(solutions, problem)
+
+        chunks = [list(chunk) for chunk in np.array_split(np.arange(len(solutions)), self.processes) if len(chunk) > 0]
+        chunked_objectives = self.pool.map(
+            partial(_evaluate_chunk, problem=problem),
+            [[solutions[index] for index in chunk] for chunk in chunks],
+        )
+        # Workers evaluate copies, only the objectives are handed back
+        for chunk, objectives in zip(chunks, chunked_objectives):
+            for index, solution_objectives in zip(chunk, objectives):
+                solutions[index].objectives = solution_objectives
+        return solutions
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
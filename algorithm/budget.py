@@ -0,0 +1,178 @@
+import math
+
+from abc import ABC, abstractmethod
+from enum import Enum
+from math import ceil
+from typing import Sequence
+
+from .agents.base import BaseAgent
+
+
+class BudgetPolicy(Enum):
+    Uniform = 1  # Every island gets the same budget (shared StoppingByEvaluations)
+    UCB = 2
+
+    def __str__(self):
+        return self.name
+
+
+def distribute_steps(total_steps: int, weights: Sequence[float], min_steps: int) -> list[int]:
+    """Splits `total_steps` between islands proportionally to `weights`, giving each at least `min_steps` if possible."""
+    number_of_islands = len(weights)
+    base = min(min_steps, total_steps // number_of_islands)
+    rest = total_steps - base * number_of_islands
+    weight_sum = sum(weights)
+    if weight_sum > 0:
+        shares = [rest * weight / weight_sum for weight in weights]
+    else:
+        shares = [rest / number_of_islands] * number_of_islands
+    allocation = [base + int(share) for share in shares]
+    # Largest remainder method for the steps lost by rounding down
+    leftover = total_steps - sum(allocation)
+    by_remainder = sorted(
+        range(number_of_islands), key=lambda i: shares[i] - int(shares[i]), reverse=True
+    )
+    for island_index in by_remainder[:leftover]:
+        allocation[island_index] += 1
+    return allocation
+
+
+class BudgetScheduler(ABC):
+    """
+    Reallocates the total evaluation budget (max_evaluations_per_agent * number of islands) between islands
+    at the start of every migration epoch (generations_per_swap generations), based on their recent improvement.
+    The budget is handed out in algorithm steps, each costing offspring_population_size evaluations.
+    """
+
+    def __init__(self, max_evaluations_per_agent: int, min_steps_per_epoch: int = 1):
+        self.max_evaluations_per_agent = max_evaluations_per_agent
+        self.min_steps_per_epoch = min_steps_per_epoch
+        self.log = {"epoch": [], "generation": [], "allocation": [], "scores": []}
+
+    def init(self, agents: Sequence[BaseAgent], generations_per_swap: int) -> None:
+        self.number_of_islands = len(agents)
+        self.generations_per_swap = generations_per_swap
+        self.total_evaluations = self.max_evaluations_per_agent * self.number_of_islands
+        # Same number of steps the islands would perform with a per agent StoppingByEvaluations
+        self.total_steps = sum(
+            ceil(
+                (self.max_evaluations_per_agent - agent.algorithm.population_size)
+                / agent.algorithm.offspring_population_size
+            )
+            for agent in agents
+        )
+        self.offspring_population_sizes = [agent.algorithm.offspring_population_size for agent in agents]
+        self.spent_steps = 0
+        self.epoch = 0
+        self.allocation = [0] * self.number_of_islands
+        self.epoch_start_best = [0.0] * self.number_of_islands
+
+    def start_epoch(self, agents: Sequence[BaseAgent], generation: int) -> None:
+        epoch_steps = max(
+            min(self.number_of_islands * self.generations_per_swap, self.total_steps - self.spent_steps), 0
+        )
+        scores = self.island_scores()
+        self.allocation = distribute_steps(epoch_steps, scores, self.min_steps_per_epoch)
+        self.spent_steps += epoch_steps
+        self.epoch_start_best = [agent.algorithm.result().objectives[0] for agent in agents]
+
+        self.log["epoch"].append(self.epoch)
+        self.log["generation"].append(generation)
+        self.log["allocation"].append(
+            "_".join(f"{agent_id}:{steps}" for agent_id, steps in enumerate(self.allocation))
+        )
+        self.log["scores"].append(
+            "_".join(f"{agent_id}:{score:.3f}" for agent_id, score in enumerate(scores))
+        )
+
+    def steps_in_generation(self, agent_index: int, generation_in_epoch: int) -> int:
+        # Spreads the island's epoch allocation evenly over the generations of the epoch
+        steps = self.allocation[agent_index]
+        return (
+            (generation_in_epoch + 1) * steps // self.generations_per_swap
+            - generation_in_epoch * steps // self.generations_per_swap
+        )
+
+    def remaining_evaluations(self, agent_index: int, agents: Sequence[BaseAgent]) -> int:
+        """
+        Evaluations an island may spend outside its algorithm steps (e.g. local search) after an epoch: at most
+        the evaluations of its allocation in that epoch and what is left of the total budget.
+        """
+        left = self.total_evaluations - sum(agent.algorithm.evaluations for agent in agents)
+        allocated = self.allocation[agent_index] * self.offspring_population_sizes[agent_index]
+        return max(min(allocated, left), 0)
+
+    def charge(self, agent_index: int, evaluations: int) -> None:
+        # Evaluations spent outside the algorithm steps are taken from the steps of the following epochs
+        self.spent_steps += ceil(evaluations / self.offspring_population_sizes[agent_index])
+
+    def end_epoch(self, agents: Sequence[BaseAgent]) -> None:
+        improvements = []
+        for start_best, agent in zip(self.epoch_start_best, agents):
+            end_best = agent.algorithm.result().objectives[0]
+            improvements.append(max(0.0, (start_best - end_best) / max(abs(start_best), 1e-12)))
+        self.update(improvements, self.allocation)
+        self.epoch += 1
+
+    @abstractmethod
+    def island_scores(self) -> list[float]:
+        pass
+
+    @abstractmethod
+    def update(self, improvements: list[float], allocation: list[int]) -> None:
+        pass
+
+    def save_log(self, log_file_path: str):
+        import pandas as pd
+
+        pd.DataFrame(self.log).to_csv(log_file_path, index=False)
+
+
+class UCBBudgetScheduler(BudgetScheduler):
+    """
+    UCB1 over islands: the reward of an island is its relative improvement per step in the last epoch,
+    normalized by the best island of that epoch. Islands left without budget keep a growing exploration bonus.
+    """
+
+    def __init__(
+        self,
+        max_evaluations_per_agent: int,
+        exploration: float = 0.5,
+        min_steps_per_epoch: int = 1,
+    ):
+        super().__init__(max_evaluations_per_agent, min_steps_per_epoch)
+        self.exploration = exploration
+
+    def init(self, agents, generations_per_swap):
+        super().init(agents, generations_per_swap)
+        self.counts = [0] * self.number_of_islands
+        self.mean_rewards = [0.0] * self.number_of_islands
+
+    def island_scores(self):
+        if self.epoch == 0:
+            return [1.0] * self.number_of_islands
+        total_count = sum(self.counts)
+        scores = []
+        for count, mean_reward in zip(self.counts, self.mean_rewards):
+            if count == 0:
+                scores.append(1.0 + self.exploration)
+            else:
+                scores.append(
+                    mean_reward + self.exploration * math.sqrt(math.log(total_count) / count)
+                )
+        return scores
+
+    def update(self, improvements, allocation):
+        rates = [
+            improvement / steps if steps > 0 else 0.0
+            for improvement, steps in zip(improvements, allocation)
+        ]
+        best_rate = max(rates)
+        for island_index, steps in enumerate(allocation):
+            if steps == 0:
+                continue
+            reward = rates[island_index] / best_rate if best_rate > 0 else 0.0
+            self.counts[island_index] += 1
+            self.mean_rewards[island_index] += (
+                reward - self.mean_rewards[island_index]
+            ) / self.counts[island_index]
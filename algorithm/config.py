@@ -0,0 +1,52 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from .agents.strategy_based import MigrationPolicy, TrustMechanism
+from .budget import BudgetPolicy
+from .numpy_ga import GAEngine
+
+
+@dataclass
+class SimulationConfig:
+    """
+    All parameters of a single simulation run, so the engine does not need analysis.constants_and_params.
+    Defaults follow the standard experiment setup.
+    """
+
+    # Experiment type
+    trust_mechanism: Optional[TrustMechanism] = TrustMechanism.Global
+    migration_policy: MigrationPolicy = MigrationPolicy.TrustBasedAuction
+    starting_trust: int = 12
+    auction_weight: float = 0.4
+    # Base parameters
+    max_evaluations: int = 20000  # Counted per agent
+    population_size: int = 20
+    offspring_population_size: int = 10
+    crossover_rate: float = 0.9
+    mutation_rate: float = 0.1
+    agents_number: int = 12
+    migration: bool = True
+    generations_per_swap: int = 50
+    population_part_to_swap: float = 0.5  # Part of the population an agent shares
+    exchange_part_to_swap: float = 0.5  # Population cutoff used by the ExchangeMarket, independent of population_part_to_swap
+    no_send_penalty: int = 10
+    duplicate_radius: Optional[float] = None  # Migrants this close to the receiving population are dropped, None = accept duplicates
+    seed: Optional[int] = None
+    # Run-level stopping criteria (None = disabled)
+    target_fitness: Optional[float] = None
+    stagnation_exchanges: Optional[int] = None
+    stagnation_tolerance: float = 0.0
+    max_wall_clock_seconds: Optional[float] = None
+    # Evaluation budget
+    budget_policy: BudgetPolicy = BudgetPolicy.Uniform
+    ucb_exploration: float = 0.5
+    batch_evaluation: bool = False
+    batch_evaluation_processes: Optional[int] = None
+    # Island GA implementation
+    ga_engine: GAEngine = GAEngine.Jmetal
+    # Output
+    log_interval: int = 1
+    log_trust_on_change: bool = False
+    telemetry_target: Optional[str] = None
+    save_summary: bool = True  # Streaming run statistics saved next to the log as <run>_summary.json
+    save_exchange_events: bool = True  # Structured exchange records saved as <run>_exchange_events.bin
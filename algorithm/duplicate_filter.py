@@ -0,0 +1,77 @@
+import numpy as np
+
+from jmetal.core.problem import BinaryProblem, Problem
+from jmetal.core.solution import Solution
+
+
+class DuplicateFilter:
+    """
+    Drops migrants within `radius` of a solution of the receiving population or of an earlier kept migrant.
+
+    Float problems: Euclidean distance with every variable scaled by its range (the search box becomes the unit
+    cube), found with a KD-tree of the population. Binary problems (LABS): Hamming distance as a part of the number
+    of bits, computed on bit-packed sequences with XOR and popcount; radius 0 (exact duplicates only) looks the
+    packed sequences up in a hash set instead.
+    """
+
+    def __init__(self, radius: float):
+        self.radius = radius
+
+    def filter(self, migrants: list[Solution], population: list[Solution], problem: Problem) -> list[Solution]:
+        if not migrants or not population:
+            return list(migrants)
+        if isinstance(problem, BinaryProblem):
+            duplicates = self.binary_duplicates(migrants, population)
+        else:
+            duplicates = self.float_duplicates(migrants, population, problem)
+        return [migrant for migrant, duplicate in zip(migrants, duplicates) if not duplicate]
+
+    @staticmethod
+    def keep_first(close_to_population: np.ndarray, migrant_pairs) -> np.ndarray:
+        ### Duplicate flags: migrants close to the population, or close to an earlier migrant that was kept
+        neighbours = [[] for _ in close_to_population]
+        for first, second in migrant_pairs:
+            neighbours[max(first, second)].append(min(first, second))
+        duplicates = close_to_population.copy()
+        for migrant, earlier in enumerate(neighbours):
+            if not duplicates[migrant] and any(not duplicates[other] for other in earlier):
+                duplicates[migrant] = True
+        return duplicates
+
+    def float_duplicates(self, migrants: list[Solution], population: list[Solution], problem: Problem) -> np.ndarray:
+        from scipy.spatial import cKDTree
+
+        scale = np.asarray(problem.upper_bound, dtype=float) - np.asarray(problem.lower_bound, dtype=float)
+        migrant_points = np.array([migrant.variables for migrant in migrants], dtype=float) / scale
+        population_points = np.array([solution.variables for solution in population], dtype=float) / scale
+        close_to_population = cKDTree(population_points).query_ball_point(
+            migrant_points, self.radius, return_length=True
+        ) > 0
+        migrant_pairs = cKDTree(migrant_points).query_pairs(self.radius)
+        return self.keep_first(close_to_population, migrant_pairs)
+
+    def binary_duplicates(self, migrants: list[Solution], population: list[Solution]) -> np.ndarray:
+        def packed(solutions):
+            return np.packbits(
+                np.array([[bit for variable in solution.variables for bit in variable] for solution in solutions], dtype=bool),
+                axis=1,
+            )
+
+        migrant_bits, population_bits = packed(migrants), packed(population)
+        max_distance = int(self.radius * sum(len(variable) for variable in migrants[0].variables))
+
+        if max_distance == 0:
+            seen = {row.tobytes() for row in population_bits}
+            duplicates = np.zeros(len(migrants), dtype=bool)
+            for migrant, row in enumerate(migrant_bits):
+                key = row.tobytes()
+                duplicates[migrant] = key in seen
+                seen.add(key)
+            return duplicates
+
+        def distances(first, second):
+            return np.bitwise_count(first[:, None, :] ^ second[None, :, :]).sum(axis=2)
+
+        close_to_population = np.any(distances(migrant_bits, population_bits) <= max_distance, axis=1)
+        first, second = np.nonzero(np.triu(distances(migrant_bits, migrant_bits) <= max_distance, k=1))
+        return self.keep_first(close_to_population, zip(first, second))
@@ -0,0 +1,93 @@
+from copy import deepcopy
+
+from jmetal.core.problem import BinaryProblem, Problem
+from jmetal.operator import BinaryTournamentSelection
+from jmetal.operator.crossover import SBXCrossover, SPXCrossover
+from jmetal.operator.mutation import BitFlipMutation, SimpleRandomMutation
+from jmetal.util.termination_criterion import StoppingByEvaluations
+
+from .batch_evaluation import BatchEvaluator
+from .budget import BudgetPolicy, UCBBudgetScheduler
+from .config import SimulationConfig
+from .runner import Runner
+from .telemetry import TelemetryStream
+from .termination import build_run_termination_criteria
+
+
+def run_simulation(
+    config: SimulationConfig,
+    agent_class,
+    problem: Problem,
+    output_file_path: str,
+    accept_strategy,
+    send_strategy,
+    save_log: bool = True,
+) -> float:
+    """Builds the Runner for the given configuration, runs it and returns the best fitness over all agents."""
+    mutation = (
+        BitFlipMutation(config.mutation_rate)
+        if isinstance(problem, BinaryProblem)
+        else SimpleRandomMutation(config.mutation_rate)
+    )
+    crossover = (
+        SPXCrossover(config.crossover_rate) if isinstance(problem, BinaryProblem) else SBXCrossover(config.crossover_rate)
+    )
+
+    budget_scheduler = (
+        UCBBudgetScheduler(config.max_evaluations, exploration=config.ucb_exploration)
+        if config.budget_policy is BudgetPolicy.UCB
+        else None
+    )
+
+    telemetry = TelemetryStream(config.telemetry_target) if config.telemetry_target is not None else None
+    batch_evaluator = BatchEvaluator(config.batch_evaluation_processes) if config.batch_evaluation else None
+
+    runner = Runner(
+        output_file_path=output_file_path,
+        agent_class=agent_class,
+        agents_number=config.agents_number,  # Needed only for single class, non strategy based agents
+        generations_per_swap=config.generations_per_swap,
+        problem=deepcopy(problem),
+        population_size=config.population_size,
+        offspring_population_size=config.offspring_population_size,
+        mutation=mutation,
+        crossover=crossover,
+        selection=BinaryTournamentSelection(),
+        termination_criterion=StoppingByEvaluations(max_evaluations=config.max_evaluations),
+        send_strategy=send_strategy,
+        accept_strategy=accept_strategy,
+        migration=config.migration,
+        migration_policy=config.migration_policy,
+        trust_mechanism=config.trust_mechanism,
+        starting_trust=config.starting_trust,
+        no_send_penalty=config.no_send_penalty,
+        part_to_swap=config.population_part_to_swap,
+        exchange_part_to_swap=config.exchange_part_to_swap,
+        auction_weight=config.auction_weight,
+        save_log=save_log,
+        log_interval=config.log_interval,
+        log_trust_on_change=config.log_trust_on_change,
+        seed=config.seed,
+        run_termination_criteria=build_run_termination_criteria(
+            target_fitness=config.target_fitness,
+            stagnation_exchanges=config.stagnation_exchanges,
+            stagnation_tolerance=config.stagnation_tolerance,
+            max_seconds=config.max_wall_clock_seconds,
+        ),
+        budget_scheduler=budget_scheduler,
+        telemetry=telemetry,
+        batch_evaluator=batch_evaluator,
+        save_summary=config.save_summary,
+        save_exchange_events=config.save_exchange_events,
+        ga_engine=config.ga_engine,
+        duplicate_radius=config.duplicate_radius,
+    )
+    runner.run_simulation()
+    if telemetry is not None:
+        telemetry.close()
+    if batch_evaluator is not None:
+        batch_evaluator.close()
+
+    best_result = min(agent.algorithm.result().objectives[0] for agent in runner.agents)
+
+    return best_result
@@ -0,0 +1,146 @@
+from typing import Optional
+
+import numpy as np
+
+# Fields of version 1, the headerless format written before migrants_filtered was added
+_EXCHANGE_EVENT_FIELDS_V1 = [
+    ("exchange", "<i4"),  # Index of the exchange in the run, from 0
+    ("generation", "<i4"),  # Generation after which the exchange happened (-1 if unknown)
+    ("base_agent", "<i2"),  # Agent that chose (or was randomly paired with) the partner
+    ("partner", "<i2"),
+    ("receiver", "<i2"),  # Agent receiving the migrants of this row
+    ("sender", "<i2"),
+    ("bid", "<f4"),  # Roulette weight / auction bid of the partner for the base agent, NaN for Basic pairing
+    ("migrants_sent", "<i2"),
+    ("migrants_accepted", "<i2"),  # Migrants that ended up in the receiver's population
+    ("trust_before", "<i2"),  # Trust of the receiver towards the sender, -1 without trust
+    ("trust_after", "<i2"),
+]
+# Record layout of every file format version. Fields added by a version are 0 in upgraded older logs.
+EXCHANGE_EVENT_DTYPES = {
+    1: np.dtype(_EXCHANGE_EVENT_FIELDS_V1),
+    2: np.dtype(
+        _EXCHANGE_EVENT_FIELDS_V1
+        + [
+            ("migrants_filtered", "<i2"),  # Migrants dropped by the receiver as near-duplicates of its population
+        ]
+    ),
+}
+EXCHANGE_EVENTS_VERSION = 2
+# One row per migration direction of every exchanged pair (two rows per pair)
+EXCHANGE_EVENT_DTYPE = EXCHANGE_EVENT_DTYPES[EXCHANGE_EVENTS_VERSION]
+# File header: magic, format version and record size. The first record of a headerless version 1 log starts
+# with exchange 0, so it can not be mistaken for the magic.
+EXCHANGE_EVENTS_MAGIC = b"EXEVENTS"
+EXCHANGE_EVENTS_HEADER_DTYPE = np.dtype([("magic", "S8"), ("version", "<u4"), ("record_size", "<u4")])
+NO_TRUST = -1
+
+
+class ExchangeEventLog:
+    """
+    Append-only exchange event log. A header with the format version is followed by raw EXCHANGE_EVENT_DTYPE
+    records, appended and flushed after every exchange, so the log of an interrupted run is complete up to its
+    last exchange.
+    A whole log is read with one call: read_exchange_events(path).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(
+            np.array(
+                (EXCHANGE_EVENTS_MAGIC, EXCHANGE_EVENTS_VERSION, EXCHANGE_EVENT_DTYPE.itemsize),
+                dtype=EXCHANGE_EVENTS_HEADER_DTYPE,
+            ).tobytes()
+        )
+        self.file.flush()
+        self.rows = []
+
+    def add(
+        self,
+        exchange: int,
+        generation: Optional[int],
+        base_agent: int,
+        partner: int,
+        receiver: int,
+        sender: int,
+        bid: Optional[float],
+        migrants_sent: int,
+        migrants_accepted: int,
+        trust_before: Optional[int],
+        trust_after: Optional[int],
+        migrants_filtered: int = 0,
+    ) -> None:
+        self.rows.append(
+            (
+                exchange,
+                -1 if generation is None else generation,
+                base_agent,
+                partner,
+                receiver,
+                sender,
+                np.nan if bid is None else bid,
+                migrants_sent,
+                migrants_accepted,
+                NO_TRUST if trust_before is None else trust_before,
+                NO_TRUST if trust_after is None else trust_after,
+                migrants_filtered,
+            )
+        )
+
+    def flush(self) -> None:
+        if self.rows:
+            self.file.write(np.array(self.rows, dtype=EXCHANGE_EVENT_DTYPE).tobytes())
+            self.file.flush()
+            self.rows = []
+
+    def close(self) -> None:
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+
+def read_exchange_events(path: str) -> np.ndarray:
+    """
+    Structured array of all events of a log (pd.DataFrame(...) turns it into a data frame), in the current
+    EXCHANGE_EVENT_DTYPE. Logs of older format versions are upgraded, unknown or corrupt ones raise ValueError.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+
+    header_size = EXCHANGE_EVENTS_HEADER_DTYPE.itemsize
+    if data[: len(EXCHANGE_EVENTS_MAGIC)] == EXCHANGE_EVENTS_MAGIC:
+        if len(data) < header_size:
+            raise ValueError(f"{path}: truncated exchange events header")
+        header = np.frombuffer(data, dtype=EXCHANGE_EVENTS_HEADER_DTYPE, count=1)[0]
+        version = int(header["version"])
+        dtype = EXCHANGE_EVENT_DTYPES.get(version)
+        if dtype is None:
+            raise ValueError(
+                f"{path}: exchange events format version {version} is not supported "
+                f"(known versions: {sorted(EXCHANGE_EVENT_DTYPES)})"
+            )
+        if int(header["record_size"]) != dtype.itemsize:
+            raise ValueError(
+                f"{path}: record size {int(header['record_size'])} does not match "
+                f"{dtype.itemsize} of format version {version}"
+            )
+        body = data[header_size:]
+    else:
+        # Headerless logs were written before the format was versioned
+        version, dtype, body = 1, EXCHANGE_EVENT_DTYPES[1], data
+    if len(body) % dtype.itemsize != 0:
+        raise ValueError(
+            f"{path}: {len(body)} bytes of records are not a multiple of the {dtype.itemsize} byte records "
+            f"of format version {version}"
+        )
+    events = np.frombuffer(body, dtype=dtype)
+    if version == 1 and len(events) and (events["exchange"][0] != 0 or np.any(np.diff(events["exchange"]) < 0)):
+        raise ValueError(f"{path}: not an exchange events log (no header and no valid version 1 records)")
+
+    if dtype == EXCHANGE_EVENT_DTYPE:
+        return events.copy()
+    upgraded = np.zeros(len(events), dtype=EXCHANGE_EVENT_DTYPE)
+    for name in dtype.names:
+        upgraded[name] = events[name]
+    return upgraded
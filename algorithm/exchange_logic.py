@@ -1,16 +1,15 @@
 import random
 import numpy as np
-import pandas as pd
-from typing import Type, Sequence
+from typing import Optional, Type, Sequence
 from math import ceil
 
 from .agents.base import BaseAgent 
 from .agents.strategy_based import StrategyAgent
 from collections import defaultdict
 
-from algorithm.agents.strategy_based import MigrationPolicy
-
-from algorithm.agents.strategy_based import AcceptStrategy
+from .agents.strategy_based import AcceptStrategy, MigrationPolicy
+from .config import SimulationConfig
+from .exchange_events import ExchangeEventLog
 
 
 class ExchangeMarket:
@@ -18,52 +17,63 @@ class ExchangeMarket:
         self,
         agents: Sequence[Type[StrategyAgent | BaseAgent]],
         migration: bool = False,
-        auction_weight: float = None,
+        auction_weight: float = SimulationConfig.auction_weight,
+        migration_policy: MigrationPolicy = SimulationConfig.migration_policy,
+        population_part_to_swap: float = SimulationConfig.exchange_part_to_swap,
+        rng: Optional[random.Random] = None,
+        np_rng: Optional[np.random.Generator] = None,
+        event_log: Optional[ExchangeEventLog] = None,
     ):
         self.migration = migration
+        self.migration_policy = migration_policy
+        self.population_part_to_swap = population_part_to_swap
+        # Fall back to the global generators when no dedicated streams are given.
+        self.rng = rng if rng is not None else random
+        self.np_rng = np_rng if np_rng is not None else np.random
         self.auction_trust_weight = auction_weight
         self.auction_solution_weight = 1 - auction_weight
         self.log = {}
+        # Receiving agent id -> (offered, accepted, filtered) migrants of the last exchange
+        self.last_migrants = {}
+        # Structured per migration records, next to the string log above
+        self.event_log = event_log
+        self.exchanges = 0
         self.agents = agents
         self.id2agent = {}
         for agent in self.agents:
             self.id2agent[agent.id] = agent
 
 
-    def exchange_information(self):
-        from analysis.constants_and_params import MIGRATION_POLICY, AUCTION_TRUST_WEIGHT, POPULATION_PART_TO_SWAP
-        
-        if self.auction_trust_weight is None:
-            self.auction_trust_weight = AUCTION_TRUST_WEIGHT
-            self.auction_solution_weight = 1 - AUCTION_TRUST_WEIGHT
-        
+    def exchange_information(self, generation: Optional[int] = None):
         ### Agent pairing
         paired_agents = []
+        pair_bids = []  # Roulette weight / auction bid of every pair, None for random pairing
         pair_string = ""
         if 'pairs' not in self.log:
                 self.log['pairs'] = []
 
         # Pairing based on random selection
-        if MIGRATION_POLICY is MigrationPolicy.Basic:
+        if self.migration_policy is MigrationPolicy.Basic:
             shuffled_agent_list_ids = list(range(len(self.agents)))
-            random.shuffle(shuffled_agent_list_ids)
+            self.rng.shuffle(shuffled_agent_list_ids)
             for i in range(0, len(shuffled_agent_list_ids), 2):
                 paired_agents.append( 
                     (self.agents[shuffled_agent_list_ids[i]], self.agents[shuffled_agent_list_ids[i + 1]])
                 )
+                pair_bids.append(None)
                 # Logging
                 pair_string += f"{shuffled_agent_list_ids[i]}:{shuffled_agent_list_ids[i + 1]}_"
             self.log['pairs'].append(pair_string[:-1])
                     
         # Pairing based on random trust-weighted selection
-        elif MIGRATION_POLICY is MigrationPolicy.TrustBasedRoulette:
+        elif self.migration_policy is MigrationPolicy.TrustBasedRoulette:
             roulette_string = ""
             if 'roulette' not in self.log:
                 self.log['roulette'] = []
             agent_ids = [ agent.id for agent in self.agents ]
             while len(agent_ids) > 1:
                 # Select a base agent randomly
-                base_agent_id = random.choice(agent_ids)
+                base_agent_id = self.rng.choice(agent_ids)
                 agent_ids.remove(base_agent_id)
                 # Calculate trust weights
                 trust_weights = []
@@ -82,9 +92,11 @@ class ExchangeMarket:
                         trust_weights = [ weight / sum(trust_weights) for weight in trust_weights ] # Normalize to sum to 1
                     else:
                         trust_weights = [1]  # If only one agent, it has 100% chance of being selected 
-                    paired_agent_id = np.random.choice(trust_agent_ids, 1, p=trust_weights)[0]
+                    paired_agent_id = self.np_rng.choice(trust_agent_ids, 1, p=trust_weights)[0]
+                    pair_bids.append(trust_weights[trust_agent_ids.index(paired_agent_id)])
                 else: # Scenario in which every remaining agent has max trust (equal 0), so we select with uniform distribution
-                    paired_agent_id = np.random.choice(trust_agent_ids, 1)[0]
+                    paired_agent_id = self.np_rng.choice(trust_agent_ids, 1)[0]
+                    pair_bids.append(1 / len(trust_agent_ids))
                 # Remove the paired agent from the list of available agents and save the pair
                 agent_ids.remove(paired_agent_id)
                 paired_agents.append(
@@ -100,14 +112,14 @@ class ExchangeMarket:
             self.log['roulette'].append(roulette_string[:-1])
 
         # Pairing based on trust and quality auction
-        elif MIGRATION_POLICY is MigrationPolicy.TrustBasedAuction:
+        elif self.migration_policy is MigrationPolicy.TrustBasedAuction:
             auction_string = ""
             if 'auction' not in self.log:
                 self.log['auction'] = []
             agent_ids = [ agent.id for agent in self.agents ]
             while len(agent_ids) > 1:
                 ### Select a base agent randomly
-                base_agent_id = random.choice(agent_ids)
+                base_agent_id = self.rng.choice(agent_ids)
                 agent_ids.remove(base_agent_id)
                 ### Collecting proposals from other agents and base agent's trust towards them
                 proposed_solutions = [ 
@@ -165,7 +177,8 @@ class ExchangeMarket:
                 ### Selection of the best agent based on auction value and pairing it with the base agent + save the pair
                 agent_bids = [ (agent_id, self.auction_trust_weight * trust + self.auction_solution_weight * quality)
                                 for (agent_id, trust), (_, quality) in zip(normalized_trust, normalized_quality) ]
-                best_agent_id = max(agent_bids, key=lambda x: x[1])[0]
+                best_agent_id, best_bid = max(agent_bids, key=lambda x: x[1])
+                pair_bids.append(best_bid)
                 paired_agents.append((self.id2agent[base_agent_id], self.id2agent[best_agent_id]))
                 agent_ids.remove(best_agent_id)
                 # Logging
@@ -178,17 +191,67 @@ class ExchangeMarket:
             self.log['auction'].append(auction_string[:-1])
 
         ### Migration
-        for agent1, agent2 in paired_agents:
+        self.last_migrants = {}
+        for (agent1, agent2), bid in zip(paired_agents, pair_bids):
+            pair = (agent1.id, agent2.id, bid)
             agent1_solutions = agent1.get_solutions_to_share(agent2.id)
             agent2_solutions = agent2.get_solutions_to_share(agent1.id)
             if self.migration:
                 agent1.remove_solutions(agent1_solutions)
                 agent2.remove_solutions(agent2_solutions)
-                agent1.use_shared_solutions(agent2_solutions, agent2.id, population_cutoff=ceil((1-POPULATION_PART_TO_SWAP)*agent1.algorithm.population_size))
-                agent2.use_shared_solutions(agent1_solutions, agent1.id, population_cutoff=ceil((1-POPULATION_PART_TO_SWAP)*agent2.algorithm.population_size))
+                self.migrate(agent1, agent2_solutions, agent2.id, ceil((1-self.population_part_to_swap)*agent1.algorithm.population_size), pair, generation)
+                self.migrate(agent2, agent1_solutions, agent1.id, ceil((1-self.population_part_to_swap)*agent2.algorithm.population_size), pair, generation)
             else:
-                agent1.use_shared_solutions(agent2_solutions, agent2.id, population_cutoff=agent1.algorithm.population_size)
-                agent2.use_shared_solutions(agent1_solutions, agent1.id, population_cutoff=agent2.algorithm.population_size)    
-                
+                self.migrate(agent1, agent2_solutions, agent2.id, agent1.algorithm.population_size, pair, generation)
+                self.migrate(agent2, agent1_solutions, agent1.id, agent2.algorithm.population_size, pair, generation)
+        if self.event_log is not None:
+            self.event_log.flush()
+        self.exchanges += 1
+
+    def migrate(self, receiver, solutions, sender_id, population_cutoff, pair, generation=None) -> None:
+        ### Counts the migrants that made it into the receiver's population and the ones it dropped as near-duplicates
+        ### in self.last_migrants[receiver id] and records the migration in the event log
+        offered = list(solutions)  # use_shared_solutions may extend the passed list
+        trust_before = self.trust_towards(receiver, sender_id)
+        receiver.use_shared_solutions(solutions, sender_id, population_cutoff=population_cutoff)
+        # Membership by identity: Solution.__eq__ compares variables, so a migrant equal to a solution the receiver
+        # already had (or a filtered exact duplicate) would otherwise count as accepted
+        filtered_ids = {id(solution) for solution in receiver.last_filtered_migrants}
+        population_ids = {id(solution) for solution in receiver.algorithm.solutions}
+        accepted = sum(
+            id(solution) in population_ids for solution in offered if id(solution) not in filtered_ids
+        )
+        previous_offered, previous_accepted, previous_filtered = self.last_migrants.get(receiver.id, (0, 0, 0))
+        self.last_migrants[receiver.id] = (
+            previous_offered + len(offered),
+            previous_accepted + accepted,
+            previous_filtered + len(filtered_ids),
+        )
+        if self.event_log is not None:
+            base_agent_id, partner_id, bid = pair
+            self.event_log.add(
+                exchange=self.exchanges,
+                generation=generation,
+                base_agent=base_agent_id,
+                partner=partner_id,
+                receiver=receiver.id,
+                sender=sender_id,
+                bid=bid,
+                migrants_sent=len(offered),
+                migrants_accepted=accepted,
+                migrants_filtered=len(filtered_ids),
+                trust_before=trust_before,
+                trust_after=self.trust_towards(receiver, sender_id),
+            )
+
+    @staticmethod
+    def trust_towards(agent, agent_id) -> Optional[int]:
+        trust = getattr(agent, "trust", None)
+        if trust is None or trust.get(agent_id) is None:
+            return None
+        return int(trust[agent_id])
+
     def save_log(self, log_file_path: str):
+        import pandas as pd
+
         pd.DataFrame(self.log).to_csv(log_file_path, index=False)
\ No newline at end of file
@@ -0,0 +1,111 @@
+from copy import copy
+
+import numpy as np
+
+from jmetal.core.problem import Problem
+from jmetal.core.solution import BinarySolution, FloatSolution
+
+from .problems import batch_energy
+
+
+def pattern_search(
+    solution: FloatSolution,
+    problem: Problem,
+    max_evaluations: int,
+    step: np.ndarray,
+    rng: np.random.Generator,
+    min_step: float = 1.0e-12,
+) -> tuple[FloatSolution, int]:
+    """
+    Coordinate / pattern search (Hooke-Jeeves) from an evaluated float solution.
+
+    Every sweep visits the coordinates in random order and keeps the first of x_i + step_i, x_i - step_i that
+    improves the objective. A sweep with an improvement is followed by a pattern move along the direction of the
+    whole sweep, a sweep without one halves the steps. Returns the best solution found (a new object, or the passed
+    one if nothing improved) and the number of evaluations used, at most `max_evaluations`.
+    """
+    lower, upper = np.asarray(problem.lower_bound, dtype=float), np.asarray(problem.upper_bound, dtype=float)
+    x, fx = np.array(solution.variables, dtype=float), solution.objectives[0]
+    step = np.array(step, dtype=float)
+    best = solution
+    evaluations = 0
+
+    def evaluate(variables: np.ndarray) -> FloatSolution:
+        nonlocal evaluations
+        candidate = copy(solution)
+        candidate.variables = variables.tolist()
+        problem.evaluate(candidate)
+        evaluations += 1
+        return candidate
+
+    while evaluations < max_evaluations and np.any(step > min_step * (upper - lower)):
+        sweep_start = x.copy()
+        improved = False
+        for variable in rng.permutation(len(x)):
+            for direction in (1.0, -1.0):
+                if evaluations >= max_evaluations:
+                    break
+                y = x.copy()
+                y[variable] = np.clip(x[variable] + direction * step[variable], lower[variable], upper[variable])
+                if y[variable] == x[variable]:
+                    continue
+                candidate = evaluate(y)
+                if candidate.objectives[0] < fx:
+                    x, fx, best, improved = y, candidate.objectives[0], candidate, True
+                    break
+        if evaluations >= max_evaluations:
+            break
+        if improved:
+            y = np.clip(2 * x - sweep_start, lower, upper)
+            candidate = evaluate(y)
+            if candidate.objectives[0] < fx:
+                x, fx, best = y, candidate.objectives[0], candidate
+        else:
+            step /= 2
+    return best, evaluations
+
+
+def tabu_search(
+    solution: BinarySolution,
+    max_evaluations: int,
+    rng: np.random.Generator,
+    max_tenure: float = 0.1,
+) -> tuple[BinarySolution, int]:
+    """
+    Single-flip tabu search for LABS from an evaluated solution.
+
+    Every iteration evaluates the flips of all bits (or of a random subset, when less evaluations than bits are
+    left) in one batch and makes the best non-tabu flip, even if it is worse than the current sequence. A flipped
+    bit is tabu for a random number of 1 to 1 + max_tenure * length iterations, unless flipping it gives a new
+    best sequence. Returns the best solution found (a new object, or the passed one if nothing improved) and the
+    number of evaluations used, at most `max_evaluations`.
+    """
+    current = np.array(solution.variables[0], dtype=bool)
+    length = len(current)
+    best, best_energy = solution, solution.objectives[0]
+    tabu_until = np.zeros(length, dtype=int)
+    evaluations = 0
+    iteration = 0
+
+    while evaluations < max_evaluations:
+        iteration += 1
+        # Shuffled, so ties between equally good flips are broken at random
+        flips = rng.permutation(length)[: min(length, max_evaluations - evaluations)]
+        neighbours = np.repeat(current[None, :], len(flips), axis=0)
+        neighbours[np.arange(len(flips)), flips] ^= True
+        energies = batch_energy(neighbours)
+        evaluations += len(flips)
+
+        allowed = (tabu_until[flips] < iteration) | (energies < best_energy)
+        if not np.any(allowed):
+            continue
+        move = np.flatnonzero(allowed)[np.argmin(energies[allowed])]
+        current = neighbours[move]
+        tabu_until[flips[move]] = iteration + 1 + rng.integers(0, int(max_tenure * length) + 1)
+        if energies[move] < best_energy:
+            best_energy = energies[move]
+            best = copy(solution)
+            # Python bools, energy_function and BitFlipMutation compare with `is True` / `is False`
+            best.variables = [current.tolist()]
+            best.objectives = [int(best_energy)]
+    return best, evaluations
@@ -0,0 +1,197 @@
+from enum import Enum
+from typing import List, Optional
+
+import numpy as np
+
+from jmetal.algorithm.singleobjective import GeneticAlgorithm
+from jmetal.core.solution import BinarySolution, FloatSolution, Solution
+from jmetal.operator.crossover import SBXCrossover, SPXCrossover
+from jmetal.operator.mutation import BitFlipMutation, SimpleRandomMutation
+from jmetal.operator.selection import BinaryTournamentSelection
+from jmetal.util.comparator import ObjectiveComparator
+
+from .batch_evaluation import evaluate_solutions
+
+
+class GAEngine(Enum):
+    Jmetal = 0  # jmetal's GeneticAlgorithm, operators work on one solution object at a time
+    NumPy = 1  # NumpyGeneticAlgorithm, operators work on the population matrix
+
+
+class NumpyGeneticAlgorithm(GeneticAlgorithm):
+    """
+    Drop-in replacement of jmetal's GeneticAlgorithm (same constructor and the same `solutions`, `step`,
+    `selection`, `reproduction`, `evaluate`, `replacement`, `result` interface the agents and the Runner use)
+    whose operators work on the variables of all selected solutions as one matrix.
+
+    Binary tournament selection, SBX / single point crossover, simple random / bit flip mutation and the
+    (mu + lambda) replacement follow the semantics of their jmetal counterparts, whose parameters
+    (probabilities, distribution index) are read from the passed operator objects. Other operators, and
+    replacement with a solution comparator other than ObjectiveComparator(0), fall back to jmetal's
+    per-solution implementation. Random numbers come from `rng` instead of the global `random`
+    module, so results are reproducible for a seeded rng but not equal to the jmetal engine's.
+    """
+
+    SBX_EPS = 1.0e-14
+
+    def __init__(self, *args, rng: Optional[np.random.Generator] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.binary = isinstance(self.crossover_operator, SPXCrossover)
+        self.vectorized_crossover = isinstance(self.crossover_operator, (SBXCrossover, SPXCrossover))
+        self.vectorized_mutation = isinstance(self.mutation_operator, (SimpleRandomMutation, BitFlipMutation))
+        self.vectorized_selection = isinstance(self.selection_operator, BinaryTournamentSelection)
+        # Sorting the objective column is only the comparator's order for ascending objective 0 (minimization)
+        self.vectorized_replacement = (
+            type(self.solution_comparator) is ObjectiveComparator and self.solution_comparator.objectiveId == 0
+        )
+        if not self.binary:
+            self.lower_bound = np.asarray(self.problem.lower_bound, dtype=float)
+            self.upper_bound = np.asarray(self.problem.upper_bound, dtype=float)
+
+    ### Conversion between solution objects and matrices
+    def to_matrix(self, solutions: List[Solution]) -> np.ndarray:
+        if self.binary:
+            return np.array([[bit for variable in solution.variables for bit in variable] for solution in solutions], dtype=bool)
+        return np.array([solution.variables for solution in solutions], dtype=float)
+
+    def to_solutions(self, matrix: np.ndarray, objectives: Optional[List[List[float]]] = None) -> List[Solution]:
+        solutions = []
+        if self.binary:
+            bits_per_variable = [self.problem.number_of_bits] * self.problem.number_of_variables()
+            cuts = np.cumsum(bits_per_variable)[:-1]
+            for row in matrix:
+                solution = BinarySolution(len(bits_per_variable), self.problem.number_of_objectives(), self.problem.number_of_constraints())
+                # Python bools, energy_function and BitFlipMutation compare with `is True` / `is False`
+                solution.variables = [bits.tolist() for bits in np.split(row, cuts)]
+                solutions.append(solution)
+        else:
+            for row in matrix.tolist():
+                solution = FloatSolution(
+                    self.problem.lower_bound, self.problem.upper_bound,
+                    self.problem.number_of_objectives(), self.problem.number_of_constraints(),
+                )
+                solution.variables = row
+                solutions.append(solution)
+        if objectives is not None:
+            for solution, solution_objectives in zip(solutions, objectives):
+                solution.objectives = solution_objectives[:]
+        return solutions
+
+    @staticmethod
+    def objectives(solutions: List[Solution]) -> np.ndarray:
+        return np.array([solution.objectives[0] for solution in solutions], dtype=float)
+
+    ### GeneticAlgorithm interface
+    def create_initial_solutions(self) -> List[Solution]:
+        if self.binary:
+            bits = self.problem.number_of_bits * self.problem.number_of_variables()
+            return self.to_solutions(self.rng.random((self.population_size, bits)) < 0.5)
+        span = self.upper_bound - self.lower_bound
+        return self.to_solutions(self.lower_bound + span * self.rng.random((self.population_size, len(span))))
+
+    def evaluate(self, population: List[Solution]) -> List[Solution]:
+        return evaluate_solutions(population, self.problem)
+
+    def selection(self, population: List[Solution]) -> List[Solution]:
+        ### Binary tournaments of two different solutions, ties decided at random
+        if not self.vectorized_selection:
+            return super().selection(population)
+        size = len(population)
+        if size == 1:
+            return [population[0]] * self.mating_pool_size
+        objectives = self.objectives(population)
+        first = self.rng.integers(0, size, self.mating_pool_size)
+        second = self.rng.integers(0, size - 1, self.mating_pool_size)
+        second += second >= first
+        tie_winner = np.where(self.rng.random(self.mating_pool_size) < 0.5, second, first)
+        winners = np.where(
+            objectives[first] < objectives[second],
+            first,
+            np.where(objectives[second] < objectives[first], second, tie_winner),
+        )
+        return [population[winner] for winner in winners]
+
+    def reproduction(self, mating_population: List[Solution]) -> List[Solution]:
+        if not (self.vectorized_crossover and self.vectorized_mutation):
+            return super().reproduction(mating_population)
+        if len(mating_population) % 2 != 0:
+            raise Exception("Wrong number of parents")
+
+        # Same pairs as jmetal: (0, 1), (2, 3), ... up to the offspring population size
+        pairs = (self.offspring_population_size + 1) // 2
+        parents = self.to_matrix(mating_population[: 2 * pairs])
+        first, second = parents[0::2], parents[1::2]
+        if self.binary:
+            children = self.single_point_crossover(first, second)
+            children = self.bit_flip_mutation(children)
+        else:
+            children = self.sbx_crossover(first, second)
+            children = self.simple_random_mutation(children)
+        # Like jmetal's deep copied parents, children start with the objectives of the parent at their position
+        # (agents refilling their population with reproduction() do not evaluate them)
+        parent_objectives = [solution.objectives for solution in mating_population[: 2 * pairs]]
+        return self.to_solutions(children[: self.offspring_population_size], parent_objectives)
+
+    def replacement(self, population: List[Solution], offspring_population: List[Solution]) -> List[Solution]:
+        ### (mu + lambda): the best population_size of both, stable like jmetal's list sort
+        if not self.vectorized_replacement:
+            return super().replacement(population, offspring_population)
+        combined = population + offspring_population
+        order = np.argsort(self.objectives(combined), kind="stable")[: self.population_size]
+        return [combined[index] for index in order]
+
+    ### Operators on (pairs, variables) parent matrices, children are interleaved as (pair 0 child 0, pair 0 child 1, ...)
+    @staticmethod
+    def interleave(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+        children = np.empty((2 * len(first), first.shape[1]), dtype=first.dtype)
+        children[0::2], children[1::2] = first, second
+        return children
+
+    def sbx_crossover(self, x1: np.ndarray, x2: np.ndarray) -> np.ndarray:
+        pairs, variables = x1.shape
+        eta = self.crossover_operator.distribution_index
+        crossed = (self.rng.random(pairs) <= self.crossover_operator.probability)[:, None]
+        active = crossed & (self.rng.random((pairs, variables)) <= 0.5) & (np.abs(x1 - x2) > self.SBX_EPS)
+
+        y1, y2 = np.minimum(x1, x2), np.maximum(x1, x2)
+        distance = np.where(active, y2 - y1, 1.0)
+        lower, upper = self.lower_bound, self.upper_bound
+        rand = self.rng.random((pairs, variables))
+
+        def betaq(beta):
+            alpha = 2.0 - beta ** -(eta + 1.0)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return np.where(
+                    rand <= 1.0 / alpha,
+                    (rand * alpha) ** (1.0 / (eta + 1.0)),
+                    (1.0 / (2.0 - rand * alpha)) ** (1.0 / (eta + 1.0)),
+                )
+
+        c1 = 0.5 * (y1 + y2 - betaq(1.0 + 2.0 * (y1 - lower) / distance) * (y2 - y1))
+        c2 = 0.5 * (y1 + y2 + betaq(1.0 + 2.0 * (upper - y2) / distance) * (y2 - y1))
+        c1, c2 = np.clip(c1, lower, upper), np.clip(c2, lower, upper)
+
+        swap = self.rng.random((pairs, variables)) <= 0.5
+        child1 = np.where(active, np.where(swap, c2, c1), x1)
+        child2 = np.where(active, np.where(swap, c1, c2), x2)
+        return self.interleave(child1, child2)
+
+    def single_point_crossover(self, x1: np.ndarray, x2: np.ndarray) -> np.ndarray:
+        pairs, bits = x1.shape
+        crossed = self.rng.random(pairs) <= self.crossover_operator.probability
+        points = self.rng.integers(0, bits, pairs)
+        # Bits from the crossover point on are swapped
+        swap = crossed[:, None] & (np.arange(bits)[None, :] >= points[:, None])
+        return self.interleave(np.where(swap, x2, x1), np.where(swap, x1, x2))
+
+    def simple_random_mutation(self, x: np.ndarray) -> np.ndarray:
+        mutated = self.rng.random(x.shape) <= self.mutation_operator.probability
+        values = self.lower_bound + (self.upper_bound - self.lower_bound) * self.rng.random(x.shape)
+        return np.where(mutated, values, x)
+
+    def bit_flip_mutation(self, x: np.ndarray) -> np.ndarray:
+        return x ^ (self.rng.random(x.shape) <= self.mutation_operator.probability)
+
+    def get_name(self) -> str:
+        return "NumPy genetic algorithm"
@@ -0,0 +1,197 @@
+# https://en.wikipedia.org/wiki/Test_functions_for_optimization
+import numpy as np
+import random
+
+from jmetal.core.problem import BinaryProblem, FloatProblem
+from jmetal.core.solution import BinarySolution, FloatSolution
+
+
+class ExpandedSchaffer(FloatProblem):
+    def __init__(self, number_of_variables: int = 10):
+        super(ExpandedSchaffer, self).__init__()
+        self.lower_bound = [-100] * number_of_variables
+        self.upper_bound = [100] * number_of_variables
+
+    def number_of_objectives(self) -> int:
+        return 1
+
+    def number_of_constraints(self) -> int:
+        return 0
+
+    def evaluate(self, solution: FloatSolution) -> FloatSolution:
+        x = np.array(solution.variables)
+        x_next = np.roll(x, -1)
+        tmp = x**2 + x_next**2
+        val = 0.5 + (np.sin(np.sqrt(tmp)) ** 2 - 0.5) / (1 + 0.001 * tmp) ** 2
+        solution.objectives[0] = np.sum(val)
+
+        return solution
+
+    def evaluate_batch(self, solutions: list[FloatSolution]) -> list[FloatSolution]:
+        x = np.array([solution.variables for solution in solutions])
+        x_next = np.roll(x, -1, axis=1)
+        tmp = x**2 + x_next**2
+        val = 0.5 + (np.sin(np.sqrt(tmp)) ** 2 - 0.5) / (1 + 0.001 * tmp) ** 2
+        for solution, objective in zip(solutions, np.sum(val, axis=1)):
+            solution.objectives[0] = objective
+
+        return solutions
+
+    @classmethod
+    def name(cls) -> str:
+        return cls.__name__
+
+
+class Griewank(FloatProblem):
+    def __init__(self, number_of_variables: int = 10):
+        super(Griewank, self).__init__()
+        self.lower_bound = [-600] * number_of_variables
+        self.upper_bound = [600] * number_of_variables
+
+    def number_of_objectives(self) -> int:
+        return 1
+
+    def number_of_constraints(self) -> int:
+        return 0
+
+    def evaluate(self, solution: FloatSolution) -> FloatSolution:
+        x = np.array(solution.variables)
+        sigma = np.sum(x**2 / 4000)
+        pi_denominators = np.sqrt(np.arange(1, x.shape[0] + 1))
+        pi = np.prod(np.cos(np.divide(x, pi_denominators)))
+        solution.objectives[0] = sigma - pi + 1
+
+        return solution
+
+    def evaluate_batch(self, solutions: list[FloatSolution]) -> list[FloatSolution]:
+        x = np.array([solution.variables for solution in solutions])
+        sigma = np.sum(x**2 / 4000, axis=1)
+        pi_denominators = np.sqrt(np.arange(1, x.shape[1] + 1))
+        pi = np.prod(np.cos(np.divide(x, pi_denominators)), axis=1)
+        for solution, objective in zip(solutions, sigma - pi + 1):
+            solution.objectives[0] = objective
+
+        return solutions
+
+    @classmethod
+    def name(cls) -> str:
+        return cls.__name__
+
+
+class Ackley(FloatProblem):
+    def __init__(self, number_of_variables: int = 10):
+        super(Ackley, self).__init__()
+        self.lower_bound = [-5] * number_of_variables
+        self.upper_bound = [5] * number_of_variables
+
+    def number_of_objectives(self) -> int:
+        return 1
+
+    def number_of_constraints(self) -> int:
+        return 0
+
+    def evaluate(self, solution: FloatSolution) -> FloatSolution:
+        a = 20
+        b = 0.2
+        c = 2 * np.pi
+        x = np.array(solution.variables)
+        d = x.shape[0]
+
+        first_exp_term = -a * np.exp(-b * np.sqrt(np.sum(x**2) / d))
+        second_exp_term = -np.exp(np.sum(np.cos(c * x)) / d)
+        solution.objectives[0] = first_exp_term + second_exp_term + a + np.exp(1)
+        
+        return solution
+
+    def evaluate_batch(self, solutions: list[FloatSolution]) -> list[FloatSolution]:
+        a = 20
+        b = 0.2
+        c = 2 * np.pi
+        x = np.array([solution.variables for solution in solutions])
+        d = x.shape[1]
+
+        first_exp_term = -a * np.exp(-b * np.sqrt(np.sum(x**2, axis=1) / d))
+        second_exp_term = -np.exp(np.sum(np.cos(c * x), axis=1) / d)
+        for solution, objective in zip(solutions, first_exp_term + second_exp_term + a + np.exp(1)):
+            solution.objectives[0] = objective
+
+        return solutions
+
+    @classmethod
+    def name(cls) -> str:
+        return cls.__name__
+
+
+class LABS(BinaryProblem):
+    def __init__(
+        self,
+        sequence_length: int = 10,
+    ):
+        super(LABS, self).__init__()
+        self.number_of_bits = sequence_length
+
+    def number_of_variables(self) -> int:
+        return 1
+
+    def number_of_objectives(self) -> int:
+        return 1
+
+    def number_of_constraints(self) -> int:
+        return 0
+
+    def evaluate(self, solution: BinarySolution) -> BinarySolution:
+        solution.objectives[0] = energy_function(solution.variables[0])
+        return solution
+
+    def evaluate_batch(self, solutions: list[BinarySolution]) -> list[BinarySolution]:
+        energies = batch_energy(np.array([solution.variables[0] for solution in solutions], dtype=bool))
+        for solution, energy in zip(solutions, energies):
+            solution.objectives[0] = int(energy)
+        return solutions
+
+    def create_solution(self) -> BinarySolution:
+        new_solution = BinarySolution(
+            number_of_variables=self.number_of_variables(),
+            number_of_objectives=self.number_of_objectives(),
+        )
+
+        new_solution.variables[0] = [
+            random.randint(0, 1) == 0 for _ in range(self.number_of_bits)
+        ]
+
+        return new_solution
+
+    @classmethod
+    def name(cls) -> str:
+        return cls.__name__
+
+
+# TODO: optimize with numpy, the speed is terrible.
+def energy_function(sequence):
+    energy = 0
+    mapped_seq = list(map(lambda x: -1 if x is True else 1, sequence))
+    for distance in range(1, len(sequence)):
+        energy += aperiodic_autocorrelation(mapped_seq, distance) ** 2
+    return energy
+
+
+def batch_energy(bits: np.ndarray) -> np.ndarray:
+    """energy_function of every row of a (sequences, length) boolean matrix."""
+    # Same mapping as energy_function: True -> -1, False -> 1
+    sequences = 1 - 2 * bits.astype(np.int64)
+    energies = np.zeros(len(sequences), dtype=np.int64)
+    for distance in range(1, sequences.shape[1]):
+        autocorr = np.sum(sequences[:, :-distance] * sequences[:, distance:], axis=1)
+        energies += autocorr**2
+    return energies
+
+
+def aperiodic_autocorrelation(sequence, distance):
+    autocorr = 0
+    for i in range(0, len(sequence) - distance):
+        autocorr += sequence[i] * sequence[i + distance]
+    return autocorr
+
+
+def merit_factor(sequence):
+    return len(sequence) ** 2 / (2 * energy_function(sequence))
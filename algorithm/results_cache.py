@@ -0,0 +1,120 @@
+import dataclasses
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+
+from enum import Enum
+from functools import lru_cache
+from typing import Optional
+
+from .config import SimulationConfig
+
+# Fields that only change the outputs of a run, not its result
+OUTPUT_ONLY_FIELDS = {
+    "log_interval",
+    "log_trust_on_change",
+    "telemetry_target",
+    "save_summary",
+    "save_exchange_events",
+    "batch_evaluation",
+    "batch_evaluation_processes",
+}
+
+
+@lru_cache(maxsize=None)
+def code_version() -> str:
+    """Hash of the sources of the algorithm package, so results of a changed engine are never reused."""
+    digest = hashlib.sha256()
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    for directory, subdirectories, files in sorted(os.walk(package_dir)):
+        subdirectories.sort()
+        for file_name in sorted(files):
+            if file_name.endswith(".py"):
+                path = os.path.join(directory, file_name)
+                digest.update(os.path.relpath(path, package_dir).encode())
+                with open(path, "rb") as file:
+                    digest.update(file.read())
+    return digest.hexdigest()
+
+
+def _canonical(value):
+    if isinstance(value, Enum):
+        return f"{type(value).__name__}.{value.name}"
+    if isinstance(value, type):
+        return f"{value.__module__}.{value.__qualname__}"
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return repr(value)
+
+
+def run_parameters(config: SimulationConfig, agent_class, problem, accept_strategy, send_strategy) -> dict:
+    parameters = {
+        field.name: getattr(config, field.name)
+        for field in dataclasses.fields(config)
+        if field.name not in OUTPUT_ONLY_FIELDS
+    }
+    parameters.update(
+        agent_class=agent_class,
+        accept_strategy=accept_strategy,
+        send_strategy=send_strategy,
+        problem=problem.name(),
+        number_of_variables=getattr(problem, "number_of_bits", None) or problem.number_of_variables(),
+        code_version=code_version(),
+    )
+    return _canonical(parameters)
+
+
+def is_cacheable(config: SimulationConfig) -> bool:
+    # Unseeded and wall clock limited runs are not reproducible
+    return config.seed is not None and config.max_wall_clock_seconds is None
+
+
+def cache_key(parameters: dict) -> str:
+    return hashlib.sha256(json.dumps(parameters, sort_keys=True).encode()).hexdigest()
+
+
+class ResultsCache:
+    """
+    Local SQLite database of simulation results, keyed by a hash of all run parameters, the code version and the seed.
+    Safe to share between processes, every process opens its own connection.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=60)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, cost REAL, parameters TEXT, created TEXT)"
+        )
+        self.connection.commit()
+
+    def get(self, key: str) -> Optional[float]:
+        row = self.connection.execute("SELECT cost FROM results WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def put(self, key: str, cost: float, parameters: dict) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+            (key, float(cost), json.dumps(parameters, sort_keys=True), datetime.datetime.now().isoformat()),
+        )
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+_open_caches = {}
+
+
+def open_results_cache(path: str) -> ResultsCache:
+    """Returns the cache connection of the current process for `path` (connections must not cross a fork)."""
+    key = (path, os.getpid())
+    if key not in _open_caches:
+        _open_caches[key] = ResultsCache(path)
+    return _open_caches[key]
@@ -0,0 +1,138 @@
+import json
+import math
+
+from typing import Optional, Sequence
+
+from .agents import BaseAgent, MemeticAgent, StrategyAgent
+
+
+def agent_class_name(agent: BaseAgent) -> str:
+    ### Same class label as in the "class" column of the generation log
+    if isinstance(agent, MemeticAgent):
+        return "Memetic_" + agent.accept_strategy.name + "_" + agent.send_strategy.name
+    if isinstance(agent, StrategyAgent):
+        return agent.accept_strategy.name + "_" + agent.send_strategy.name
+    return type(agent).__name__
+
+
+class Welford:
+    """Running count, mean and variance (Welford's algorithm) of a stream of values."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> Optional[float]:
+        # Sample variance (ddof=1), like the std of the analysis scripts
+        return self.m2 / (self.count - 1) if self.count > 1 else None
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean if self.count > 0 else None,
+            "variance": self.variance,
+            "std": math.sqrt(self.variance) if self.variance is not None else None,
+        }
+
+
+class ScoreStatistics:
+    """Best-so-far score (and its generation) plus the Welford statistics of the scores of one agent or class."""
+
+    def __init__(self):
+        self.best_so_far = math.inf
+        self.best_generation = None
+        self.scores = Welford()
+        self.offered_migrants = 0
+        self.accepted_migrants = 0
+        self.filtered_migrants = 0
+
+    def update(self, score: float, generation: int) -> None:
+        self.scores.update(score)
+        if score < self.best_so_far:
+            self.best_so_far = score
+            self.best_generation = generation
+
+    def to_dict(self) -> dict:
+        return {
+            "best_so_far": self.best_so_far if self.best_generation is not None else None,
+            "best_generation": self.best_generation,
+            "score": self.scores.to_dict(),
+            "offered_migrants": self.offered_migrants,
+            "accepted_migrants": self.accepted_migrants,
+            "filtered_migrants": self.filtered_migrants,
+        }
+
+
+class RunStatistics:
+    """
+    Streaming statistics of a run, updated by the Runner every generation and after every exchange.
+
+    Per agent and per agent class: best-so-far score, and the count / mean / variance of the best score of the
+    agent in every generation. Per exchange: the global best-so-far score and the migrants offered, accepted and
+    filtered as near-duplicates in it. Memory does not depend on the number of generations (only one entry per exchange is kept), so the
+    summary is available even when the generation log is thinned out or not saved at all.
+    """
+
+    def __init__(self, agents: Sequence[BaseAgent]):
+        self.agent_classes = {agent.id: agent_class_name(agent) for agent in agents}
+        self.agents = {agent.id: ScoreStatistics() for agent in agents}
+        self.classes = {class_name: ScoreStatistics() for class_name in dict.fromkeys(self.agent_classes.values())}
+        self.generations = 0
+        self.exchanges = {
+            "generation": [],
+            "best_so_far": [],
+            "offered_migrants": [],
+            "accepted_migrants": [],
+            "filtered_migrants": [],
+        }
+
+    @property
+    def best_so_far(self) -> float:
+        return min(statistics.best_so_far for statistics in self.agents.values())
+
+    def update_generation(self, generation: int, agents: Sequence[BaseAgent]) -> None:
+        self.generations = generation
+        for agent in agents:
+            score = agent.algorithm.result().objectives[0]
+            self.agents[agent.id].update(score, generation)
+            self.classes[self.agent_classes[agent.id]].update(score, generation)
+
+    def update_exchange(self, generation: int, migrants: dict[int, tuple[int, int, int]]) -> None:
+        ### migrants: receiving agent id -> (offered, accepted, filtered as near-duplicates) migrants of the exchange
+        for agent_id, (offered, accepted, filtered) in migrants.items():
+            for statistics in (self.agents[agent_id], self.classes[self.agent_classes[agent_id]]):
+                statistics.offered_migrants += offered
+                statistics.accepted_migrants += accepted
+                statistics.filtered_migrants += filtered
+        self.exchanges["generation"].append(generation)
+        self.exchanges["best_so_far"].append(self.best_so_far)
+        self.exchanges["offered_migrants"].append(sum(offered for offered, _, _ in migrants.values()))
+        self.exchanges["accepted_migrants"].append(sum(accepted for _, accepted, _ in migrants.values()))
+        self.exchanges["filtered_migrants"].append(sum(filtered for _, _, filtered in migrants.values()))
+
+    def summary(self, **fields) -> dict:
+        best_agent_id = min(self.agents, key=lambda agent_id: self.agents[agent_id].best_so_far)
+        return {
+            **fields,
+            "generations": self.generations,
+            "final_best": self.agents[best_agent_id].best_so_far,
+            "best_agent_id": best_agent_id,
+            "agents": {
+                str(agent_id): {"class": self.agent_classes[agent_id], **statistics.to_dict()}
+                for agent_id, statistics in self.agents.items()
+            },
+            "classes": {class_name: statistics.to_dict() for class_name, statistics in self.classes.items()},
+            "exchanges": self.exchanges,
+        }
+
+    def save(self, file_path: str, **fields) -> None:
+        with open(file_path, "w") as file:
+            json.dump(self.summary(**fields), file, indent=1)
@@ -1,8 +1,10 @@
+import os
 import time
 
+from copy import deepcopy
+
 from typing import Callable, Type, Optional, List, Tuple
 
-import pandas as pd
 
 from jmetal.algorithm.singleobjective import GeneticAlgorithm
 from jmetal.config import store
@@ -14,10 +16,19 @@ from jmetal.util.evaluator import Evaluator
 from jmetal.util.generator import Generator
 from jmetal.util.termination_criterion import TerminationCriterion
 
-from algorithm.agents.strategy_based import TrustMechanism
+from .agents.strategy_based import MigrationPolicy, TrustMechanism
 
-from .agents import AcceptStrategy, BaseAgent, SendStrategy, StrategyAgent
+from .agents import AcceptStrategy, BaseAgent, MemeticAgent, SendStrategy, StrategyAgent
+from .exchange_events import ExchangeEventLog
 from .exchange_logic import ExchangeMarket
+from .numpy_ga import GAEngine, NumpyGeneticAlgorithm
+from .run_statistics import RunStatistics, agent_class_name
+from .batch_evaluation import BatchEvaluator
+from .config import SimulationConfig
+from .budget import BudgetScheduler
+from .seeding import RandomStreams
+from .telemetry import TelemetryStream
+from .termination import RunTerminationCriterion, StoppingByAgentBudgets, StoppingByTotalEvaluations
 
 
 class Runner:
@@ -46,37 +57,61 @@ class Runner:
         starting_trust: Optional[int] = None,
         no_send_penalty: Optional[int] = 2,
         part_to_swap: Optional[float] = 0.1,
-        auction_weight: Optional[float] = None,
+        exchange_part_to_swap: float = SimulationConfig.exchange_part_to_swap,
+        auction_weight: float = SimulationConfig.auction_weight,
         migration: bool = True,
+        migration_policy: MigrationPolicy = SimulationConfig.migration_policy,
         save_log: bool = True,
+        log_interval: int = 1,
+        log_trust_on_change: bool = False,
+        seed: Optional[int] = None,
+        run_termination_criteria: Optional[List[RunTerminationCriterion]] = None,
+        budget_scheduler: Optional[BudgetScheduler] = None,
+        telemetry: Optional[TelemetryStream] = None,
+        batch_evaluator: Optional[BatchEvaluator] = None,
+        save_summary: bool = True,
+        save_exchange_events: bool = True,
+        ga_engine: GAEngine = GAEngine.Jmetal,
+        duplicate_radius: Optional[float] = None,
     ):
-        if auction_weight is None:
-            from analysis.constants_and_params import AUCTION_TRUST_WEIGHT
-            auction_weight = AUCTION_TRUST_WEIGHT
-            
         global_trust = {agent_id: starting_trust for agent_id in range(agents_number)} # Initial trust values for agents
+        # Independent random streams per island and for the exchange market (no seeding if seed is None)
+        self.random_streams = RandomStreams(
+            seed, len(agent_class) if isinstance(agent_class, list) else agents_number
+        )
+
+        def create_algorithm(island: int) -> GeneticAlgorithm:
+            arguments = (
+                problem,
+                population_size,
+                offspring_population_size,
+                mutation,
+                crossover,
+                selection,
+                # Own copy per island, a shared criterion is only updated with the evaluations of the last stepped island
+                deepcopy(termination_criterion),
+                population_generator,
+                population_evaluator,
+                solution_comparator,
+            )
+            if ga_engine is GAEngine.NumPy:
+                return NumpyGeneticAlgorithm(*arguments, rng=self.random_streams.island_np_rngs[island])
+            return GeneticAlgorithm(*arguments)
+
         # In case of a Uniform Agent Class simulation
         if callable(agent_class):
             self.agents = [
                 agent_class(
-                    GeneticAlgorithm(
-                        problem,
-                        population_size,
-                        offspring_population_size,
-                        mutation,
-                        crossover,
-                        selection,
-                        termination_criterion,
-                        population_generator,
-                        population_evaluator,
-                        solution_comparator,
-                    ),
+                    create_algorithm(agent_nr),
                     send_strategy,
                     accept_strategy,
                     trust_mechanism,
                     global_trust,
                     starting_trust=starting_trust,
                     id=agent_nr,
+                    rng=self.random_streams.island_rngs[agent_nr],
+                    np_rng=self.random_streams.island_np_rngs[agent_nr],
+                    duplicate_radius=duplicate_radius,
                 )
                 for agent_nr in range(agents_number)
             ]
@@ -84,18 +119,7 @@ class Runner:
         elif isinstance(agent_class, list):
             self.agents = [
                 agent_class[agent_nr](
-                    GeneticAlgorithm(
-                        problem,
-                        population_size,
-                        offspring_population_size,
-                        mutation,
-                        crossover,
-                        selection,
-                        termination_criterion,
-                        population_generator,
-                        population_evaluator,
-                        solution_comparator,
-                    ),
+                    create_algorithm(agent_nr),
                     send_strategy[agent_nr],
                     accept_strategy[agent_nr],
                     trust_mechanism,
@@ -104,23 +128,197 @@ class Runner:
                     no_send_penalty=no_send_penalty,
                     part_to_swap=part_to_swap,
                     id=agent_nr,
+                    rng=self.random_streams.island_rngs[agent_nr],
+                    np_rng=self.random_streams.island_np_rngs[agent_nr],
+                    duplicate_radius=duplicate_radius,
                 )
                 for agent_nr in range(len(agent_class))
             ]
 
-        self.exchange_market = ExchangeMarket(self.agents, migration, auction_weight)
+        self.log_file_prefix = os.path.splitext(output_file_path)[0]
+        # Structured exchange records appended during the run as <run>_exchange_events.bin
+        self.exchange_event_log = (
+            ExchangeEventLog(self.log_file_prefix + "_exchange_events.bin")
+            if save_log and save_exchange_events
+            else None
+        )
+        self.exchange_market = ExchangeMarket(
+            self.agents,
+            migration,
+            auction_weight,
+            migration_policy=migration_policy,
+            population_part_to_swap=exchange_part_to_swap,
+            rng=self.random_streams.market_rng,
+            np_rng=self.random_streams.market_np_rng,
+            event_log=self.exchange_event_log,
+        )
         self.generations_per_swap = generations_per_swap
         self.output_file_path = output_file_path
         self.save_log = save_log
+        self.population_size = population_size
+        self.log_interval = log_interval
+        self.log_trust_on_change = log_trust_on_change
+        # Trust only changes during exchanges, so the trust strings are rebuilt only after one
+        self.trust_may_have_changed = True
+        self.last_trust_strings = {}
+        # Islands get their share of the total evaluation budget from the scheduler instead of equal budgets
+        self.budget_scheduler = budget_scheduler
+        if budget_scheduler is not None:
+            budget_scheduler.init(self.agents, generations_per_swap)
+            budget_criterion = StoppingByTotalEvaluations(budget_scheduler.total_evaluations)
+        else:
+            budget_criterion = StoppingByAgentBudgets()
+        # Evaluated over all agents, the run stops as soon as any of them is met
+        self.run_termination_criteria = [budget_criterion] + (run_termination_criteria or [])
+        self.stop_reason = None
+        self.telemetry = telemetry
+        # Evaluates the offspring of all agents of a generation in one call instead of inside agent.algorithm.step()
+        self.batch_evaluator = batch_evaluator
+        self.problem = problem
+        # Streaming best-so-far / score / migration statistics, saved next to the log as <run>_summary.json
+        self.run_statistics = RunStatistics(self.agents)
+        self.save_summary = save_summary
+
+
+    def run_termination_criterion_met(self) -> bool:
+        for criterion in self.run_termination_criteria:
+            if criterion.is_met:
+                self.stop_reason = str(criterion)
+                return True
+        return False
+
+
+    def emit_telemetry(self, event: str, generation: int, start_computing_time: float) -> None:
+        ### Per epoch snapshot: fitness per agent, trust summaries, last exchange decisions and throughput
+        elapsed_time = time.time() - start_computing_time
+        evaluations = sum(agent.algorithm.evaluations for agent in self.agents)
+        agents_data = []
+        for agent in self.agents:
+            objectives = [solution.objectives[0] for solution in agent.algorithm.solutions]
+            agent_data = {
+                "id": agent.id,
+                "best": float(min(objectives)),
+                "mean": float(sum(objectives) / len(objectives)),
+            }
+            if isinstance(agent, StrategyAgent) and agent.trust is not None:
+                trust_levels = list(agent.trust.values())
+                agent_data["trust_mean"] = sum(trust_levels) / len(trust_levels)
+                agent_data["trust_min"] = min(trust_levels)
+                agent_data["trust_max"] = max(trust_levels)
+            agents_data.append(agent_data)
+        fields = {
+            "run": self.output_file_path,
+            "generation": generation,
+            "evaluations": evaluations,
+            "evaluations_per_second": evaluations / elapsed_time if elapsed_time > 0 else 0.0,
+            "global_best": min(agent_data["best"] for agent_data in agents_data),
+            "agents": agents_data,
+            "exchange": {key: entries[-1] for key, entries in self.exchange_market.log.items() if entries},
+        }
+        if self.budget_scheduler is not None:
+            fields["budget_allocation"] = self.budget_scheduler.allocation
+        if event == "end":
+            fields["stop_reason"] = self.stop_reason
+        self.telemetry.emit(event, **fields)
+
+
+    def step_agents_batched(self, steps_per_agent: List[int]) -> None:
+        ### Same as agent.algorithm.step(), but the offspring of all stepping agents are evaluated in one batch
+        for step_round in range(max(steps_per_agent)):
+            stepping_agents = [
+                (agent_id, agent)
+                for agent_id, agent in enumerate(self.agents)
+                if steps_per_agent[agent_id] > step_round
+            ]
+            offspring_per_agent = {}
+            for agent_id, agent in stepping_agents:
+                with self.random_streams.island(agent_id):
+                    mating_population = agent.algorithm.selection(agent.algorithm.solutions)
+                    offspring_per_agent[agent_id] = agent.algorithm.reproduction(mating_population)
+
+            self.batch_evaluator.evaluate(
+                [solution for offspring in offspring_per_agent.values() for solution in offspring],
+                self.problem,
+            )
+
+            for agent_id, agent in stepping_agents:
+                agent.algorithm.solutions = agent.algorithm.replacement(
+                    agent.algorithm.solutions, offspring_per_agent[agent_id]
+                )
+                agent.algorithm.update_progress()
+
+
+    def steps_in_generation(self, agent_id: int, generation_in_epoch: int) -> int:
+        if self.budget_scheduler is None:
+            # Agents that spent extra evaluations (e.g. on local search) wait for the others once out of budget
+            return 0 if self.agents[agent_id].algorithm.stopping_condition_is_met() else 1
+        return self.budget_scheduler.steps_in_generation(agent_id, generation_in_epoch)
+
 
+    def refine_solutions(self, agent_id: int, agent: MemeticAgent) -> None:
+        if self.budget_scheduler is None:
+            agent.refine_solutions()
+            return
+        # The island's budget is its allocation, not the per agent termination criterion
+        evaluations = agent.local_search_evaluations
+        agent.refine_solutions(self.budget_scheduler.remaining_evaluations(agent_id, self.agents))
+        self.budget_scheduler.charge(agent_id, agent.local_search_evaluations - evaluations)
 
-    def restart_criterion_met(self) -> Tuple[bool, int]:
+
+    def save_logs(self, data_to_save: dict) -> None:
+        import pandas as pd
+
+        pd.DataFrame(data_to_save).to_csv(self.output_file_path, index=False)
+        self.exchange_market.save_log(self.log_file_prefix + "_exchange_log.csv")
+        if self.exchange_event_log is not None:
+            self.exchange_event_log.close()
+        if self.budget_scheduler is not None:
+            self.budget_scheduler.save_log(self.log_file_prefix + "_budget_log.csv")
+        if self.save_summary:
+            local_search = {
+                str(agent.id): agent.local_search_statistics()
+                for agent in self.agents
+                if isinstance(agent, MemeticAgent)
+            }
+            self.run_statistics.save(
+                self.log_file_prefix + "_summary.json",
+                evaluations=sum(agent.algorithm.evaluations for agent in self.agents),
+                stop_reason=self.stop_reason,
+                **({"local_search": local_search} if local_search else {}),
+            )
+
+
+    def log_agent_state(self, data_to_save: dict, generation: int, agent_id: int, agent: BaseAgent) -> None:
+        data_to_save["generation"].append(generation)
+        data_to_save["agent_id"].append(agent_id)
+        data_to_save["score"].append(agent.algorithm.result().objectives[0])
+        data_to_save["class"].append(agent_class_name(agent))
+        if isinstance(agent, StrategyAgent):
+            data_to_save["trust"].append(self.trust_log_entry(agent_id, agent))
+        else:
+            data_to_save["trust"].append("not_applicable")
+
+
+    def trust_log_entry(self, agent_id: int, agent: StrategyAgent) -> str:
+        ### With log_trust_on_change an empty entry means "unchanged since the last logged value" of that agent
+        if self.log_trust_on_change and not self.trust_may_have_changed:
+            return ""
+        trust_string = "_".join(
+            f"{trust_agent_id}:{int(trust_level)}" for trust_agent_id, trust_level in agent.trust.items()
+        )
+        if not self.log_trust_on_change:
+            return trust_string
+        if self.last_trust_strings.get(agent_id) == trust_string:
+            return ""
+        self.last_trust_strings[agent_id] = trust_string
+        return trust_string
+
+
+    def restart_criterion_met(self, restart_trust_threshold: float) -> Tuple[bool, int]:
         ### OLD IDEA, CURRENTLY NOT USED
         ### Go through all agent and check whether there is an agent whose average towards it is above the threshold
         ### (higher value in the agent.trust dictionary means lower trust level towards the agent)
         
-        from analysis.constants_and_params import RESTART_TRUST_THRESHOLD
-        
         average_trusts_per_agent = { agent.id: 0.0 for agent in self.agents }
         for agent in self.agents:
             for agent_id, trust in agent.trust.items():
@@ -133,7 +331,7 @@ class Runner:
         worst_trust_agent_id = max(average_trusts_per_agent, key=average_trusts_per_agent.get)
         worst_trust_value = average_trusts_per_agent[worst_trust_agent_id]
         
-        if worst_trust_value > RESTART_TRUST_THRESHOLD:
+        if worst_trust_value > restart_trust_threshold:
             return True, worst_trust_agent_id
         else:
             return False, -1
@@ -147,8 +345,9 @@ class Runner:
     def run_simulation(self):
         start_computing_time = time.time()
 
-        for agent in self.agents:
-            agent.algorithm.solutions = agent.algorithm.create_initial_solutions()
+        for agent_id, agent in enumerate(self.agents):
+            with self.random_streams.island(agent_id):
+                agent.algorithm.solutions = agent.algorithm.create_initial_solutions()
 
         for agent in self.agents:
             agent.algorithm.solutions = agent.algorithm.evaluate(
@@ -166,60 +365,88 @@ class Runner:
             "trust": [],
         }
 
-        # TODO: update this to make sense with more compilcated criteria than number of evaluations.
+        for criterion in self.run_termination_criteria:
+            criterion.init(self.agents)
+            criterion.update(self.agents, 0, False)
+
         number_of_generations = 0
-        while not agent.algorithm.stopping_condition_is_met():
+        log_generation = False
+        while not self.run_termination_criterion_met():
             number_of_generations += 1
-            for agent_id, agent in enumerate(self.agents):
-                try:
-                    agent.algorithm.step()
-                    agent.algorithm.update_progress()
-                    data_to_save["generation"].append(number_of_generations)
-                    data_to_save["agent_id"].append(agent_id)
-                    data_to_save["score"].append(agent.algorithm.result().objectives[0])
-                    from analysis.constants_and_params import POPULATION_SIZE
-                    assert len(agent.algorithm.solutions) == POPULATION_SIZE
-                    if isinstance(agent, StrategyAgent):
-                        data_to_save["class"].append(
-                            agent.accept_strategy.name + "_" + agent.send_strategy.name
-                        )
-                        trust_string = ""
-                        for trust_agent_id, trust_level in agent.trust.items():
-                            trust_string += f"{trust_agent_id}:{int(trust_level)}_"
-                        data_to_save["trust"].append(trust_string[:-1])
-                    else:
-                        data_to_save["class"].append(type(agent).__name__)
-                        data_to_save["trust"].append("not_applicable")
-                except KeyboardInterrupt:
-                    if self.save_log:
-                        pd.DataFrame(data_to_save).to_csv(
-                            self.output_file_path, index=False
-                        )
-                        self.exchange_market.save_log("." + ''.join(self.output_file_path.split('.')[:-1]) + "_exchange_log.csv")
-                    print("Program stopped by user.")
-                    exit()
-                except Exception as e:
-                    if self.save_log:
-                        pd.DataFrame(data_to_save).to_csv(
-                            self.output_file_path, index=False
-                        )
-                        self.exchange_market.save_log("." + ''.join(self.output_file_path.split('.')[:-1]) + "_exchange_log.csv")
-                    print(f"An error occurred: {e}")
-                    print("Program stopped due to an error.")
-                    exit()
-
-            if number_of_generations % self.generations_per_swap == 0:
-                self.exchange_market.exchange_information()
+            # Exchange generations are always logged
+            log_generation = (
+                number_of_generations % self.log_interval == 0
+                or number_of_generations % self.generations_per_swap == 0
+            )
+            generation_in_epoch = (number_of_generations - 1) % self.generations_per_swap
+            if self.budget_scheduler is not None and generation_in_epoch == 0:
+                self.budget_scheduler.start_epoch(self.agents, number_of_generations)
+            steps_per_agent = [
+                self.steps_in_generation(agent_id, generation_in_epoch)
+                for agent_id in range(len(self.agents))
+            ]
+            try:
+                if self.batch_evaluator is not None:
+                    self.step_agents_batched(steps_per_agent)
+                for agent_id, agent in enumerate(self.agents):
+                    if self.batch_evaluator is None:
+                        for _ in range(steps_per_agent[agent_id]):
+                            with self.random_streams.island(agent_id):
+                                agent.algorithm.step()
+                            agent.algorithm.update_progress()
+                    assert len(agent.algorithm.solutions) == self.population_size
+                    if log_generation:
+                        self.log_agent_state(data_to_save, number_of_generations, agent_id, agent)
+            except KeyboardInterrupt:
+                if self.save_log:
+                    self.save_logs(data_to_save)
+                print("Program stopped by user.")
+                raise
+            except Exception as e:
+                # Re-raised after saving the logs: exit() would be a SystemExit that callers such as process pool
+                # workers (sweep.py, the tuning workers) cannot tell apart from a normal shutdown
+                if self.save_log:
+                    self.save_logs(data_to_save)
+                print(f"An error occurred: {e}")
+                print("Program stopped due to an error.")
+                raise
+            if log_generation:
+                self.trust_may_have_changed = False
+            self.run_statistics.update_generation(number_of_generations, self.agents)
+
+            exchange_happened = number_of_generations % self.generations_per_swap == 0
+            if exchange_happened:
+                if self.budget_scheduler is not None:
+                    self.budget_scheduler.end_epoch(self.agents)
+                with self.random_streams.market():
+                    self.exchange_market.exchange_information(number_of_generations)
+                self.run_statistics.update_exchange(number_of_generations, self.exchange_market.last_migrants)
+                for agent_id, agent in enumerate(self.agents):
+                    if isinstance(agent, MemeticAgent):
+                        self.refine_solutions(agent_id, agent)
+                self.trust_may_have_changed = True
+                if self.telemetry is not None:
+                    self.emit_telemetry("epoch", number_of_generations, start_computing_time)
                 # if RESTARTING_ENABLED:
-                #     criterion_met, agent_id = self.restart_criterion_met()
+                #     criterion_met, agent_id = self.restart_criterion_met(RESTART_TRUST_THRESHOLD)
                 #     if criterion_met:
                 #         self.restart_agent(agent_id)
 
+            for criterion in self.run_termination_criteria:
+                criterion.update(self.agents, number_of_generations, exchange_happened)
+
+        # The final generation is always logged
+        if number_of_generations > 0 and not log_generation:
+            for agent_id, agent in enumerate(self.agents):
+                self.log_agent_state(data_to_save, number_of_generations, agent_id, agent)
+
+        if self.telemetry is not None:
+            self.emit_telemetry("end", number_of_generations, start_computing_time)
+
         total_computing_time = time.time() - start_computing_time
 
         if self.save_log:
-            pd.DataFrame(data_to_save).to_csv(self.output_file_path, index=False)
-            self.exchange_market.save_log("." + ''.join(self.output_file_path.split('.')[:-1]) + "_exchange_log.csv")
+            self.save_logs(data_to_save)
 
         for agent in self.agents:
             agent.algorithm.start_computing_time = start_computing_time
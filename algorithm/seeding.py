@@ -0,0 +1,73 @@
+import random
+
+from contextlib import contextmanager, nullcontext
+from typing import Optional
+
+import numpy as np
+
+
+def derive_seed(master_seed: Optional[int], *keys: int) -> Optional[int]:
+    """Derives an independent child seed from the master seed and integer keys (e.g. run index)."""
+    if master_seed is None:
+        return None
+    seed_sequence = np.random.SeedSequence(entropy=master_seed, spawn_key=keys)
+    return int(seed_sequence.generate_state(1, dtype=np.uint32)[0])
+
+
+class RandomStreams:
+    """
+    Independent random generator streams for every island and for the ExchangeMarket, all derived from one master seed.
+
+    jmetal operators and problems draw from the global `random` module, so the island stream is swapped
+    into the global generator for the duration of `island(...)` and its advanced state is stored back afterwards.
+    `island_np_rngs` are NumPy Generators of the islands, passed to the agents and to the NumPy GA engine.
+    With `master_seed=None` nothing is seeded: the global generators are used as before and the island NumPy
+    Generators are seeded from the OS.
+    """
+
+    def __init__(self, master_seed: Optional[int], number_of_islands: int):
+        self.master_seed = master_seed
+        self.number_of_islands = number_of_islands
+
+        if master_seed is None:
+            self.island_rngs = [random] * number_of_islands
+            # Unseeded Generators: NumPy code of the islands needs the Generator interface, not the np.random module
+            self.island_np_rngs = [np.random.default_rng() for _ in range(number_of_islands)]
+            self.market_rng = random
+            self.market_np_rng = np.random
+            return
+
+        # Last child sequence belongs to the ExchangeMarket.
+        child_sequences = np.random.SeedSequence(master_seed).spawn(number_of_islands + 1)
+        self.island_rngs = [
+            random.Random(int(child.generate_state(1, dtype=np.uint32)[0]))
+            for child in child_sequences[:-1]
+        ]
+        self.island_np_rngs = [np.random.default_rng(child) for child in child_sequences[:-1]]
+        self.market_rng = random.Random(int(child_sequences[-1].generate_state(1, dtype=np.uint32)[0]))
+        self.market_np_rng = np.random.default_rng(child_sequences[-1])
+
+    @property
+    def enabled(self) -> bool:
+        return self.master_seed is not None
+
+    def island(self, island_index: int):
+        if not self.enabled:
+            return nullcontext()
+        return self._use_as_global(self.island_rngs[island_index])
+
+    def market(self):
+        if not self.enabled:
+            return nullcontext()
+        return self._use_as_global(self.market_rng)
+
+    @staticmethod
+    @contextmanager
+    def _use_as_global(rng: random.Random):
+        global_state = random.getstate()
+        random.setstate(rng.getstate())
+        try:
+            yield rng
+        finally:
+            rng.setstate(random.getstate())
+            random.setstate(global_state)
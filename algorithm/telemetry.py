@@ -0,0 +1,42 @@
+import json
+import socket
+import time
+
+
+class TelemetryStream:
+    """
+    Opt-in live metrics output of a running simulation, one JSON object per line.
+
+    `target` is either a path of a JSON-lines file (appended to, can be followed with `tail -f`)
+    or `unix:<socket path>` for a local Unix datagram socket. Sending to the socket never blocks,
+    records are dropped when nobody is listening.
+    """
+
+    SOCKET_PREFIX = "unix:"
+
+    def __init__(self, target: str):
+        self.target = target
+        if target.startswith(TelemetryStream.SOCKET_PREFIX):
+            self.socket_path = target[len(TelemetryStream.SOCKET_PREFIX):]
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self.socket.setblocking(False)
+            self.file = None
+        else:
+            self.socket = None
+            self.file = open(target, "a", buffering=1)  # Line buffered, every record is visible immediately
+
+    def emit(self, event: str, **fields) -> None:
+        line = json.dumps({"event": event, "time": time.time(), **fields})
+        if self.file is not None:
+            self.file.write(line + "\n")
+        else:
+            try:
+                self.socket.sendto(line.encode(), self.socket_path)
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+        else:
+            self.socket.close()
@@ -0,0 +1,140 @@
+import time
+
+from abc import ABC, abstractmethod
+from typing import Optional, Sequence
+
+from .agents.base import BaseAgent
+
+
+class RunTerminationCriterion(ABC):
+    """Run-level stopping condition evaluated over all agents (islands), not a single algorithm."""
+
+    def init(self, agents: Sequence[BaseAgent]) -> None:
+        pass
+
+    @abstractmethod
+    def update(
+        self, agents: Sequence[BaseAgent], number_of_generations: int, exchange_happened: bool
+    ) -> None:
+        pass
+
+    @property
+    @abstractmethod
+    def is_met(self) -> bool:
+        pass
+
+    def __str__(self):
+        return self.__class__.__name__
+
+
+def global_best_fitness(agents: Sequence[BaseAgent]) -> float:
+    return min(agent.algorithm.result().objectives[0] for agent in agents)
+
+
+class StoppingByAgentBudgets(RunTerminationCriterion):
+    """Stops once every agent has met its own (jmetal) termination criterion, e.g. its evaluation budget."""
+
+    def __init__(self):
+        self.met = False
+
+    def update(self, agents, number_of_generations, exchange_happened):
+        self.met = all(agent.algorithm.stopping_condition_is_met() for agent in agents)
+
+    @property
+    def is_met(self):
+        return self.met
+
+
+class StoppingByTotalEvaluations(RunTerminationCriterion):
+    """Stops once the evaluations of all agents add up to `max_evaluations`, regardless of how they were split."""
+
+    def __init__(self, max_evaluations: int):
+        self.max_evaluations = max_evaluations
+        self.evaluations = 0
+
+    def update(self, agents, number_of_generations, exchange_happened):
+        self.evaluations = sum(agent.algorithm.evaluations for agent in agents)
+
+    @property
+    def is_met(self):
+        return self.evaluations >= self.max_evaluations
+
+
+class StoppingByTargetFitness(RunTerminationCriterion):
+    """Stops as soon as the best solution over all agents reaches the target fitness (minimization)."""
+
+    def __init__(self, target_fitness: float):
+        self.target_fitness = target_fitness
+        self.best_fitness = float("inf")
+
+    def update(self, agents, number_of_generations, exchange_happened):
+        self.best_fitness = global_best_fitness(agents)
+
+    @property
+    def is_met(self):
+        return self.best_fitness <= self.target_fitness
+
+
+class StoppingByStagnation(RunTerminationCriterion):
+    """Stops when the global best has not improved by more than `tolerance` for `max_exchanges` exchanges in a row."""
+
+    def __init__(self, max_exchanges: int, tolerance: float = 0.0):
+        self.max_exchanges = max_exchanges
+        self.tolerance = tolerance
+        self.best_fitness = float("inf")
+        self.exchanges_without_improvement = 0
+
+    def init(self, agents):
+        self.best_fitness = global_best_fitness(agents)
+        self.exchanges_without_improvement = 0
+
+    def update(self, agents, number_of_generations, exchange_happened):
+        if not exchange_happened:
+            return
+        current_best = global_best_fitness(agents)
+        if current_best < self.best_fitness - self.tolerance:
+            self.exchanges_without_improvement = 0
+        else:
+            self.exchanges_without_improvement += 1
+        self.best_fitness = min(self.best_fitness, current_best)
+
+    @property
+    def is_met(self):
+        return self.exchanges_without_improvement >= self.max_exchanges
+
+
+class StoppingByWallClock(RunTerminationCriterion):
+    """Stops after `max_seconds` of wall-clock time since the start of the main loop."""
+
+    def __init__(self, max_seconds: float):
+        self.max_seconds = max_seconds
+        self.start_time = None
+        self.elapsed_seconds = 0.0
+
+    def init(self, agents):
+        self.start_time = time.time()
+        self.elapsed_seconds = 0.0
+
+    def update(self, agents, number_of_generations, exchange_happened):
+        self.elapsed_seconds = time.time() - self.start_time
+
+    @property
+    def is_met(self):
+        return self.elapsed_seconds >= self.max_seconds
+
+
+def build_run_termination_criteria(
+    target_fitness: Optional[float] = None,
+    stagnation_exchanges: Optional[int] = None,
+    stagnation_tolerance: float = 0.0,
+    max_seconds: Optional[float] = None,
+) -> list[RunTerminationCriterion]:
+    """Builds the optional run-level criteria; the agent budget criterion is always added by the Runner."""
+    criteria = []
+    if target_fitness is not None:
+        criteria.append(StoppingByTargetFitness(target_fitness))
+    if stagnation_exchanges is not None:
+        criteria.append(StoppingByStagnation(stagnation_exchanges, stagnation_tolerance))
+    if max_seconds is not None:
+        criteria.append(StoppingByWallClock(max_seconds))
+    return criteria
@@ -5,6 +5,8 @@ import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 
+from . import analysis_cache, convergence
+from .results_store import EXPERIMENT_FILE_REGEX
 from .constants_and_params import (
     ITERATION_INTERVAL,
     NUMBER_OF_ITERATIONS,
@@ -19,32 +21,39 @@ exp_name = "LABS"  # Title based on Problem, Nr of runs and Agent Combination
 data_dir = f"{OUTPUT_DIR}/2025_{exp_name}_Local"  # Make sure that you choose a dir that has experiments with the same agent setup
 
 
-def plot_and_save_average_agent_class_performance_in_training():
-    dataframes = []
-
-    for filename in os.listdir(path=data_dir):
-        current_df = pd.read_csv(f"{data_dir}/{filename}")
-        current_df = current_df.loc[current_df["generation"] <= NUMBER_OF_ITERATIONS]
-        current_df = current_df.loc[current_df["generation"] % ITERATION_INTERVAL == 0]
-        dataframes.append(current_df)
-
-    steps_count = current_df["generation"].max() // ITERATION_INTERVAL
-
-    best_in_each_iteration_per_run = [
-        np.array(
-            [
-                df.loc[(df["generation"] == ITERATION_INTERVAL * (i + 1))][
-                    "score"
-                ].min()
-                for df in dataframes
-            ]
+def plot_and_save_average_agent_class_performance_in_training(data_dir=data_dir, exp_name=exp_name, df=None):
+    """
+    `df` (columns run, generation, class and score of all runs, e.g. a partition from results_store.load) is
+    plotted instead of the logs in data_dir.
+    """
+    if df is None:
+        dataframes = []
+        class_moments = []
+        # Per file aggregates are cached, only new or changed files are parsed
+        filenames = [filename for filename in os.listdir(path=data_dir) if EXPERIMENT_FILE_REGEX.match(filename)]
+        for run, filename in enumerate(filenames):
+            current_df = analysis_cache.cached(f"{data_dir}/{filename}", analysis_cache.best_per_generation)
+            current_df["run"] = run
+            dataframes.append(current_df)
+            class_moments.append(analysis_cache.cached(f"{data_dir}/{filename}", analysis_cache.class_score_moments))
+        best_df = pd.concat(dataframes, ignore_index=True)
+        class_curves = analysis_cache.combine_class_score_moments(class_moments)
+    else:
+        best_df = convergence.best_per_generation(df, group_columns=[])
+        class_curves = df.groupby(["class", "generation"], sort=True, observed=True)["score"].agg(
+            ["count", "mean", "std"]
         )
-        for i in range(steps_count)
-    ]
-    best_mean = np.array([x.mean() for x in best_in_each_iteration_per_run])
-    best_std = np.array([x.std(ddof=1) for x in best_in_each_iteration_per_run])
 
-    df = pd.concat(dataframes, ignore_index=False)
+    df = best_df.loc[best_df["generation"] <= NUMBER_OF_ITERATIONS]
+    df = df.loc[df["generation"] % ITERATION_INTERVAL == 0]
+    steps_count = df["generation"].max() // ITERATION_INTERVAL
+    generations = ITERATION_INTERVAL * np.arange(1, steps_count + 1)
+
+    best_curve = convergence.convergence_curves(
+        convergence.best_per_generation(df, group_columns=[]), group_columns=[], generations=generations
+    )
+    best_mean = best_curve["mean"].to_numpy()
+    best_std = best_curve["std"].to_numpy()
 
     # Plot drawing.
     # Tweak parameters below when adding new problems or agents!
@@ -56,27 +65,20 @@ def plot_and_save_average_agent_class_performance_in_training():
     ax.plot(iter_labels, best_mean, label="Global best score")
     ax.fill_between(iter_labels, best_mean - best_std, best_mean + best_std, alpha=0.2)
 
+    # Mean and std of the scores of all agents of a class
     mean_std_final_agent_type_datas = []
-    for agent_type in df["class"].unique():
-        mean_data = []
-        std_data = []
-
-        for i in range(steps_count):
-            iter_label = ITERATION_INTERVAL * (i + 1)
-
-            iter_exp_values = df.loc[
-                ((df["generation"] == iter_label) & (df["class"] == agent_type))
-            ]
-            mean_data.append(iter_exp_values["score"].values.mean(axis=0))
-            std_data.append(iter_exp_values["score"].values.std(axis=0, ddof=1))
+    for agent_type in class_curves.index.unique("class"):
+        class_curve = class_curves.loc[agent_type].reindex(generations)
+        mean_data = class_curve["mean"].to_numpy()
+        std_data = class_curve["std"].to_numpy()
 
         mean_std_final_agent_type_datas.append(
-            (np.array(mean_data), np.array(std_data), mean_data[-1], agent_type)
+            (mean_data, std_data, mean_data[-1], agent_type)
         )
 
     mean_std_final_agent_type_datas.sort(key=lambda x: x[2])
 
-    for i in range(BEST_TO_PLOT):
+    for i in range(min(BEST_TO_PLOT, len(mean_std_final_agent_type_datas))):
         mean_data, std_data, final_y, agent_type = mean_std_final_agent_type_datas[i]
         ax.plot(iter_labels, mean_data, label=agent_type)
         # ax.fill_between(
@@ -110,6 +112,7 @@ def plot_and_save_average_agent_class_performance_in_training():
     )
     fig.set_size_inches(10, 7)
     fig.savefig(f"{MULTI_CLASS_PLOTS_DIR}/{exp_name}_graph_{current_date}.png", dpi=100)
+    plt.close(fig)
 
 
 if __name__ == "__main__":
@@ -7,6 +7,8 @@ import numpy as np
 import pandas as pd
 import seaborn as sns
 
+from . import trust_log
+from .results_store import EXPERIMENT_FILE_REGEX
 from .constants_and_params import (
     ITERATION_INTERVAL,
     NUMBER_OF_ITERATIONS,
@@ -21,18 +23,31 @@ exp_name = "LABS"  # Title based on Problem, Nr of runs and Agent Combination
 data_dir = f"{OUTPUT_DIR}/new/{exp_name}"  # Make sure that you choose a dir that has experiments with the same agent setup
 
 
-def plot_and_save_average_agent_class_trust_in_training():
-    """Extracting data into a single dataframe"""
-    dataframes = []
-    for filename in os.listdir(path=data_dir):
-        current_df = pd.read_csv(f"{data_dir}/{filename}")
-        current_df = current_df.loc[current_df["generation"] <= NUMBER_OF_ITERATIONS]
-        current_df = current_df.loc[current_df["generation"] % ITERATION_INTERVAL == 0]
-        dataframes.append(current_df)
-    df = pd.concat(dataframes, ignore_index=False)
+def plot_and_save_average_agent_class_trust_in_training(data_dir=data_dir, exp_name=exp_name, df=None):
+    """
+    Extracting data into a single dataframe. `df` (columns run, generation, agent_id, class and trust of all runs,
+    e.g. a partition from results_store.load) is plotted instead of the logs in data_dir.
+    """
+    if df is None:
+        dataframes = []
+        filenames = [filename for filename in os.listdir(path=data_dir) if EXPERIMENT_FILE_REGEX.match(filename)]
+        for run, filename in enumerate(filenames):
+            current_df = pd.read_csv(f"{data_dir}/{filename}", usecols=["generation", "agent_id", "class", "trust"])
+            current_df["run"] = run
+            dataframes.append(current_df)
+        df = pd.concat(dataframes, ignore_index=True)
+    else:
+        # The store keeps text columns as categoricals
+        df = df[["run", "generation", "agent_id", "class", "trust"]].astype({"class": object, "trust": object})
+    df = df.loc[df["generation"] <= NUMBER_OF_ITERATIONS]
 
     """ Data cleaning and processing """
-    first_generation_df = current_df.loc[current_df["generation"] == ITERATION_INTERVAL]
+    # Decoded before the generation filter, so entries left empty by LOG_TRUST_ON_CHANGE are forward filled
+    trust, _, generations = trust_log.trust_array(df)
+    plotted_generations = generations % ITERATION_INTERVAL == 0
+    trust, generations = trust[:, plotted_generations], generations[plotted_generations]
+
+    first_generation_df = df.loc[(df["run"] == df["run"].iloc[-1]) & (df["generation"] == ITERATION_INTERVAL)]
     unique_ids_and_classes = first_generation_df[
         ["agent_id", "class"]
     ].drop_duplicates()
@@ -41,37 +56,15 @@ def plot_and_save_average_agent_class_trust_in_training():
         unique_ids_and_classes.groupby("class")["agent_id"].apply(list).to_dict()
     )
 
-    # Initialization for trust collection
-    trust_given = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
-    trust_received = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
-
-    # Gather trust data
-    for generation, generation_df in df.groupby("generation"):
-        for _, row in generation_df.iterrows():
-            agent_id = row["agent_id"]
-            class_from = agent_id_to_class[agent_id]
-            trust_entries = [tr.split(":") for tr in row["trust"].split("_")]
-            trust_per_id = {int(agent): int(trust) for agent, trust in trust_entries}
-            for agent, trust in trust_per_id.items():
-                class_to = agent_id_to_class[agent]
-                trust_given[class_from][class_to][generation].append(trust)
-                trust_received[class_to][class_from][generation].append(trust)
-
-    # Calculate mean and standard deviation
-    def calculate_stats(trust_data):
-        return {
-            class_from: {
-                class_to: {
-                    generation: (np.mean(trusts), np.std(trusts, ddod=1))
-                    for generation, trusts in gen_trusts.items()
-                }
-                for class_to, gen_trusts in trusts_to.items()
-            }
-            for class_from, trusts_to in trust_data.items()
-        }
-
-    trust_given = calculate_stats(trust_given)
-    trust_received = calculate_stats(trust_received)
+    # Mean and standard deviation of the trust between classes
+    class_trust = trust_log.class_trust(
+        trust, generations, [agent_id_to_class[agent_id] for agent_id in range(trust.shape[2])]
+    )
+    trust_given = defaultdict(lambda: defaultdict(dict))
+    trust_received = defaultdict(lambda: defaultdict(dict))
+    for row in class_trust.itertuples(index=False):
+        trust_given[row.class_from][row.class_to][row.generation] = (row.mean, row.std)
+        trust_received[row.class_to][row.class_from][row.generation] = (row.mean, row.std)
 
     num_classes = len(trust_given)
     fig, axes = plt.subplots(
@@ -194,6 +187,7 @@ def plot_and_save_average_agent_class_trust_in_training():
         f"{MULTI_CLASS_PLOTS_DIR}/TRUST_{exp_name}__{current_date}.png",
         dpi=100,
     )
+    plt.close(fig)
 
 
 if __name__ == "__main__":
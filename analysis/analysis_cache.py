@@ -0,0 +1,97 @@
+"""
+Incremental cache of per-file aggregates of the generation logs.
+
+Every aggregate of a file is stored in ANALYSIS_CACHE_DIR together with the file's size, mtime and SHA-256.
+It is recomputed only when the file changed: same size and mtime reuse the entry directly, a new mtime
+with the same size is checked against the hash (e.g. files copied between machines), anything else is
+recomputed. Adding runs or re-rendering figures therefore only parses new or changed files.
+"""
+
+import hashlib
+import os
+import pickle
+
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from .constants_and_params import ANALYSIS_CACHE_DIR
+
+AGGREGATES_VERSION = 2  # Bump when an aggregate below changes, so old entries are recomputed
+
+
+def content_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cached(path: str, compute: Callable[[str], object], cache_dir: str = ANALYSIS_CACHE_DIR):
+    """Returns compute(path), from the cache if the file did not change since it was last computed."""
+    aggregate = f"{compute.__module__}.{compute.__qualname__}:{AGGREGATES_VERSION}"
+    key = hashlib.sha256(f"{os.path.abspath(path)}|{aggregate}".encode()).hexdigest()
+    entry_path = f"{cache_dir}/{key}.pkl"
+    stat = os.stat(path)
+
+    entry = None
+    if os.path.exists(entry_path):
+        with open(entry_path, "rb") as file:
+            entry = pickle.load(file)
+        if entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry["value"]
+        if entry["size"] == stat.st_size and entry["sha256"] == content_hash(path):
+            entry["mtime_ns"] = stat.st_mtime_ns
+        else:
+            entry = None
+
+    if entry is None:
+        entry = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": content_hash(path),
+            "value": compute(path),
+        }
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(entry_path, "wb") as file:
+        pickle.dump(entry, file)
+    return entry["value"]
+
+
+### Aggregates ###
+def best_per_generation(path: str) -> pd.DataFrame:
+    """Best (minimum) score over all agents in every generation: columns generation, score."""
+    df = pd.read_csv(path, usecols=["generation", "score"])
+    return df.groupby("generation", as_index=False, sort=True)["score"].min()
+
+
+def class_score_moments(path: str) -> pd.DataFrame:
+    """
+    Count, mean and M2 (sum of squared deviations from the mean) of the agent scores per class and generation:
+    columns class, generation, count, mean, m2. combine_class_score_moments merges them over many files.
+    """
+    df = pd.read_csv(path, usecols=["generation", "class", "score"])
+    groups = df.groupby(["class", "generation"], sort=True)["score"]
+    moments = groups.agg(count="size", mean="mean")
+    moments["m2"] = groups.var(ddof=0) * moments["count"]
+    return moments.reset_index()
+
+
+def combine_class_score_moments(moments: list[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Mean and std (ddof=1) of the scores per class and generation from the class_score_moments of many files,
+    merged with Chan's parallel update (M2 = sum of M2_i + sum of n_i * (mean_i - mean)^2), which stays accurate
+    when the spread is small compared to the mean.
+    """
+    parts = pd.concat(moments, ignore_index=True)
+    keys = ["class", "generation"]
+    parts["weighted_mean"] = parts["count"] * parts["mean"]
+    total = parts.groupby(keys, sort=True)[["count", "weighted_mean"]].sum()
+    total["mean"] = total["weighted_mean"] / total["count"]
+    combined_mean = total["mean"].reindex(pd.MultiIndex.from_frame(parts[keys])).to_numpy()
+    parts["m2"] += parts["count"] * (parts["mean"] - combined_mean) ** 2
+    m2 = parts.groupby(keys, sort=True)["m2"].sum()
+    variance = m2 / (total["count"] - 1)
+    return pd.DataFrame({"count": total["count"], "mean": total["mean"], "std": np.sqrt(variance.clip(lower=0))})
@@ -0,0 +1,165 @@
+"""
+Vectorized percentile bootstrap confidence intervals of the final best fitness and of whole convergence curves.
+
+Every group (setup / problem) draws one (resamples, runs) resampling matrix that is applied to all generations
+at once, so there is no Python loop over generations:
+- mean: the resampled means of all generations are one product of the resample count matrix with the
+  (runs, generations) scores,
+- median / quantiles: every generation is sorted once and the resampling matrix draws sorted positions instead
+  of runs (the same distribution of resamples in each generation). The k-th smallest value of a resample is
+  then at the same sorted position in every generation, known from the sorted resample indices alone.
+The bands are pointwise (per generation) intervals. Percentiles over the resamples are taken in chunks of
+generations to bound memory.
+"""
+
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .constants_and_params import BOOTSTRAP_CONFIDENCE, BOOTSTRAP_RESAMPLES, BOOTSTRAP_SEED
+
+CHUNK_ELEMENTS = 1 << 24  # Resampled statistics held in memory at once
+
+
+def resampling_matrix(runs: int, resamples: int, rng: np.random.Generator) -> np.ndarray:
+    """(resamples, runs) indices of the runs drawn with replacement."""
+    return rng.integers(0, runs, size=(resamples, runs))
+
+
+def _quantile(statistic: Union[str, float]) -> float:
+    return 0.5 if statistic == "median" else float(statistic)
+
+
+class Resampler:
+    """Bootstrap distribution of the statistic of every column of (runs, columns) matrices, from one resampling matrix."""
+
+    def __init__(self, indices: np.ndarray, statistic: Union[str, float] = "median"):
+        resamples, runs = indices.shape
+        self.statistic = statistic
+        if statistic == "mean":
+            counts = np.zeros((resamples, runs))
+            np.add.at(counts, (np.arange(resamples)[:, None], indices), 1)
+            self.weights = counts / runs
+        else:
+            # Lower / upper order statistics and weight of the resampled quantile (numpy's linear interpolation)
+            sorted_indices = np.sort(indices, axis=1)
+            position = _quantile(statistic) * (runs - 1)
+            self.lower = sorted_indices[:, int(np.floor(position))]
+            self.upper = sorted_indices[:, int(np.ceil(position))]
+            self.weight = position - np.floor(position)
+
+    def distribution(self, samples: np.ndarray) -> np.ndarray:
+        """(resamples, columns) bootstrap distribution of a complete (runs, columns) matrix."""
+        if self.statistic == "mean":
+            return self.weights @ samples
+        sorted_samples = np.sort(samples, axis=0)
+        return (1 - self.weight) * sorted_samples[self.lower] + self.weight * sorted_samples[self.upper]
+
+    def estimate(self, samples: np.ndarray) -> np.ndarray:
+        if self.statistic == "mean":
+            return samples.mean(axis=0)
+        return np.quantile(samples, _quantile(self.statistic), axis=0)
+
+
+def bootstrap_ci(
+    samples: np.ndarray,
+    statistic: Union[str, float] = "median",
+    resamples: int = BOOTSTRAP_RESAMPLES,
+    confidence: float = BOOTSTRAP_CONFIDENCE,
+    rng: Optional[np.random.Generator] = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Statistic ("mean", "median" or a quantile in [0, 1]) and percentile bootstrap confidence interval of every
+    column of a (runs, columns) matrix, or of a 1-D sample. Returns (estimate, low, high) with the shape of one
+    row. Columns with missing values (NaN) get NaN.
+    """
+    samples = np.asarray(samples, dtype=float)
+    one_dimensional = samples.ndim == 1
+    samples = samples.reshape(len(samples), -1)
+    rng = rng if rng is not None else np.random.default_rng(BOOTSTRAP_SEED)
+    resampler = Resampler(resampling_matrix(len(samples), resamples, rng), statistic)
+
+    estimate = np.full(samples.shape[1], np.nan)
+    low = np.full(samples.shape[1], np.nan)
+    high = np.full(samples.shape[1], np.nan)
+    complete = np.flatnonzero(~np.isnan(samples).any(axis=0))
+    alpha = 1 - confidence
+    chunk = max(1, CHUNK_ELEMENTS // resamples)
+    for start in range(0, len(complete), chunk):
+        columns = complete[start : start + chunk]
+        chunk_samples = samples[:, columns]
+        estimate[columns] = resampler.estimate(chunk_samples)
+        low[columns], high[columns] = np.quantile(
+            resampler.distribution(chunk_samples), [alpha / 2, 1 - alpha / 2], axis=0
+        )
+
+    if one_dimensional:
+        return estimate[0], low[0], high[0]
+    return estimate, low, high
+
+
+def _group_rng(seed: int, group_number: int) -> np.random.Generator:
+    return np.random.default_rng([seed, group_number])
+
+
+def final_best_ci(
+    final_scores: pd.DataFrame,
+    group_columns: Sequence[str] = ("setup", "problem"),
+    statistic: Union[str, float] = "median",
+    resamples: int = BOOTSTRAP_RESAMPLES,
+    confidence: float = BOOTSTRAP_CONFIDENCE,
+    seed: int = BOOTSTRAP_SEED,
+) -> pd.DataFrame:
+    """Bootstrap CI of the final scores (results_store.final_scores) per group: runs, estimate, low, high."""
+    rows = []
+    for group_number, (group, scores) in enumerate(final_scores.groupby(list(group_columns), sort=True)):
+        estimate, low, high = bootstrap_ci(
+            scores["score"].to_numpy(), statistic, resamples, confidence, _group_rng(seed, group_number)
+        )
+        rows.append((*group, len(scores), estimate, low, high))
+    return pd.DataFrame(rows, columns=[*group_columns, "runs", "estimate", "low", "high"]).set_index(
+        list(group_columns)
+    )
+
+
+def bootstrap_curves(
+    best_df: pd.DataFrame,
+    group_columns: Sequence[str] = ("setup", "problem"),
+    generations: Optional[Sequence[int]] = None,
+    statistic: Union[str, float] = "median",
+    resamples: int = BOOTSTRAP_RESAMPLES,
+    confidence: float = BOOTSTRAP_CONFIDENCE,
+    seed: int = BOOTSTRAP_SEED,
+    run_column: str = "run",
+) -> pd.DataFrame:
+    """
+    Bootstrap CI bands of the best-per-generation curves (convergence.best_per_generation), indexed like
+    convergence.convergence_curves by the group columns and generation. Columns: runs, estimate, low, high.
+    Generations a run did not log (e.g. after it stopped early) carry its last logged score forward.
+    """
+    frames = []
+    for group_number, (group, group_df) in enumerate(best_df.groupby(list(group_columns), sort=True)):
+        matrix = group_df.pivot(index=run_column, columns="generation", values="score")
+        if generations is not None:
+            matrix = matrix.reindex(columns=generations)
+        matrix = matrix.ffill(axis=1)
+        estimate, low, high = bootstrap_ci(
+            matrix.to_numpy(), statistic, resamples, confidence, _group_rng(seed, group_number)
+        )
+        frame = pd.DataFrame(
+            {"runs": matrix.count().to_numpy(), "estimate": estimate, "low": low, "high": high},
+            index=pd.Index(matrix.columns, name="generation"),
+        )
+        frames.append(pd.concat({group: frame}, names=list(group_columns)))
+    return pd.concat(frames)
+
+
+def band_arrays(group_curve: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """(generations, estimate, low, high) arrays of one bootstrap curve, ready to plot."""
+    return (
+        group_curve.index.to_numpy(),
+        group_curve["estimate"].to_numpy(),
+        group_curve["low"].to_numpy(),
+        group_curve["high"].to_numpy(),
+    )
@@ -66,7 +66,7 @@ def plot_and_save_box_and_whiskers_graphs_with_best_results_for_some_iterations(
             iter_exp_values = current_df.loc[current_df["iter"] == iter_label]
             exp_data.append(iter_exp_values["exp_value"].values.tolist())
 
-        ax.boxplot(exp_data, labels=iter_labels)
+        ax.boxplot(exp_data, tick_labels=iter_labels)
         ax.set_title(exp_name)
 
         # Plot saving.
@@ -85,5 +85,37 @@ def plot_and_save_box_and_whiskers_graphs_with_best_results_for_some_iterations(
         )
 
 
+def plot_and_save_box_and_whiskers_graph(best_df: pd.DataFrame, exp_name: str):
+    """
+    Box plot of the best scores of all runs every ITERATION_INTERVAL generations.
+    `best_df` holds the best score of every run and generation (convergence.best_per_generation).
+    """
+    best_df = best_df.loc[
+        (best_df["generation"] <= NUMBER_OF_ITERATIONS) & (best_df["generation"] % ITERATION_INTERVAL == 0)
+    ]
+    iter_labels = sorted(best_df["generation"].unique())
+    exp_data = [best_df.loc[best_df["generation"] == iter_label, "score"].to_numpy() for iter_label in iter_labels]
+
+    fig, ax = plt.subplots(1, 1)
+    ax.boxplot(exp_data, tick_labels=iter_labels)
+    ax.set_title(exp_name)
+
+    # Plot saving.
+    os.makedirs(BOX_AND_WHISKERS_PLOTS_DIR, exist_ok=True)
+
+    now = datetime.datetime.now()
+    current_date = (
+        f"{now.year}_{now.month}_{now.day}_{now.hour}_{now.minute}_{now.second}"
+    )
+    plt.subplots_adjust(
+        left=0.2, bottom=0.05, right=0.8, top=0.95, wspace=0.4, hspace=0.4
+    )
+    fig.set_size_inches(10, 7)
+    fig.savefig(
+        f"{BOX_AND_WHISKERS_PLOTS_DIR}/{exp_name}_graph_{current_date}.png", dpi=100
+    )
+    plt.close(fig)
+
+
 if __name__ == "__main__":
     plot_and_save_box_and_whiskers_graphs_with_best_results_for_some_iterations()
@@ -1,7 +1,9 @@
 from algorithm.agents import StrategyAgent, AgentWithTrust
 from algorithm.agents.base import BaseAgent
 from algorithm.agents.strategy_based import AcceptStrategy, SendStrategy, TrustMechanism, MigrationPolicy
-from problems import LABS, ExpandedSchaffer, Griewank, Ackley
+from algorithm.budget import BudgetPolicy
+from algorithm.numpy_ga import GAEngine
+from algorithm.problems import LABS, ExpandedSchaffer, Griewank, Ackley
 from itertools import product
 
 
@@ -13,8 +15,35 @@ PLOTS_DIR = "./final_graphs"
 BOX_AND_WHISKERS_PLOTS_DIR = f"{PLOTS_DIR}/box_and_whiskers"
 MEAN_PLOTS_DIR = f"{PLOTS_DIR}/mean"
 MULTI_CLASS_PLOTS_DIR = f"{PLOTS_DIR}/multi_class"
+STATISTICAL_TESTS_DIR = f"{PLOTS_DIR}/statistical_tests" # Result tables of `python -m analysis.significance`
 NUMBER_OF_ITERATIONS = 19998  # USED AS HIGH BOUND FOR PLOTTING SCRIPTS # 9998 for 100000 evaluations, 998 for 10000 evaluations
 ITERATION_INTERVAL = 50  # resolution of x axis in plots
+BOOTSTRAP_RESAMPLES = 2000 # Resamples of the bootstrap confidence intervals (analysis/bootstrap.py)
+BOOTSTRAP_CONFIDENCE = 0.95
+BOOTSTRAP_SEED = 0 # Fixed, so the bands of a figure do not change between renders
+CONVERGENCE_BANDS = "std" # Bands of the mean best fitness plots: "std" (mean ± std) or "bootstrap" (median and bootstrap CI)
+DECIMATION_METHOD = "lttb" # Curve decimation before plotting: "lttb", "minmax" or None (plot every generation)
+DECIMATION_POINTS = 2000 # Points per curve after decimation (about two per pixel of a 10 inch, 100 dpi figure)
+ANALYSIS_CACHE_DIR = "./.analysis_cache" # Per file aggregates of the logs, recomputed only for new or changed files
+# Labels and high contrast colors of the setups ("{trust mechanism}_{migration policy}") in the plots
+SETUP_LABELS = {
+    "Global_Basic": "Reputacja + Losowanie",
+    "Global_TrustBasedAuction": "Reputacja + Aukcja",
+    "Global_TrustBasedRoulette": "Reputacja + Ruletka",
+    "Local_Basic": "Zaufanie + Losowanie",
+    "Local_TrustBasedAuction": "Zaufanie + Aukcja",
+    "Local_TrustBasedRoulette": "Zaufanie + Ruletka",
+    "NoTrust_Basic": "Bazowe IMGA",
+}
+SETUP_COLORS = {
+    "Global_Basic": "#0000FF",                  # Bright Blue
+    "Global_TrustBasedAuction": "#FF0000",      # Bright Red
+    "Global_TrustBasedRoulette": "#00FF00",     # Bright Green
+    "Local_Basic": "#FF8000",                   # Orange
+    "Local_TrustBasedAuction": "#8000FF",       # Purple
+    "Local_TrustBasedRoulette": "#FF0080",      # Magenta
+    "NoTrust_Basic": "#000000",                 # Black
+}
 ################################################################################
 
 
@@ -24,10 +53,32 @@ TRUST_MECHANISM = TrustMechanism.Global
 MIGRATION_POLICY = MigrationPolicy.TrustBasedAuction
 STARTING_TRUST = 12 # Lower trust value means higher trust level (I know it's confusing, sry about that)
 AUCTION_TRUST_WEIGHT = 0.4
+BUDGET_POLICY = BudgetPolicy.Uniform # UCB reallocates the total evaluation budget between islands every migration epoch
+UCB_EXPLORATION = 0.5
 # Base Experiment Parameters
 OUTPUT_DIR = "./final_exp_output"
+RESULTS_STORE_DIR = "./final_exp_store" # Columnar store of all outputs, built by `python -m analysis.results_store`
 MAX_EVALUATIONS = 20000 # STOPPING CRITERION, COUNTED PER AGENT
+# Optional run-level stopping criteria evaluated over all agents (None = disabled)
+TARGET_FITNESS = None # Stop once the global best reaches this fitness
+STAGNATION_EXCHANGES = None # Stop after this many exchanges without improvement of the global best
+STAGNATION_TOLERANCE = 0.0 # Minimal improvement of the global best that resets the stagnation counter
+MAX_WALL_CLOCK_SECONDS = None # Stop after this many seconds
 NUMBER_OF_RUNS = 1
+BATCH_EVALUATION = False # Evaluate the offspring of all agents of a generation in one (vectorized) call
+BATCH_EVALUATION_PROCESSES = None # Worker processes for the batched evaluation, None = evaluate in the main process
+GA_ENGINE = GAEngine.Jmetal # Island GA: GAEngine.Jmetal (jmetal objects) or GAEngine.NumPy (population matrix operators)
+LOG_INTERVAL = 1 # Log every k-th generation (exchange generations and the final one are always logged), should divide ITERATION_INTERVAL
+LOG_TRUST_ON_CHANGE = False # Log trust only when it changes, empty entries mean the previous value of the agent
+TELEMETRY_TARGET = None # Live per epoch metrics: path of a JSON-lines file or "unix:<socket path>", None = disabled
+SAVE_RUN_SUMMARY = True # Write the streaming run statistics as exp_N_summary.json next to the log
+SAVE_EXCHANGE_EVENTS = True # Write the structured exchange log as exp_N_exchange_events.bin (algorithm/exchange_events.py)
+SEED = None # Master seed for reproducible runs (per run seeds and per island streams are derived from it), None = unseeded
+TUNING_PROBLEM = ExpandedSchaffer # Problem of tuning instances that do not name one (e.g. "instance1"), see simulation.tuning_problem
+TUNING_SEEDS_PER_EVALUATION = 1 # Seeds run per tuning call (derived from the irace seed), their costs are aggregated
+TUNING_COST_AGGREGATION = "mean" # "mean" or "median" of the per seed costs
+TUNING_PROCESSES = None # Worker processes for the seeds of one tuning call, None = run them sequentially
+RESULTS_CACHE_PATH = None # SQLite database of seeded run results (e.g. "results_cache.sqlite"), repeated runs are returned from it, None = disabled
 POPULATION_SIZE = 20
 OFFSPRING_POPULATION_SIZE = 10
 CROSSOVER_RATE = 0.9
@@ -36,6 +87,9 @@ AGENTS_NUMBER = 12
 MIGRATION = True
 GENERATIONS_PER_SWAP = 50
 POPULATION_PART_TO_SWAP = 0.5
+# Migrants within this distance of the receiving population (or of each other) are not accepted, None = no filtering.
+# Float problems: Euclidean distance with variables scaled to [0, 1], LABS: part of the bits that differ (0 = exact duplicates)
+MIGRANT_DUPLICATE_RADIUS = None
 NUM_OF_VARS = 100
 PROBLEMS_TO_TEST = [
     Griewank,
@@ -54,7 +108,7 @@ for (send_strategy, accept_strategy) in product(
     [AcceptStrategy.Better, AcceptStrategy.Different],
 ):
     for _ in range(3):
-        agents.append(StrategyAgent)
+        agents.append(StrategyAgent) # MemeticAgent adds local search of elites and accepted migrants after exchanges
         send_strategies.append(send_strategy)
         accept_strategies.append(accept_strategy)
 
@@ -0,0 +1,76 @@
+"""
+Convergence curve aggregation shared by the plotting scripts.
+
+Everything is computed with one groupby pass over all setups at once instead of filtering the data
+frame for every generation.
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+QUANTILES = (0.25, 0.5, 0.75)
+
+
+def best_per_generation(
+    df: pd.DataFrame,
+    group_columns: Sequence[str] = ("setup", "problem"),
+    run_column: str = "run",
+    max_generation: Optional[int] = None,
+) -> pd.DataFrame:
+    """Best (minimum) score over all agents of every run in every generation: group columns, run, generation, score."""
+    if max_generation is not None:
+        df = df.loc[df["generation"] <= max_generation]
+    keys = [*group_columns, run_column, "generation"]
+    return df.groupby(keys, sort=True, observed=True)["score"].min().reset_index()
+
+
+def convergence_curves(
+    best_df: pd.DataFrame,
+    group_columns: Sequence[str] = ("setup", "problem"),
+    quantiles: Sequence[float] = QUANTILES,
+    generations: Optional[Sequence[int]] = None,
+) -> pd.DataFrame:
+    """
+    Statistics of the best-per-generation scores over runs, indexed by the group columns and generation.
+    Columns: count, mean, std (ddof=1), sem and one q<percent> column per quantile (e.g. q50 = median).
+    With `generations` every group is reindexed to exactly these generations (missing ones are NaN).
+    """
+    keys = [*group_columns, "generation"]
+    grouped = best_df.groupby(keys, sort=True, observed=True)["score"]
+    curves = grouped.agg(["count", "mean", "std", "sem"])
+    if len(quantiles) > 0:
+        quantile_columns = grouped.quantile(list(quantiles)).unstack()
+        quantile_columns.columns = [f"q{round(quantile * 100)}" for quantile in quantile_columns.columns]
+        curves = curves.join(quantile_columns)
+
+    if generations is not None:
+        if group_columns:
+            groups = curves.index.droplevel("generation").unique()
+            index = pd.MultiIndex.from_tuples(
+                [
+                    (*(group if isinstance(group, tuple) else (group,)), generation)
+                    for group in groups
+                    for generation in generations
+                ],
+                names=keys,
+            )
+        else:
+            index = pd.Index(generations, name="generation")
+        curves = curves.reindex(index)
+    return curves
+
+
+def curve(curves: pd.DataFrame, *group: str) -> pd.DataFrame:
+    """Curve of one group (e.g. curve(curves, setup, problem)), indexed by generation."""
+    return curves.xs(group, level=list(range(len(group)))) if group else curves
+
+
+def mean_and_std_arrays(group_curve: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(generations, mean, std) arrays of one curve, ready to plot."""
+    return (
+        group_curve.index.to_numpy(),
+        group_curve["mean"].to_numpy(),
+        group_curve["std"].to_numpy(),
+    )
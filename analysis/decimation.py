@@ -0,0 +1,84 @@
+"""
+Decimation of long curves (e.g. 20000 generations) before plotting, so a figure draws a few thousand points
+per line and band instead of every generation while keeping the visible shape:
+- "lttb": largest-triangle-three-buckets, one point per bucket chosen to keep the largest visual area,
+- "minmax": the minimum and maximum of every bucket (an exact envelope at bucket resolution).
+Bands (e.g. mean ± std) keep the lowest low and highest high of the bucket of every selected point, so they
+never shrink.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from .constants_and_params import DECIMATION_METHOD, DECIMATION_POINTS
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, points: int) -> tuple[np.ndarray, np.ndarray]:
+    """Indices of the points kept by LTTB and the start index of the bucket of every kept point."""
+    n = len(x)
+    # First and last points are kept as their own buckets, the rest is split into points - 2 buckets
+    edges = np.linspace(1, n - 1, points - 1).astype(int)
+    starts = np.concatenate(([0], edges[:-1], [n - 1]))
+    selected = np.empty(points, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    for bucket in range(1, points - 1):
+        start, end = edges[bucket - 1], edges[bucket]
+        next_end = edges[bucket + 1] if bucket + 1 < len(edges) else n
+        # Triangle with the previously selected point and the average of the next bucket
+        previous_x, previous_y = x[selected[bucket - 1]], y[selected[bucket - 1]]
+        next_x, next_y = x[end:next_end].mean(), y[end:next_end].mean()
+        areas = np.abs(
+            (previous_x - next_x) * (y[start:end] - previous_y) - (previous_x - x[start:end]) * (next_y - previous_y)
+        )
+        selected[bucket] = start + int(np.argmax(areas))
+    return selected, starts
+
+
+def minmax_indices(y: np.ndarray, points: int) -> tuple[np.ndarray, np.ndarray]:
+    """Indices of the minimum and maximum of every one of points / 2 buckets, and the bucket starts of them."""
+    n = len(y)
+    starts = np.linspace(0, n, max(points // 2, 1), endpoint=False).astype(int)
+    buckets = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, n)))
+    # Position of the minimum / maximum inside every bucket: sort by (bucket, value) once
+    order = np.lexsort((y, buckets))
+    counts = np.diff(np.append(starts, n))
+    minima = order[starts]
+    maxima = order[starts + counts - 1]
+    selected = np.unique(np.concatenate((minima, maxima, [0, n - 1])))
+    return selected, starts
+
+
+def decimate(
+    x,
+    y,
+    low=None,
+    high=None,
+    method: Optional[str] = DECIMATION_METHOD,
+    points: int = DECIMATION_POINTS,
+) -> tuple[np.ndarray, np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]:
+    """
+    Decimated (x, y, low, high) of a curve and its optional band. Points where y is NaN are dropped first.
+    With method None, or curves that already have at most `points` points, the (NaN free) curve is returned.
+    """
+    x, y = np.asarray(x), np.asarray(y, dtype=float)
+    kept = ~np.isnan(y)
+    x, y = x[kept], y[kept]
+    low = np.asarray(low, dtype=float)[kept] if low is not None else None
+    high = np.asarray(high, dtype=float)[kept] if high is not None else None
+    if method is None or len(x) <= points:
+        return x, y, low, high
+
+    if method == "lttb":
+        selected, starts = lttb_indices(x.astype(float), y, points)
+    elif method == "minmax":
+        selected, starts = minmax_indices(y, points)
+    else:
+        raise ValueError(f"Unknown decimation method: {method}")
+
+    buckets = np.searchsorted(starts, selected, side="right") - 1
+    if low is not None:
+        low = np.fmin.reduceat(low, starts)[buckets]
+    if high is not None:
+        high = np.fmax.reduceat(high, starts)[buckets]
+    return x[selected], y[selected], low, high
@@ -6,65 +6,49 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
+from . import analysis_cache, convergence, decimation
 from .constants_and_params import (
     MEAN_PLOTS_DIR,
     NUMBER_OF_ITERATIONS,
     OUTPUT_DIR,
-    EXPERIMENTS,
 )
 
 
 def plot_and_save_graphs_with_mean_best_results_for_each_iteration():
-    exp_labels = []
-    exp_iter = []
-    exp_values = []
+    runs = []
 
     for experiment_name in ["Griewank"]:
-        for filename in os.listdir(OUTPUT_DIR):
+        for run, filename in enumerate(os.listdir(OUTPUT_DIR)):
             regex = rf".*{experiment_name}.*\.csv"
             if re.match(regex, filename):
-                current_df = pd.read_csv(f"{OUTPUT_DIR}/{filename}")
+                current_df = analysis_cache.cached(f"{OUTPUT_DIR}/{filename}", analysis_cache.best_per_generation)
+                current_df["exp_label"] = experiment_name
+                current_df["run"] = run
+                runs.append(current_df)
 
-                current_df = current_df.loc[
-                    current_df["generation"] <= NUMBER_OF_ITERATIONS
-                ]
-
-                current_df = current_df.loc[
-                    current_df.groupby(["generation"])["score"].idxmin()
-                ]
-                current_df = current_df[["generation", "score"]]
-
-                exp_labels.extend([experiment_name for _ in range(current_df.shape[0])])
-                exp_iter.extend(current_df["generation"].values.tolist())
-                exp_values.extend(current_df["score"].values.tolist())
-
-    data = {"exp_label": exp_labels, "iter": exp_iter, "exp_value": exp_values}
-    df = pd.DataFrame.from_dict(data)
+    best_df = convergence.best_per_generation(
+        pd.concat(runs, ignore_index=True), group_columns=["exp_label"], max_generation=NUMBER_OF_ITERATIONS
+    )
+    curves = convergence.convergence_curves(
+        best_df, group_columns=["exp_label"], generations=range(1, NUMBER_OF_ITERATIONS + 1)
+    )
 
     fig, ax = plt.subplots(1, 1)
     for i, exp_name in enumerate(["Griewank"]):
 
-        current_df = df.loc[df["exp_label"] == exp_name]
-
-        exp_data = []
-        iter_labels = []
-        std_data = []
-
-        for iter_label in range(1, NUMBER_OF_ITERATIONS + 1):
-            iter_labels.append(iter_label)
-
-            iter_exp_values = current_df.loc[current_df["iter"] == iter_label]
-            exp_data.append(iter_exp_values["exp_value"].values.mean().tolist())
-            std_data.append(iter_exp_values["exp_value"].values.std(ddof=1).tolist())
-
-        exp_data = np.array(exp_data)
+        iter_labels, exp_data, std_data = convergence.mean_and_std_arrays(convergence.curve(curves, exp_name))
+        # Curves are reindexed to every generation, the ones no run logged (LOG_INTERVAL > 1, early stops) are NaN
+        logged = ~np.isnan(exp_data)
+        iter_labels, exp_data, std_data = iter_labels[logged], exp_data[logged], std_data[logged]
         final_y = exp_data.min()
-        std_data = np.array(std_data)
+        iter_labels, exp_data, band_low, band_high = decimation.decimate(
+            iter_labels, exp_data, exp_data - std_data, exp_data + std_data
+        )
         ax.plot(iter_labels, exp_data, label=exp_name)
         ax.fill_between(
             iter_labels,
-            exp_data - std_data,
-            exp_data + std_data,
+            band_low,
+            band_high,
             alpha=0.2,
         )
         ax.annotate(
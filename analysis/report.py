@@ -0,0 +1,126 @@
+"""
+Renders the whole final_graphs tree with one command:
+
+    python -m analysis.report --processes 8
+
+The results store is brought up to date and the generation logs of all setups are loaded from it once in the
+main process, the curves and final scores are computed from this single load and every other figure gets its
+slice of it. Every figure is then rendered in a process pool with the non-interactive Agg backend: the mean
+best fitness curves and the final fitness box plots of every problem, and the multi-class performance, trust
+and box-and-whiskers plots of every setup and problem.
+"""
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import argparse
+
+from concurrent.futures import ProcessPoolExecutor
+
+from . import bootstrap, convergence, results_store
+from .agent_class_performance import plot_and_save_average_agent_class_performance_in_training
+from .agent_class_trust import plot_and_save_average_agent_class_trust_in_training
+from .box_and_whiskers import plot_and_save_box_and_whiskers_graph
+from .constants_and_params import CONVERGENCE_BANDS, NUMBER_OF_ITERATIONS, OUTPUT_DIR
+from .final_fitness import plot_mean_best_results
+from .final_summary import plot_final_summary
+
+
+def render_tasks(setups=None, problems=None) -> list[tuple]:
+    """(figure name, function, arguments) of every figure of the report, setups / problems None = all."""
+    results_store.ingest()
+    partitions = [
+        (setup, problem)
+        for setup, problem in results_store.partitions()[["setup", "problem"]].itertuples(index=False)
+        if (setups is None or setup in setups) and (problems is None or problem in problems)
+    ]
+    setup_names = sorted({setup for setup, _ in partitions})
+    problem_names = sorted({problem for _, problem in partitions})
+
+    # The only read of the logs of all setups, the per setup figures get slices of it
+    data = results_store.load(
+        setups=setup_names, problems=problem_names, columns=["generation", "agent_id", "class", "score", "trust"]
+    )
+    final_scores = data.groupby(["setup", "problem", "run"], as_index=False, sort=True)["score"].min()
+    best_df = convergence.best_per_generation(data, max_generation=NUMBER_OF_ITERATIONS)
+    curves = convergence.convergence_curves(best_df, generations=range(1, NUMBER_OF_ITERATIONS + 1))
+    bands = (
+        bootstrap.bootstrap_curves(best_df, generations=range(1, NUMBER_OF_ITERATIONS + 1))
+        if CONVERGENCE_BANDS == "bootstrap"
+        else None
+    )
+
+    tasks = []
+    for problem in problem_names:
+        problem_setups = [setup for setup in setup_names if (setup, problem) in partitions]
+        tasks.append(
+            (
+                f"mean_{problem}",
+                plot_mean_best_results,
+                (
+                    problem,
+                    curves.xs(problem, level="problem", drop_level=False),
+                    problem_setups,
+                    "Wszystkie modele",
+                    f"mean_{problem}.png",
+                    bands.xs(problem, level="problem", drop_level=False) if bands is not None else None,
+                ),
+            )
+        )
+    tasks.append(("final_summary", plot_final_summary, (final_scores, setup_names, problem_names)))
+    partition_rows = data.groupby(["setup", "problem"], sort=False).indices
+    partition_best_rows = best_df.groupby(["setup", "problem"], sort=False).indices
+    for setup, problem in partitions:
+        data_dir = f"{OUTPUT_DIR}/{setup}/{problem}"
+        exp_name = f"{setup}_{problem}".replace("/", "_")
+        partition_data = data.iloc[partition_rows[(setup, problem)]]
+        partition_best_df = best_df.iloc[partition_best_rows[(setup, problem)]]
+        tasks.append(
+            (
+                f"{exp_name} performance",
+                plot_and_save_average_agent_class_performance_in_training,
+                (data_dir, exp_name, partition_data),
+            )
+        )
+        tasks.append(
+            (
+                f"{exp_name} trust",
+                plot_and_save_average_agent_class_trust_in_training,
+                (data_dir, exp_name, partition_data),
+            )
+        )
+        tasks.append((f"{exp_name} box and whiskers", plot_and_save_box_and_whiskers_graph, (partition_best_df, exp_name)))
+    return tasks
+
+
+def render(name, function, arguments):
+    try:
+        function(*arguments)
+    except Exception as e:
+        return name, f"{type(e).__name__}: {e}"
+    return name, None
+
+
+def render_report(processes=None, setups=None, problems=None) -> list[tuple[str, str]]:
+    """Renders all figures and returns the (figure name, error) of the ones that failed."""
+    tasks = render_tasks(setups, problems)
+    failed = []
+    with ProcessPoolExecutor(processes) as executor:
+        for name, error in executor.map(render, *zip(*tasks)):
+            if error is None:
+                print(f"Rendered {name}")
+            else:
+                print(f"Failed {name}: {error}")
+                failed.append((name, error))
+    return failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render all figures of the experiment outputs.")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--setups", nargs="*", default=None, help="Only these setups (default: all).")
+    parser.add_argument("--problems", nargs="*", default=None, help="Only these problems (default: all).")
+    arguments = parser.parse_args()
+
+    render_report(arguments.processes, arguments.setups, arguments.problems)
@@ -0,0 +1,242 @@
+"""
+Indexed columnar store of all experiment outputs.
+
+`ingest()` consolidates every {OUTPUT_DIR}/{setup}/{problem}/exp_N.csv, exp_N_exchange_log.csv and
+exp_N_exchange_events.bin into one partition per setup and problem:
+
+    {RESULTS_STORE_DIR}/{setup}/{problem}/meta.json
+    {RESULTS_STORE_DIR}/{setup}/{problem}/{table}/{column}.npy
+
+Tables are "generations" (the per generation agent logs), "exchanges" (the exchange logs, one row per
+exchange) and "exchange_events" (the structured exchange logs, one row per migration direction of every pair),
+all with an added "run" column (N of exp_N) and sorted by run, so a run is a contiguous slice.
+Text columns (class, trust, pairs) are stored as integer codes plus their categories.
+Partitions whose source files did not change since the last ingestion are skipped.
+
+`load()` memory maps only the requested columns of the requested partitions and runs.
+"""
+
+import json
+import os
+import re
+import shutil
+
+from typing import Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from algorithm.exchange_events import read_exchange_events
+
+from .constants_and_params import OUTPUT_DIR, RESULTS_STORE_DIR
+
+EXPERIMENT_FILE_REGEX = re.compile(r"exp_([0-9]+)\.csv$")
+EXCHANGE_LOG_FILE_REGEX = re.compile(r"exp_([0-9]+)_exchange_log\.csv$")
+EXCHANGE_EVENTS_FILE_REGEX = re.compile(r"exp_([0-9]+)_exchange_events\.bin$")
+TABLE_FILE_REGEXES = {
+    "generations": EXPERIMENT_FILE_REGEX,
+    "exchanges": EXCHANGE_LOG_FILE_REGEX,
+    "exchange_events": EXCHANGE_EVENTS_FILE_REGEX,
+}
+INDEX_FILE = "index.json"
+META_FILE = "meta.json"
+
+
+def find_partitions(output_dir: str = OUTPUT_DIR) -> dict[tuple[str, str], str]:
+    """Maps (setup, problem) to the directory holding its exp_N.csv files."""
+    partitions = {}
+    for directory, subdirectories, files in os.walk(output_dir):
+        subdirectories.sort()
+        if os.path.samefile(directory, output_dir) or not any(EXPERIMENT_FILE_REGEX.match(f) for f in files):
+            continue
+        setup = os.path.relpath(os.path.dirname(directory), output_dir).replace(os.sep, "/")
+        partitions[(setup, os.path.basename(directory))] = directory
+    return partitions
+
+
+def _source_files(partition_dir: str) -> dict[str, list[int]]:
+    sources = {}
+    for filename in sorted(os.listdir(partition_dir)):
+        if any(regex.match(filename) for regex in TABLE_FILE_REGEXES.values()):
+            stat = os.stat(f"{partition_dir}/{filename}")
+            sources[filename] = [stat.st_size, stat.st_mtime_ns]
+    return sources
+
+
+def _read_table(partition_dir: str, filenames: Iterable[str], regex: re.Pattern) -> Optional[pd.DataFrame]:
+    frames = []
+    for filename in filenames:
+        match = regex.match(filename)
+        if match is None:
+            continue
+        if filename.endswith(".bin"):
+            frame = pd.DataFrame(read_exchange_events(f"{partition_dir}/{filename}"))
+        else:
+            frame = pd.read_csv(f"{partition_dir}/{filename}")
+        if "exchange" not in frame.columns and "generation" not in frame.columns:
+            frame.insert(0, "exchange", np.arange(len(frame)))
+        frame.insert(0, "run", int(match.group(1)))
+        frames.append(frame)
+    if not frames:
+        return None
+    return pd.concat(frames, ignore_index=True).sort_values("run", kind="stable", ignore_index=True)
+
+
+def _write_table(table_dir: str, frame: pd.DataFrame) -> dict:
+    os.makedirs(table_dir, exist_ok=True)
+    columns = {}
+    for column in frame.columns:
+        values = frame[column]
+        if pd.api.types.is_numeric_dtype(values):
+            np.save(f"{table_dir}/{column}.npy", values.to_numpy())
+            columns[column] = "numeric"
+        else:
+            codes, categories = pd.factorize(values)  # Missing values get the code -1
+            np.save(f"{table_dir}/{column}.npy", codes.astype(np.int32))
+            with open(f"{table_dir}/{column}.categories.json", "w") as file:
+                json.dump([str(category) for category in categories], file)
+            columns[column] = "categorical"
+
+    runs = frame["run"].to_numpy()
+    run_ids = np.unique(runs)
+    run_offsets = {
+        str(run): [int(np.searchsorted(runs, run, "left")), int(np.searchsorted(runs, run, "right"))]
+        for run in run_ids
+    }
+    return {"rows": len(frame), "columns": columns, "run_offsets": run_offsets}
+
+
+def ingest(output_dir: str = OUTPUT_DIR, store_dir: str = RESULTS_STORE_DIR, verbose: bool = False) -> list[dict]:
+    """Brings the store up to date with `output_dir` and returns its index."""
+    index = []
+    for (setup, problem), partition_dir in sorted(find_partitions(output_dir).items()):
+        store_partition_dir = f"{store_dir}/{setup}/{problem}"
+        sources = _source_files(partition_dir)
+        meta_path = f"{store_partition_dir}/{META_FILE}"
+        meta = None
+        if os.path.exists(meta_path):
+            with open(meta_path) as file:
+                meta = json.load(file)
+        if meta is None or meta["sources"] != sources:
+            if verbose:
+                print(f"Ingesting {setup}/{problem}")
+            shutil.rmtree(store_partition_dir, ignore_errors=True)
+            meta = {"setup": setup, "problem": problem, "sources": sources, "tables": {}}
+            for table, regex in TABLE_FILE_REGEXES.items():
+                frame = _read_table(partition_dir, sources, regex)
+                if frame is not None:
+                    meta["tables"][table] = _write_table(f"{store_partition_dir}/{table}", frame)
+            with open(meta_path, "w") as file:
+                json.dump(meta, file)
+        index.append(
+            {
+                "setup": setup,
+                "problem": problem,
+                "runs": sorted(int(run) for run in meta["tables"]["generations"]["run_offsets"]),
+            }
+        )
+
+    os.makedirs(store_dir, exist_ok=True)
+    with open(f"{store_dir}/{INDEX_FILE}", "w") as file:
+        json.dump(index, file)
+    return index
+
+
+def read_index(store_dir: str = RESULTS_STORE_DIR) -> list[dict]:
+    with open(f"{store_dir}/{INDEX_FILE}") as file:
+        return json.load(file)
+
+
+def partitions(store_dir: str = RESULTS_STORE_DIR) -> pd.DataFrame:
+    """One row per (setup, problem) with its number of runs."""
+    index = read_index(store_dir)
+    return pd.DataFrame(
+        {
+            "setup": [entry["setup"] for entry in index],
+            "problem": [entry["problem"] for entry in index],
+            "runs": [len(entry["runs"]) for entry in index],
+        }
+    )
+
+
+def _as_set(values: Union[None, str, int, Iterable]) -> Optional[set]:
+    if values is None:
+        return None
+    if isinstance(values, (str, int)):
+        return {values}
+    return set(values)
+
+
+def _read_column(table_dir: str, column: str, kind: str, row_slices: list[slice]):
+    values = np.load(f"{table_dir}/{column}.npy", mmap_mode="r")
+    values = np.concatenate([values[row_slice] for row_slice in row_slices])
+    if kind == "numeric":
+        return values
+    with open(f"{table_dir}/{column}.categories.json") as file:
+        categories = json.load(file)
+    return pd.Categorical.from_codes(values, categories=categories)
+
+
+def load(
+    table: str = "generations",
+    setups=None,
+    problems=None,
+    runs=None,
+    columns: Optional[list[str]] = None,
+    agents=None,
+    store_dir: str = RESULTS_STORE_DIR,
+) -> pd.DataFrame:
+    """
+    Rows of `table` for the given setups, problems, runs and agent ids (None = all), with "setup" and "problem"
+    columns added. Only `columns` (None = all) are read, "run" is always included.
+    """
+    setups, problems, runs, agents = _as_set(setups), _as_set(problems), _as_set(runs), _as_set(agents)
+    frames = []
+    for entry in read_index(store_dir):
+        if (setups is not None and entry["setup"] not in setups) or (
+            problems is not None and entry["problem"] not in problems
+        ):
+            continue
+        partition_dir = f"{store_dir}/{entry['setup']}/{entry['problem']}"
+        with open(f"{partition_dir}/{META_FILE}") as file:
+            table_meta = json.load(file)["tables"].get(table)
+        if table_meta is None:
+            continue
+        row_slices = [
+            slice(*offsets)
+            for run, offsets in table_meta["run_offsets"].items()
+            if runs is None or int(run) in runs
+        ]
+        if not row_slices:
+            continue
+        wanted_columns = ["run"] + [
+            column for column in (columns or table_meta["columns"]) if column != "run"
+        ]
+        if agents is not None and "agent_id" not in wanted_columns:
+            wanted_columns.append("agent_id")
+        frame = pd.DataFrame(
+            {
+                column: _read_column(f"{partition_dir}/{table}", column, table_meta["columns"][column], row_slices)
+                for column in wanted_columns
+            }
+        )
+        if agents is not None:
+            frame = frame.loc[frame["agent_id"].isin(agents)]
+            if columns is not None and "agent_id" not in columns:
+                frame = frame.drop(columns="agent_id")
+        frame.insert(0, "problem", entry["problem"])
+        frame.insert(0, "setup", entry["setup"])
+        frames.append(frame)
+    if not frames:
+        return pd.DataFrame(columns=["setup", "problem", "run"] + [c for c in (columns or []) if c != "run"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def final_scores(setups=None, problems=None, store_dir: str = RESULTS_STORE_DIR) -> pd.DataFrame:
+    """Best score of every run: columns setup, problem, run, score."""
+    frame = load("generations", setups, problems, columns=["score"], store_dir=store_dir)
+    return frame.groupby(["setup", "problem", "run"], as_index=False, sort=True)["score"].min()
+
+
+if __name__ == "__main__":
+    print(pd.DataFrame(ingest(verbose=True)).to_string())
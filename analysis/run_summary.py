@@ -0,0 +1,77 @@
+"""
+Readers of the exp_N_summary.json files the Runner writes next to every run log (algorithm.run_statistics).
+
+They hold the final best, per agent / per class best-so-far and score statistics and the best-so-far and
+migration counts at every exchange, so plots that only need those do not have to parse the generation logs.
+"""
+
+import json
+import os
+import re
+
+import pandas as pd
+
+SUMMARY_FILE_REGEX = re.compile(r"exp_([0-9]+)_summary\.json$")
+
+
+def summary_files(data_dir: str) -> dict[int, str]:
+    """Run number -> path of every run summary in the directory."""
+    files = {}
+    for filename in os.listdir(data_dir):
+        match = SUMMARY_FILE_REGEX.match(filename)
+        if match:
+            files[int(match.group(1))] = f"{data_dir}/{filename}"
+    return dict(sorted(files.items()))
+
+
+def read_summaries(data_dir: str) -> dict[int, dict]:
+    summaries = {}
+    for run, path in summary_files(data_dir).items():
+        with open(path) as file:
+            summaries[run] = json.load(file)
+    return summaries
+
+
+def final_best(summaries: dict[int, dict]) -> pd.DataFrame:
+    """Columns run, final_best, best_agent_id, generations, evaluations."""
+    return pd.DataFrame(
+        [
+            {
+                "run": run,
+                "final_best": summary["final_best"],
+                "best_agent_id": summary["best_agent_id"],
+                "generations": summary["generations"],
+                "evaluations": summary.get("evaluations"),
+            }
+            for run, summary in summaries.items()
+        ]
+    )
+
+
+def class_statistics(summaries: dict[int, dict]) -> pd.DataFrame:
+    """One row per run and agent class: best_so_far, best_generation, score_mean, score_std and migrant counts."""
+    rows = []
+    for run, summary in summaries.items():
+        for class_name, statistics in summary["classes"].items():
+            rows.append(
+                {
+                    "run": run,
+                    "class": class_name,
+                    "best_so_far": statistics["best_so_far"],
+                    "best_generation": statistics["best_generation"],
+                    "score_mean": statistics["score"]["mean"],
+                    "score_std": statistics["score"]["std"],
+                    "offered_migrants": statistics["offered_migrants"],
+                    "accepted_migrants": statistics["accepted_migrants"],
+                    "filtered_migrants": statistics.get("filtered_migrants", 0),  # Older summaries have no filter counts
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def exchange_curves(summaries: dict[int, dict]) -> pd.DataFrame:
+    """Columns run, generation, best_so_far, offered_migrants, accepted_migrants, filtered_migrants, one row per exchange."""
+    return pd.concat(
+        [pd.DataFrame({"run": run, **summary["exchanges"]}) for run, summary in summaries.items()],
+        ignore_index=True,
+    )
@@ -0,0 +1,186 @@
+"""
+Batch statistical comparison of the final fitness of all setups on every problem:
+
+    python -m analysis.significance --setups ... --problems ...
+
+For every problem the final (best) score of every run of every setup is arranged in a (run, setup) matrix,
+runs are paired by their number. On it:
+- the Wilcoxon signed-rank test of all setup pairs, in one vectorized call, Holm corrected per problem,
+- the Friedman test over the runs present for all setups, with the Nemenyi post-hoc p-values of all pairs
+  and its critical difference of the mean ranks.
+Results are three tables (setups, friedman, pairwise), saved as CSV files in STATISTICAL_TESTS_DIR.
+"""
+
+import argparse
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from scipy.stats import friedmanchisquare, rankdata, studentized_range, wilcoxon
+
+from . import results_store
+from .constants_and_params import SIGNIFICANCE_LEVEL, STATISTICAL_TESTS_DIR
+
+
+def final_fitness_samples(setups=None, problems=None) -> dict[str, pd.DataFrame]:
+    """Problem -> (run x setup) data frame of the final scores, NaN where a setup has no such run."""
+    results_store.ingest()
+    final_scores = results_store.final_scores(setups, problems)
+    return {
+        problem: scores.pivot(index="run", columns="setup", values="score").sort_index(axis=1)
+        for problem, scores in final_scores.groupby("problem", sort=True)
+    }
+
+
+def holm(p_values) -> np.ndarray:
+    """Holm-Bonferroni adjusted p-values of one family of tests (NaN p-values are left out of the family)."""
+    p_values = np.asarray(p_values, dtype=float)
+    adjusted = np.full(p_values.shape, np.nan)
+    tested = np.flatnonzero(~np.isnan(p_values))
+    order = tested[np.argsort(p_values[tested], kind="stable")]
+    m = len(order)
+    steps = np.maximum.accumulate((m - np.arange(m)) * p_values[order])
+    adjusted[order] = np.minimum(steps, 1.0)
+    return adjusted
+
+
+def pairwise_wilcoxon(samples: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Wilcoxon signed-rank tests of all column pairs (i < j) of a (run, setup) matrix.
+    Returns (pairs as a (2, pairs) index array, statistics, p-values). Pairs with only zero differences get p = 1.
+    """
+    first, second = np.triu_indices(samples.shape[1], k=1)
+    differences = samples[:, first] - samples[:, second]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # Pairs without nonzero differences
+        result = wilcoxon(differences, axis=0, nan_policy="omit")
+    statistics = np.atleast_1d(result.statistic).astype(float)
+    p_values = np.atleast_1d(result.pvalue).astype(float)
+    identical = np.all(np.nan_to_num(differences) == 0, axis=0)
+    p_values[identical] = 1.0
+    return np.vstack([first, second]), statistics, p_values
+
+
+def friedman_nemenyi(samples: np.ndarray, significance_level: float = SIGNIFICANCE_LEVEL):
+    """
+    Friedman test of a complete (run, setup) matrix, and the Nemenyi post-hoc test of all column pairs (i < j).
+    Returns (statistic, p-value, mean ranks, Nemenyi p-values in np.triu_indices order, critical difference).
+    """
+    runs, k = samples.shape
+    mean_ranks = rankdata(samples, axis=1).mean(axis=0)
+    if k < 3 or runs < 2:
+        return np.nan, np.nan, mean_ranks, np.full(k * (k - 1) // 2, np.nan), np.nan
+    statistic, p_value = friedmanchisquare(*samples.T)
+    first, second = np.triu_indices(k, k=1)
+    standard_error = np.sqrt(k * (k + 1) / (6 * runs))
+    q = np.abs(mean_ranks[first] - mean_ranks[second]) / standard_error * np.sqrt(2)
+    nemenyi_p = studentized_range.sf(q, k, np.inf)
+    critical_difference = studentized_range.ppf(1 - significance_level, k, np.inf) / np.sqrt(2) * standard_error
+    return statistic, p_value, mean_ranks, nemenyi_p, critical_difference
+
+
+def compare_setups(samples: dict[str, pd.DataFrame], significance_level: float = SIGNIFICANCE_LEVEL):
+    """
+    Runs all tests on the final_fitness_samples. Returns three data frames:
+    setups: problem, setup, runs, mean, median, std, mean_rank (Friedman rank, lower is better),
+    friedman: problem, setups, runs, statistic, p_value, critical_difference, best_setup,
+    pairwise: problem, setup_a, setup_b, runs, median_a, median_b, statistic, p_value, p_holm,
+              nemenyi_p, significant (Holm corrected Wilcoxon), better (the lower median of a significant pair).
+    """
+    setup_rows, friedman_rows, pairwise_frames = [], [], []
+    for problem, frame in samples.items():
+        setups = frame.columns.to_numpy()
+        matrix = frame.to_numpy(dtype=float)
+        complete = matrix[~np.isnan(matrix).any(axis=1)]
+
+        statistic, p_value, mean_ranks, nemenyi_p, critical_difference = friedman_nemenyi(
+            complete, significance_level
+        )
+        setup_rows.append(
+            pd.DataFrame(
+                {
+                    "problem": problem,
+                    "setup": setups,
+                    "runs": frame.count().to_numpy(),
+                    "mean": frame.mean().to_numpy(),
+                    "median": frame.median().to_numpy(),
+                    "std": frame.std().to_numpy(),
+                    "mean_rank": mean_ranks,
+                }
+            )
+        )
+        friedman_rows.append(
+            {
+                "problem": problem,
+                "setups": len(setups),
+                "runs": len(complete),
+                "statistic": statistic,
+                "p_value": p_value,
+                "critical_difference": critical_difference,
+                "best_setup": setups[np.argmin(mean_ranks)] if len(complete) else None,
+            }
+        )
+
+        if len(setups) < 2:
+            continue
+        (first, second), wilcoxon_statistics, wilcoxon_p = pairwise_wilcoxon(matrix)
+        p_holm = holm(wilcoxon_p)
+        medians = frame.median().to_numpy()
+        significant = p_holm <= significance_level
+        pairwise_frames.append(
+            pd.DataFrame(
+                {
+                    "problem": problem,
+                    "setup_a": setups[first],
+                    "setup_b": setups[second],
+                    "runs": (~np.isnan(matrix[:, first] - matrix[:, second])).sum(axis=0),
+                    "median_a": medians[first],
+                    "median_b": medians[second],
+                    "statistic": wilcoxon_statistics,
+                    "p_value": wilcoxon_p,
+                    "p_holm": p_holm,
+                    "nemenyi_p": nemenyi_p,
+                    "significant": significant,
+                    "better": np.where(
+                        significant, np.where(medians[first] <= medians[second], setups[first], setups[second]), ""
+                    ),
+                }
+            )
+        )
+
+    return (
+        pd.concat(setup_rows, ignore_index=True) if setup_rows else pd.DataFrame(),
+        pd.DataFrame(friedman_rows),
+        pd.concat(pairwise_frames, ignore_index=True) if pairwise_frames else pd.DataFrame(),
+    )
+
+
+def run_tests(setups=None, problems=None, significance_level: float = SIGNIFICANCE_LEVEL, save: bool = True):
+    """Tests all (or the given) setups on all (or the given) problems and saves the tables."""
+    setup_table, friedman_table, pairwise_table = compare_setups(
+        final_fitness_samples(setups, problems), significance_level
+    )
+    if save:
+        os.makedirs(STATISTICAL_TESTS_DIR, exist_ok=True)
+        setup_table.to_csv(f"{STATISTICAL_TESTS_DIR}/setups.csv", index=False)
+        friedman_table.to_csv(f"{STATISTICAL_TESTS_DIR}/friedman.csv", index=False)
+        pairwise_table.to_csv(f"{STATISTICAL_TESTS_DIR}/pairwise.csv", index=False)
+    return setup_table, friedman_table, pairwise_table
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Statistical comparison of the final fitness of the setups.")
+    parser.add_argument("--setups", nargs="*", default=None, help="Only these setups (default: all).")
+    parser.add_argument("--problems", nargs="*", default=None, help="Only these problems (default: all).")
+    parser.add_argument("--significance-level", type=float, default=SIGNIFICANCE_LEVEL)
+    arguments = parser.parse_args()
+
+    setup_table, friedman_table, pairwise_table = run_tests(
+        arguments.setups, arguments.problems, arguments.significance_level
+    )
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(friedman_table.to_string(index=False))
+        if len(pairwise_table):
+            print(pairwise_table.loc[pairwise_table["significant"]].to_string(index=False))
@@ -48,7 +48,7 @@ def plot_and_save_summary_box_and_whiskers_comparision_graph_with_final_results(
             exp_values = df.loc[df["exp_label"] == exp_label]
             exp_data.append(exp_values["exp_value"].values.tolist())
 
-        ax.boxplot(exp_data, labels=agent_labels)
+        ax.boxplot(exp_data, tick_labels=agent_labels)
         ax.set_title(problem_label)
 
     # Plot saving.
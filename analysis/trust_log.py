@@ -0,0 +1,90 @@
+"""
+Vectorized decoding of the trust column of the generation logs.
+
+A trust entry lists the trust of the logging agent towards every agent as "<agent id>:<trust>" pairs joined
+by "_" (e.g. "0:12_1:10_2:12"). All entries of many runs are decoded at once into a (run, generation, from_agent, to_agent)
+integer array, on top of which the class level aggregations are built.
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+
+MISSING_TRUST = -1  # Trust of generations / agents that were not logged
+
+
+def decode_trust_strings(trust_strings, number_of_agents: int = None) -> np.ndarray:
+    """
+    Decodes trust entries into a (rows, number_of_agents) int16 array, trust_array[row, to_agent].
+    Empty entries (and ids not present in an entry) are MISSING_TRUST.
+    """
+    entries = pd.Series(trust_strings, dtype=object).fillna("").astype(str).to_numpy()
+    logged = entries != ""
+    counts = np.char.count(entries[logged].astype(str), "_") + 1
+    # One split of all entries at once: "0:12_1:10" -> ["0", "12", "1", "10"]
+    flat = np.array("_".join(entries[logged]).replace(":", "_").split("_"), dtype=np.int64).reshape(-1, 2)
+    if number_of_agents is None:
+        number_of_agents = int(flat[:, 0].max()) + 1 if len(flat) else 0
+
+    trust = np.full((len(entries), number_of_agents), MISSING_TRUST, dtype=np.int16)
+    rows = np.repeat(np.flatnonzero(logged), counts)
+    trust[rows, flat[:, 0]] = flat[:, 1]
+    return trust
+
+
+def trust_array(df: pd.DataFrame, number_of_agents: int = None):
+    """
+    Builds the (run, generation, from_agent, to_agent) trust array of a data frame with the columns
+    run, generation, agent_id and trust. Entries left empty by LOG_TRUST_ON_CHANGE are forward filled per agent.
+    Returns (trust, runs, generations), where runs and generations label the first two axes. The to_agent axis
+    covers every id in the trust entries, which may be more than the logged agents.
+    """
+    df = df.sort_values(["run", "agent_id", "generation"], kind="stable")
+    trust_strings = df["trust"].replace("", np.nan).groupby([df["run"], df["agent_id"]]).ffill()
+    number_of_agents = number_of_agents or int(df["agent_id"].max()) + 1
+    decoded = decode_trust_strings(trust_strings)
+    if decoded.shape[1] < number_of_agents:
+        decoded = decode_trust_strings(trust_strings, number_of_agents)
+
+    runs, run_index = np.unique(df["run"].to_numpy(), return_inverse=True)
+    generations, generation_index = np.unique(df["generation"].to_numpy(), return_inverse=True)
+    trust = np.full(
+        (len(runs), len(generations), number_of_agents, decoded.shape[1]), MISSING_TRUST, dtype=np.int16
+    )
+    trust[run_index, generation_index, df["agent_id"].to_numpy()] = decoded
+    return trust, runs, generations
+
+
+def class_trust(trust: np.ndarray, generations: np.ndarray, agent_classes) -> pd.DataFrame:
+    """
+    Mean and standard deviation (ddof=1) of the trust every agent class gives to every class, per generation,
+    over all runs and agent pairs. `agent_classes[agent_id]` is the class of the agent.
+    Columns: class_from, class_to, generation, mean, std. Trust received is the same frame read the other way round.
+    """
+    agent_classes = np.asarray(agent_classes)
+    trust = trust[:, :, : len(agent_classes), : len(agent_classes)]
+    classes = list(dict.fromkeys(agent_classes))
+    frames = []
+    for class_from in classes:
+        from_trust = trust[:, :, agent_classes == class_from, :]
+        for class_to in classes:
+            # (generation, samples) with all runs and agent pairs of the two classes as samples
+            values = np.moveaxis(from_trust[:, :, :, agent_classes == class_to], 1, 0)
+            values = values.reshape(len(generations), -1).astype(float)
+            values[values == MISSING_TRUST] = np.nan
+            logged = ~np.all(np.isnan(values), axis=1)
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)  # Single samples have no std
+                frames.append(
+                    pd.DataFrame(
+                        {
+                            "class_from": class_from,
+                            "class_to": class_to,
+                            "generation": generations[logged],
+                            "mean": np.nanmean(values[logged], axis=1),
+                            "std": np.nanstd(values[logged], axis=1, ddof=1),
+                        }
+                    )
+                )
+    return pd.concat(frames, ignore_index=True)
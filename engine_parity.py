@@ -0,0 +1,122 @@
+"""
+Parity check of the island GA engines (algorithm.numpy_ga.GAEngine):
+
+    python engine_parity.py --problems Griewank Ackley_20 LABS_40 --runs 20 --max-evaluations 5000
+
+Both engines use different random streams, so their runs cannot be compared one to one. Instead the same
+seeds are run with both and the distributions of the best-so-far fitness at every exchange (from the run
+summaries) are compared with two-sided Mann-Whitney U tests, Holm corrected per problem. A problem is marked
+no_significant_difference when neither an exchange point nor the final fitness differs significantly. This is not
+a test of equivalence, with few runs small differences go undetected. Mean wall time per run is reported as well.
+
+Problems are given as "<Problem>" or "<Problem>_<number of variables>" (see simulation.tuning_problem).
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from scipy.stats import mannwhitneyu
+
+from algorithm.agents.strategy_based import MigrationPolicy
+from algorithm.numpy_ga import GAEngine
+from algorithm.seeding import derive_seed
+from analysis.constants_and_params import SEED, SIGNIFICANCE_LEVEL
+from analysis.significance import holm
+from simulation import accept_strategies, agents, run_single_simulation, send_strategies, tuning_problem
+
+
+def run_trajectory(problem_name: str, engine: GAEngine, seed: int, config_overrides: dict, output_dir: str):
+    """Runs one simulation and returns (best-so-far at every exchange, final best, wall time)."""
+    output_file_path = f"{output_dir}/{problem_name}_{engine.name}_{seed}.csv"
+    start = time.time()
+    final_best = run_single_simulation(
+        agents, tuning_problem(problem_name), output_file_path, accept_strategies, send_strategies,
+        seed=seed, config_overrides={**config_overrides, "ga_engine": engine, "save_exchange_events": False},
+    )
+    elapsed = time.time() - start
+    with open(os.path.splitext(output_file_path)[0] + "_summary.json") as file:
+        trajectory = json.load(file)["exchanges"]["best_so_far"]
+    return trajectory, float(final_best), elapsed
+
+
+def compare_engines(problem_names, runs, config_overrides, processes=None, significance_level=SIGNIFICANCE_LEVEL):
+    """One row per problem: runs, exchanges compared, significantly different ones, final medians and times."""
+    seeds = [derive_seed(SEED if SEED is not None else 0, run) for run in range(runs)]
+    jobs = [(problem, engine, seed) for problem in problem_names for engine in GAEngine for seed in seeds]
+    with tempfile.TemporaryDirectory() as output_dir, ProcessPoolExecutor(processes) as executor:
+        results = list(
+            executor.map(
+                run_trajectory,
+                *zip(*jobs),
+                [config_overrides] * len(jobs),
+                [output_dir] * len(jobs),
+            )
+        )
+    results = dict(zip(jobs, results))
+
+    rows = []
+    for problem in problem_names:
+        trajectories, finals, times = {}, {}, {}
+        for engine in GAEngine:
+            engine_results = [results[(problem, engine, seed)] for seed in seeds]
+            # Runs may stop after different numbers of exchanges, compare the common ones
+            length = min(len(trajectory) for trajectory, _, _ in engine_results)
+            trajectories[engine] = np.array([trajectory[:length] for trajectory, _, _ in engine_results])
+            finals[engine] = np.array([final_best for _, final_best, _ in engine_results])
+            times[engine] = np.mean([elapsed for _, _, elapsed in engine_results])
+        exchanges = min(trajectory.shape[1] for trajectory in trajectories.values())
+        jmetal, numpy_engine = trajectories[GAEngine.Jmetal][:, :exchanges], trajectories[GAEngine.NumPy][:, :exchanges]
+        p_values = np.array(
+            [
+                np.nan if np.array_equal(jmetal[:, exchange], numpy_engine[:, exchange])
+                else mannwhitneyu(jmetal[:, exchange], numpy_engine[:, exchange]).pvalue
+                for exchange in range(exchanges)
+            ]
+        )
+        final_p = mannwhitneyu(finals[GAEngine.Jmetal], finals[GAEngine.NumPy]).pvalue
+        different = int(np.sum(holm(p_values) <= significance_level))
+        rows.append(
+            {
+                "problem": problem,
+                "runs": runs,
+                "exchanges": exchanges,
+                "different_exchanges": different,
+                "final_median_jmetal": np.median(finals[GAEngine.Jmetal]),
+                "final_median_numpy": np.median(finals[GAEngine.NumPy]),
+                "final_p_value": final_p,
+                "seconds_per_run_jmetal": times[GAEngine.Jmetal],
+                "seconds_per_run_numpy": times[GAEngine.NumPy],
+                "no_significant_difference": different == 0 and final_p > significance_level,
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the fitness trajectories of the jmetal and NumPy GA engines.")
+    parser.add_argument("--problems", nargs="+", default=["Griewank", "Ackley", "ExpandedSchaffer", "LABS"])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--max-evaluations", type=int, default=5000, help="Per agent.")
+    parser.add_argument("--migration-policy", default="Basic", choices=[policy.name for policy in MigrationPolicy])
+    parser.add_argument("--processes", type=int, default=None)
+    arguments = parser.parse_args()
+
+    table = compare_engines(
+        arguments.problems,
+        arguments.runs,
+        {
+            "max_evaluations": arguments.max_evaluations,
+            "migration_policy": MigrationPolicy[arguments.migration_policy],
+        },
+        arguments.processes,
+    )
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(table.to_string(index=False))
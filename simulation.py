@@ -1,23 +1,32 @@
-from copy import deepcopy
-import datetime, os
+import dataclasses, datetime, os, statistics
 
-from jmetal.operator import BinaryTournamentSelection
-from jmetal.core.problem import BinaryProblem
+from concurrent.futures import ProcessPoolExecutor
 
-from jmetal.operator.crossover import SBXCrossover, SPXCrossover
-from jmetal.operator.mutation import SimpleRandomMutation, BitFlipMutation
-from jmetal.util.termination_criterion import StoppingByEvaluations
-
-from problems import ExpandedSchaffer, Griewank, Ackley
-
-from algorithm import Runner
+from algorithm import SimulationConfig, run_simulation
 from algorithm.agents.base import BaseAgent
+from algorithm.results_cache import cache_key, is_cacheable, open_results_cache, run_parameters
+from algorithm.problems import LABS, ExpandedSchaffer, Griewank, Ackley
+from algorithm.seeding import derive_seed
 from analysis.constants_and_params import (
     OUTPUT_DIR,
     PROBLEMS_TO_TEST,
     MULTI_CLASS_SETUP,
     TRUST_MECHANISM,
     NUMBER_OF_RUNS,
+    LOG_INTERVAL,
+    LOG_TRUST_ON_CHANGE,
+    TELEMETRY_TARGET,
+    SAVE_RUN_SUMMARY,
+    SAVE_EXCHANGE_EVENTS,
+    BATCH_EVALUATION,
+    BATCH_EVALUATION_PROCESSES,
+    GA_ENGINE,
+    SEED,
+    TUNING_PROBLEM,
+    TUNING_SEEDS_PER_EVALUATION,
+    TUNING_COST_AGGREGATION,
+    TUNING_PROCESSES,
+    RESULTS_CACHE_PATH,
     NUM_OF_VARS,
     CROSSOVER_RATE,
     MUTATION_RATE,
@@ -27,11 +36,18 @@ from analysis.constants_and_params import (
     OFFSPRING_POPULATION_SIZE,
     GENERATIONS_PER_SWAP,
     MAX_EVALUATIONS,
+    TARGET_FITNESS,
+    STAGNATION_EXCHANGES,
+    STAGNATION_TOLERANCE,
+    MAX_WALL_CLOCK_SECONDS,
     AGENTS_NUMBER,
     STARTING_TRUST,
     NO_SEND_PENALTY,
     AUCTION_TRUST_WEIGHT,
+    BUDGET_POLICY,
+    UCB_EXPLORATION,
     POPULATION_PART_TO_SWAP,
+    MIGRANT_DUPLICATE_RADIUS,
 )
 
 # Multi class setup parsing
@@ -39,6 +55,13 @@ agents = MULTI_CLASS_SETUP[0]
 send_strategies = MULTI_CLASS_SETUP[1]
 accept_strategies = MULTI_CLASS_SETUP[2]
 
+# Tuning instances
+TUNING_PROBLEM_TYPES = {
+    problem_type.name().lower(): problem_type for problem_type in (ExpandedSchaffer, Griewank, Ackley, LABS)
+}
+COST_AGGREGATIONS = {"mean": statistics.mean, "median": statistics.median}
+_tuning_problems = {}
+
 
 def run_simulations_and_save_results():
     os.makedirs(OUTPUT_DIR, exist_ok=True)
@@ -53,7 +76,7 @@ def run_simulations_and_save_results():
         now = datetime.datetime.now()
         exp_id = str(i+1)
 
-        for problem in [problem_type(NUM_OF_VARS) for problem_type in PROBLEMS_TO_TEST]:
+        for problem_nr, problem in enumerate([problem_type(NUM_OF_VARS) for problem_type in PROBLEMS_TO_TEST]):
             
             # UNCOMMENT THE TYPE OF SIMULATION YOU WANT TO RUN
             
@@ -64,7 +87,8 @@ def run_simulations_and_save_results():
                 f"{dir}/exp_{exp_id}.csv"
             )
             best_result = run_single_simulation(
-                agents, problem, output_file_path, accept_strategies, send_strategies
+                agents, problem, output_file_path, accept_strategies, send_strategies,
+                seed=derive_seed(SEED, i, problem_nr),
             )
             print(
                 f"Best result for {output_file_path}:",
@@ -116,53 +140,100 @@ def run_single_simulation(
     starting_trust=STARTING_TRUST,
     auction_weight=AUCTION_TRUST_WEIGHT,
     save_log=True,
+    seed=None,
+    config_overrides=None,
 ):
     # print(f"{output_file_path=}")
-    mutation = (
-        BitFlipMutation(mutation_rate)
-        if isinstance(problem, BinaryProblem)
-        else SimpleRandomMutation(mutation_rate)
-    )
-    crossover = (
-        SPXCrossover(crossover_rate) if isinstance(problem, BinaryProblem) else SBXCrossover(crossover_rate)
-    )
-
-    runner = Runner(
-        output_file_path=output_file_path,
-        agent_class=agent_class,
-        agents_number=AGENTS_NUMBER,  # Needed only for single class, non strategy based agents
-        generations_per_swap=migration_interval,
-        problem=deepcopy(problem),
+    config = SimulationConfig(
+        trust_mechanism=TRUST_MECHANISM,
+        migration_policy=MIGRATION_POLICY,
+        starting_trust=starting_trust,
+        auction_weight=auction_weight,
+        max_evaluations=MAX_EVALUATIONS,
         population_size=POPULATION_SIZE,
         offspring_population_size=OFFSPRING_POPULATION_SIZE,
-        mutation=mutation,
-        crossover=crossover,
-        selection=BinaryTournamentSelection(),
-        termination_criterion=StoppingByEvaluations(max_evaluations=MAX_EVALUATIONS),
-        send_strategy=send_strategy,
-        accept_strategy=accept_strategy,
+        crossover_rate=crossover_rate,
+        mutation_rate=mutation_rate,
+        agents_number=AGENTS_NUMBER,
         migration=MIGRATION,
-        trust_mechanism=TRUST_MECHANISM,
-        starting_trust=starting_trust,
+        generations_per_swap=migration_interval,
+        population_part_to_swap=migration_pop_rate,
+        exchange_part_to_swap=POPULATION_PART_TO_SWAP,
         no_send_penalty=NO_SEND_PENALTY,
-        part_to_swap=migration_pop_rate,
-        auction_weight=auction_weight,
-        save_log=save_log,
+        duplicate_radius=MIGRANT_DUPLICATE_RADIUS,
+        seed=seed,
+        target_fitness=TARGET_FITNESS,
+        stagnation_exchanges=STAGNATION_EXCHANGES,
+        stagnation_tolerance=STAGNATION_TOLERANCE,
+        max_wall_clock_seconds=MAX_WALL_CLOCK_SECONDS,
+        budget_policy=BUDGET_POLICY,
+        ucb_exploration=UCB_EXPLORATION,
+        batch_evaluation=BATCH_EVALUATION,
+        batch_evaluation_processes=BATCH_EVALUATION_PROCESSES,
+        ga_engine=GA_ENGINE,
+        log_interval=LOG_INTERVAL,
+        log_trust_on_change=LOG_TRUST_ON_CHANGE,
+        telemetry_target=TELEMETRY_TARGET,
+        save_summary=SAVE_RUN_SUMMARY,
+        save_exchange_events=SAVE_EXCHANGE_EVENTS,
     )
-    runner.run_simulation()
-
-    best_result = min(agent.algorithm.result().objectives[0] for agent in runner.agents)
-    
+    if config_overrides:
+        # SimulationConfig fields set by sweeps instead of the module constants
+        config = dataclasses.replace(config, **config_overrides)
+    use_cache = RESULTS_CACHE_PATH is not None and is_cacheable(config)
+    if use_cache:
+        parameters = run_parameters(config, agent_class, problem, accept_strategy, send_strategy)
+        key = cache_key(parameters)
+        results_cache = open_results_cache(RESULTS_CACHE_PATH)
+        cached_result = results_cache.get(key)
+        # Runs whose logs are wanted but missing are repeated
+        if cached_result is not None and (not save_log or os.path.exists(output_file_path)):
+            return cached_result
+
+    best_result = run_simulation(
+        config, agent_class, problem, output_file_path, accept_strategy, send_strategy, save_log=save_log
+    )
+    if use_cache:
+        results_cache.put(key, best_result, parameters)
     return best_result
 
 
-def run_irace_compatible_base_simulation(crossover_rate, mutation_rate, migration_pop_rate, migration_interval, starting_trust, auction_weight):
-    ''' Simulation for irace compatibility '''
-    problem = ExpandedSchaffer(NUM_OF_VARS)  
-    return run_single_simulation(agents, problem, "", accept_strategies, send_strategies, 
-                                 crossover_rate=crossover_rate, mutation_rate=mutation_rate, migration_pop_rate=migration_pop_rate, 
-                                 migration_interval=migration_interval, starting_trust=starting_trust, auction_weight=auction_weight, 
-                                 save_log=False)
+def tuning_problem(instance=None):
+    """
+    Maps an irace instance name to a cached problem object. Names of the form "<Problem>" or
+    "<Problem>_<number of variables>" (optionally a path with an extension, e.g. "instances/Griewank_50.txt")
+    select that problem, any other name (e.g. "instance1") uses TUNING_PROBLEM with NUM_OF_VARS variables.
+    """
+    if instance not in _tuning_problems:
+        name = os.path.splitext(os.path.basename(instance or ""))[0]
+        problem_name, _, number_of_variables = name.partition("_")
+        problem_type = TUNING_PROBLEM_TYPES.get(problem_name.lower())
+        if problem_type is None or (number_of_variables and not number_of_variables.isdigit()):
+            problem_type, number_of_variables = TUNING_PROBLEM, ""
+        _tuning_problems[instance] = problem_type(int(number_of_variables) if number_of_variables else NUM_OF_VARS)
+    return _tuning_problems[instance]
+
+
+def _run_tuning_seed(instance, seed, parameters):
+    return run_single_simulation(agents, tuning_problem(instance), "", accept_strategies, send_strategies,
+                                 save_log=False, seed=seed, **parameters)
+
+
+def run_irace_compatible_base_simulation(crossover_rate, mutation_rate, migration_pop_rate, migration_interval, starting_trust, auction_weight, seed=None,
+                                         instance=None, seeds_per_evaluation=TUNING_SEEDS_PER_EVALUATION, processes=TUNING_PROCESSES):
+    ''' Simulation for irace compatibility, returns the cost aggregated over seeds_per_evaluation seeds derived from seed '''
+    parameters = dict(crossover_rate=crossover_rate, mutation_rate=mutation_rate, migration_pop_rate=migration_pop_rate,
+                      migration_interval=migration_interval, starting_trust=starting_trust, auction_weight=auction_weight)
+    if seeds_per_evaluation == 1:
+        return _run_tuning_seed(instance, seed, parameters)
+
+    seeds = [derive_seed(seed, seed_index) for seed_index in range(seeds_per_evaluation)]
+    if processes:
+        with ProcessPoolExecutor(processes) as executor:
+            costs = list(executor.map(_run_tuning_seed, [instance] * len(seeds), seeds, [parameters] * len(seeds)))
+    else:
+        costs = [_run_tuning_seed(instance, run_seed, parameters) for run_seed in seeds]
+    return COST_AGGREGATIONS[TUNING_COST_AGGREGATION](costs)
 
 
 if __name__ == "__main__":
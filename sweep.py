@@ -0,0 +1,243 @@
+"""
+Declarative experiment sweeps with a resumable on-disk job queue.
+
+    python sweep.py my_sweep.json --processes 8
+
+The JSON specification describes a grid that is expanded into one job per
+(trust mechanism, migration policy, agent mix, problem, run):
+
+    {
+        "name": "trust_and_policy",
+        "trust_mechanisms": ["Global", "Local"],
+        "migration_policies": ["TrustBasedAuction", "TrustBasedRoulette", "Basic"],
+        "agent_mixes": {
+            "default": "default",
+            "best_only": [{"send": "Best", "accept": "Better", "count": 12}]
+        },
+        "problems": ["Griewank", "Ackley", "ExpandedSchaffer"],
+        "number_of_variables": 100,
+        "runs": 10,
+        "seed": 1,
+        "config": {"max_evaluations": 20000}
+    }
+
+An agent mix is "default" (MULTI_CLASS_SETUP) or a list of StrategyAgent
+groups. "config" overrides SimulationConfig fields. Everything not given
+(including missing grid axes) comes from analysis/constants_and_params.py.
+
+Outputs follow the usual layout {OUTPUT_DIR}/{mechanism}_{policy}_{date}/{problem}/exp_N.csv.
+With more than one agent mix the mix name is added: {mechanism}_{policy}_{mix}_{date}.
+
+The queue ({OUTPUT_DIR}/{name}_queue.sqlite) keeps the state of every job and
+the start date of the sweep, so running the same command again after an
+interruption only runs the jobs that did not finish. A queue is only resumed
+with the specification it was created with, after editing the specification
+give the sweep a new name (or delete its queue).
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+
+from algorithm.agents import StrategyAgent
+from algorithm.agents.strategy_based import AcceptStrategy, MigrationPolicy, SendStrategy, TrustMechanism
+from algorithm.seeding import derive_seed
+from analysis.constants_and_params import (
+    MIGRATION_POLICY,
+    MULTI_CLASS_SETUP,
+    NUM_OF_VARS,
+    OUTPUT_DIR,
+    PROBLEMS_TO_TEST,
+    TRUST_MECHANISM,
+)
+from simulation import TUNING_PROBLEM_TYPES, run_single_simulation
+
+
+def load_specification(specification_path: str) -> dict:
+    with open(specification_path) as file:
+        specification = json.load(file)
+    specification.setdefault("name", os.path.splitext(os.path.basename(specification_path))[0])
+    return specification
+
+
+def specification_hash(specification: dict) -> str:
+    return hashlib.sha256(json.dumps(specification, sort_keys=True).encode()).hexdigest()
+
+
+def expand_jobs(specification: dict, start_date: str) -> list[dict]:
+    mixes = specification.get("agent_mixes", {"default": "default"})
+    problems = specification.get("problems", [problem_type.name() for problem_type in PROBLEMS_TO_TEST])
+    jobs = []
+    for mechanism, policy, mix_name, problem_name in product(
+        specification.get("trust_mechanisms", [str(TRUST_MECHANISM)]),
+        specification.get("migration_policies", [str(MIGRATION_POLICY)]),
+        mixes,
+        problems,
+    ):
+        setup_name = f"{mechanism}_{policy}_{mix_name}" if len(mixes) > 1 else f"{mechanism}_{policy}"
+        for run in range(specification.get("runs", 1)):
+            jobs.append(
+                {
+                    "trust_mechanism": mechanism,
+                    "migration_policy": policy,
+                    "agent_mix": mixes[mix_name],
+                    "problem": problem_name,
+                    "number_of_variables": specification.get("number_of_variables", NUM_OF_VARS),
+                    "seed": derive_seed(
+                        specification.get("seed"), run, problems.index(problem_name)
+                    ),
+                    "config": specification.get("config", {}),
+                    "output_file_path": f"{OUTPUT_DIR}/{setup_name}_{start_date}/{problem_name}/exp_{run + 1}.csv",
+                }
+            )
+    return jobs
+
+
+def agent_setup(agent_mix):
+    """Returns (agent_class, send_strategy, accept_strategy) as expected by run_single_simulation."""
+    if agent_mix == "default":
+        return MULTI_CLASS_SETUP[0], MULTI_CLASS_SETUP[1], MULTI_CLASS_SETUP[2]
+    if isinstance(agent_mix, str):
+        raise ValueError(f'Unknown agent mix "{agent_mix}", expected "default" or a list of StrategyAgent groups')
+    agents, send_strategies, accept_strategies = [], [], []
+    for group in agent_mix:
+        for _ in range(group.get("count", 1)):
+            agents.append(StrategyAgent)
+            send_strategies.append(SendStrategy[group["send"]])
+            accept_strategies.append(AcceptStrategy[group["accept"]])
+    return agents, send_strategies, accept_strategies
+
+
+def run_job(job: dict) -> float:
+    agent_class, send_strategy, accept_strategy = agent_setup(job["agent_mix"])
+    problem = TUNING_PROBLEM_TYPES[job["problem"].lower()](job["number_of_variables"])
+    os.makedirs(os.path.dirname(job["output_file_path"]), exist_ok=True)
+    config_overrides = dict(
+        job["config"],
+        trust_mechanism=TrustMechanism[job["trust_mechanism"]],
+        migration_policy=MigrationPolicy[job["migration_policy"]],
+    )
+    return run_single_simulation(
+        agent_class,
+        problem,
+        job["output_file_path"],
+        accept_strategy,
+        send_strategy,
+        seed=job["seed"],
+        config_overrides=config_overrides,
+    )
+
+
+class JobQueue:
+    """SQLite backed job queue, jobs are pending, running, done or failed."""
+
+    def __init__(self, path: str):
+        self.connection = sqlite3.connect(path, timeout=60)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS jobs "
+            "(id INTEGER PRIMARY KEY, job TEXT, status TEXT, result REAL, error TEXT, attempts INTEGER)"
+        )
+        self.connection.commit()
+
+    def start_date(self) -> str:
+        """Start date of the sweep, set when the queue is created and reused after restarts."""
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'start_date'").fetchone()
+        if row is not None:
+            return row[0]
+        now = datetime.datetime.now()
+        start_date = f"{now.year}_{now.month}_{now.day}_{now.hour}_{now.minute}_{now.second}"
+        self.connection.execute("INSERT INTO meta VALUES ('start_date', ?)", (start_date,))
+        self.connection.commit()
+        return start_date
+
+    def fill(self, jobs: list[dict], specification_hash: str) -> None:
+        """Adds the jobs to a new queue, an existing queue is kept if it was filled from the same specification."""
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'specification_hash'").fetchone()
+        if self.connection.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] > 0:
+            if row is not None and row[0] != specification_hash:
+                raise ValueError(
+                    "The specification changed since the sweep was started, "
+                    "resuming would run the old grid. Give the sweep a new name or delete its queue."
+                )
+            return
+        self.connection.execute(
+            "INSERT OR REPLACE INTO meta VALUES ('specification_hash', ?)", (specification_hash,)
+        )
+        self.connection.executemany(
+            "INSERT INTO jobs (job, status, attempts) VALUES (?, 'pending', 0)",
+            [(json.dumps(job),) for job in jobs],
+        )
+        self.connection.commit()
+
+    def requeue_unfinished(self, retry_failed: bool = False) -> None:
+        # Running jobs were interrupted by the previous process
+        statuses = ("running", "failed") if retry_failed else ("running",)
+        self.connection.execute(
+            f"UPDATE jobs SET status = 'pending' WHERE status IN ({','.join('?' * len(statuses))})", statuses
+        )
+        self.connection.commit()
+
+    def pending(self) -> list[tuple[int, dict]]:
+        rows = self.connection.execute("SELECT id, job FROM jobs WHERE status = 'pending' ORDER BY id").fetchall()
+        return [(job_id, json.loads(job)) for job_id, job in rows]
+
+    def mark_running(self, job_id: int) -> None:
+        self.connection.execute(
+            "UPDATE jobs SET status = 'running', attempts = attempts + 1 WHERE id = ?", (job_id,)
+        )
+        self.connection.commit()
+
+    def mark_done(self, job_id: int, result: float) -> None:
+        self.connection.execute("UPDATE jobs SET status = 'done', result = ? WHERE id = ?", (float(result), job_id))
+        self.connection.commit()
+
+    def mark_failed(self, job_id: int, error: str) -> None:
+        self.connection.execute("UPDATE jobs SET status = 'failed', error = ? WHERE id = ?", (error, job_id))
+        self.connection.commit()
+
+    def counts(self) -> dict[str, int]:
+        return dict(self.connection.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+
+def run_sweep(specification_path: str, processes=None, retry_failed: bool = False) -> dict[str, int]:
+    specification = load_specification(specification_path)
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    queue = JobQueue(f"{OUTPUT_DIR}/{specification['name']}_queue.sqlite")
+    queue.fill(expand_jobs(specification, queue.start_date()), specification_hash(specification))
+    queue.requeue_unfinished(retry_failed)
+
+    pending = queue.pending()
+    print(f"Sweep {specification['name']}: {len(pending)} jobs to run, {queue.counts()}")
+    with ProcessPoolExecutor(processes) as executor:
+        futures = {}
+        for job_id, job in pending:
+            queue.mark_running(job_id)
+            futures[executor.submit(run_job, job)] = (job_id, job)
+        for future in as_completed(futures):
+            job_id, job = futures[future]
+            try:
+                best_result = future.result()
+            except Exception as e:
+                queue.mark_failed(job_id, f"{type(e).__name__}: {e}")
+                print(f"Failed {job['output_file_path']}: {e}")
+            else:
+                queue.mark_done(job_id, best_result)
+                print(f"Best result for {job['output_file_path']}:", best_result)
+    return queue.counts()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run (or resume) a declarative experiment sweep.")
+    parser.add_argument("specification", help="JSON grid specification.")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--retry-failed", action="store_true", help="Run failed jobs again.")
+    arguments = parser.parse_args()
+
+    print(run_sweep(arguments.specification, arguments.processes, arguments.retry_failed))
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+###############################################################################
+# Built-in iterated racing tuner (F-race style), a parallel alternative to
+# running irace with target-runner.py.
+#
+# Run it from the repository root:
+#     python -m tuning.race --processes 8 --seed 1
+#
+# It reads the same parameter space (tuning/parameters.txt, irace format), the
+# instances (tuning/instances.txt) and the budget (maxExperiments in
+# tuning/scenario.txt). In every iteration new candidate configurations are
+# sampled (uniformly at first, then around the elites), all alive candidates
+# are evaluated on the same (instance, seed) block in a process pool, and
+# after `--first-test` blocks the candidates that are significantly worse
+# than the best one are eliminated (Friedman test with Conover post-hoc, or
+# Wilcoxon signed-rank test for two candidates). The elite configurations are
+# written in the irace configurations format, so they can be reused as
+# candidates file of irace.
+###############################################################################
+
+import argparse
+import math
+import os
+import re
+import sys
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+from scipy.stats import chi2, rankdata, t, wilcoxon
+
+TUNING_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@dataclass
+class Parameter:
+    name: str
+    switch: str
+    type: str  # "r" real, "i" integer, "c" categorical, "o" ordinal (irace notation)
+    domain: tuple
+    digits: int = 4
+
+    @property
+    def is_numeric(self) -> bool:
+        return self.type in ("r", "i")
+
+    def sample_uniform(self, rng: np.random.Generator):
+        if self.type == "r":
+            return round(float(rng.uniform(self.domain[0], self.domain[1])), self.digits)
+        if self.type == "i":
+            return int(rng.integers(self.domain[0], self.domain[1] + 1))
+        return self.domain[rng.integers(len(self.domain))]
+
+    def sample_around(self, value, spread: float, rng: np.random.Generator):
+        if not self.is_numeric:
+            # Keep the elite's value most of the time
+            return value if rng.random() < 1 - spread else self.sample_uniform(rng)
+        lower, upper = self.domain
+        sampled = float(np.clip(rng.normal(value, spread * (upper - lower)), lower, upper))
+        return round(sampled, self.digits) if self.type == "r" else int(round(sampled))
+
+
+@dataclass
+class Candidate:
+    id: int
+    configuration: dict
+    results: dict = field(default_factory=dict)  # block index -> cost
+
+
+def _parse_value(text: str):
+    text = text.strip().strip('"')
+    try:
+        return int(text)
+    except ValueError:
+        try:
+            return float(text)
+        except ValueError:
+            return text
+
+
+def read_parameters(parameters_file: str) -> list[Parameter]:
+    parameters = []
+    digits = 4
+    with open(parameters_file) as file:
+        lines = file.readlines()
+    for line in lines:
+        match = re.match(r"\s*digits\s*=\s*(\d+)", line)
+        if match:
+            digits = int(match.group(1))
+    for line in lines:
+        line = line.split("#")[0].strip()
+        if line.startswith("["):
+            break
+        match = re.match(r'(\w+)\s+"([^"]*)"\s+([rico])\s+\(([^)]*)\)', line)
+        if match is None:
+            continue
+        name, switch, parameter_type, values = match.groups()
+        domain = tuple(_parse_value(value) for value in values.split(","))
+        parameters.append(Parameter(name, switch.strip(), parameter_type, domain, digits))
+    return parameters
+
+
+def read_scenario_option(scenario_file: str, option: str) -> Optional[str]:
+    with open(scenario_file) as file:
+        for line in file:
+            match = re.match(rf"\s*{option}\s*=\s*(.+)", line.split("#")[0])
+            if match:
+                return match.group(1).strip().strip('"')
+    return None
+
+
+def read_instances(instances_file: str) -> list[str]:
+    with open(instances_file) as file:
+        return [line.split("#")[0].strip() for line in file if line.split("#")[0].strip()]
+
+
+def evaluate_candidate(configuration: dict, instance: str, seed: int) -> float:
+    from simulation import run_irace_compatible_base_simulation
+
+    return float(run_irace_compatible_base_simulation(**configuration, seed=seed, instance=instance))
+
+
+def eliminate(alive: list[Candidate], blocks: list[int], significance_level: float) -> list[Candidate]:
+    """Returns the candidates that are not significantly worse than the best one on the common blocks."""
+    costs = np.array([[candidate.results[block] for candidate in alive] for block in blocks])
+    number_of_blocks, number_of_candidates = costs.shape
+
+    if number_of_candidates == 2:
+        differences = costs[:, 0] - costs[:, 1]
+        if np.all(differences == 0) or wilcoxon(costs[:, 0], costs[:, 1]).pvalue > significance_level:
+            return alive
+        return [alive[0]] if costs[:, 0].mean() < costs[:, 1].mean() else [alive[1]]
+
+    # Friedman test on the ranks within every block
+    ranks = np.apply_along_axis(rankdata, 1, costs)
+    rank_sums = ranks.sum(axis=0)
+    a = np.sum(ranks**2)
+    c = number_of_blocks * number_of_candidates * (number_of_candidates + 1) ** 2 / 4
+    if a == c:
+        return alive
+    statistic = (number_of_candidates - 1) * np.sum(
+        (rank_sums - number_of_blocks * (number_of_candidates + 1) / 2) ** 2
+    ) / (a - c)
+    if statistic <= chi2.ppf(1 - significance_level, number_of_candidates - 1):
+        return alive
+
+    # Conover post-hoc test against the best candidate
+    degrees_of_freedom = (number_of_blocks - 1) * (number_of_candidates - 1)
+    critical_difference = t.ppf(1 - significance_level / 2, degrees_of_freedom) * math.sqrt(
+        max(0.0, 2 * number_of_blocks * (1 - statistic / (number_of_blocks * (number_of_candidates - 1))) * (a - c))
+        / degrees_of_freedom
+    )
+    best_rank_sum = rank_sums.min()
+    return [
+        candidate
+        for candidate, rank_sum in zip(alive, rank_sums)
+        if rank_sum - best_rank_sum <= critical_difference
+    ]
+
+
+def mean_ranks(candidates: list[Candidate], blocks: list[int]) -> np.ndarray:
+    costs = np.array([[candidate.results[block] for candidate in candidates] for block in blocks])
+    return np.apply_along_axis(rankdata, 1, costs).mean(axis=0)
+
+
+class RaceTuner:
+    def __init__(
+        self,
+        parameters: list[Parameter],
+        instances: list[str],
+        max_experiments: int,
+        processes: Optional[int] = None,
+        seed: Optional[int] = None,
+        first_test: int = 5,
+        each_test: int = 1,
+        significance_level: float = 0.05,
+    ):
+        self.parameters = parameters
+        self.instances = instances
+        self.max_experiments = max_experiments
+        self.processes = processes
+        self.rng = np.random.default_rng(seed)
+        self.first_test = first_test
+        self.each_test = each_test
+        self.significance_level = significance_level
+        # Same defaults as irace
+        self.number_of_iterations = 2 + int(math.log2(len(parameters)))
+        self.min_survivors = 2 + int(math.log2(len(parameters)))
+        self.experiments_used = 0
+        self.next_candidate_id = 1
+        self.blocks = []  # (instance, seed) per block
+
+    def block(self, block_index: int) -> tuple[str, int]:
+        while len(self.blocks) <= block_index:
+            self.blocks.append(
+                (self.instances[len(self.blocks) % len(self.instances)], int(self.rng.integers(2**31 - 1)))
+            )
+        return self.blocks[block_index]
+
+    def sample_candidates(self, number: int, elites: list[Candidate], iteration: int) -> list[Candidate]:
+        candidates = []
+        for _ in range(number):
+            if not elites:
+                configuration = {parameter.name: parameter.sample_uniform(self.rng) for parameter in self.parameters}
+            else:
+                # Better elites (earlier in the list) are chosen more often
+                weights = np.arange(len(elites), 0, -1, dtype=float)
+                elite = elites[self.rng.choice(len(elites), p=weights / weights.sum())]
+                spread = 0.5 ** (iteration + 1)
+                configuration = {
+                    parameter.name: parameter.sample_around(elite.configuration[parameter.name], spread, self.rng)
+                    for parameter in self.parameters
+                }
+            candidates.append(Candidate(self.next_candidate_id, configuration))
+            self.next_candidate_id += 1
+        return candidates
+
+    def race(self, candidates: list[Candidate], budget: int, executor: ProcessPoolExecutor) -> list[Candidate]:
+        alive = candidates
+        block_index = 0
+        while len(alive) > self.min_survivors and budget >= len(alive):
+            instance, seed = self.block(block_index)
+            to_evaluate = [candidate for candidate in alive if block_index not in candidate.results]
+            futures = [
+                executor.submit(evaluate_candidate, candidate.configuration, instance, seed)
+                for candidate in to_evaluate
+            ]
+            for candidate, future in zip(to_evaluate, futures):
+                candidate.results[block_index] = future.result()
+            budget -= len(to_evaluate)
+            self.experiments_used += len(to_evaluate)
+            block_index += 1
+
+            if block_index >= self.first_test and (block_index - self.first_test) % self.each_test == 0:
+                alive = eliminate(alive, list(range(block_index)), self.significance_level)
+            print(f"Block {block_index}: {len(alive)} candidates alive, {self.experiments_used} experiments used.")
+
+        common_blocks = [
+            block for block in range(block_index) if all(block in candidate.results for candidate in alive)
+        ]
+        if common_blocks:
+            alive = [alive[i] for i in np.argsort(mean_ranks(alive, common_blocks), kind="stable")]
+        return alive
+
+    def tune(self) -> list[Candidate]:
+        elites = []
+        with ProcessPoolExecutor(self.processes) as executor:
+            for iteration in range(self.number_of_iterations):
+                remaining_budget = self.max_experiments - self.experiments_used
+                iteration_budget = remaining_budget // (self.number_of_iterations - iteration)
+                number_of_candidates = iteration_budget // (self.first_test + min(5, iteration))
+                number_of_new_candidates = number_of_candidates - len(elites)
+                if number_of_new_candidates <= 0 or iteration_budget < self.first_test * number_of_candidates:
+                    break
+                print(f"Iteration {iteration + 1}: {number_of_candidates} candidates, budget {iteration_budget}.")
+                # Elites keep their results, they only need the new blocks
+                candidates = elites + self.sample_candidates(number_of_new_candidates, elites, iteration)
+                elites = self.race(candidates, iteration_budget, executor)[: self.min_survivors]
+        return elites
+
+
+def write_elites(elites: list[Candidate], parameters: list[Parameter], output_file: str) -> None:
+    names = [parameter.name for parameter in parameters]
+    with open(output_file, "w") as file:
+        file.write(" ".join(names) + "\n")
+        for elite in elites:
+            file.write(" ".join(str(elite.configuration[name]) for name in names) + "\n")
+
+
+if __name__ == "__main__":
+    sys.path.append(os.path.dirname(TUNING_DIR))
+
+    parser = argparse.ArgumentParser(description="Parallel iterated racing tuner.")
+    parser.add_argument("--parameters", default=os.path.join(TUNING_DIR, "parameters.txt"))
+    parser.add_argument("--instances", default=os.path.join(TUNING_DIR, "instances.txt"))
+    parser.add_argument("--scenario", default=os.path.join(TUNING_DIR, "scenario.txt"))
+    parser.add_argument("--max-experiments", type=int, default=None, help="Defaults to maxExperiments of the scenario.")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--first-test", type=int, default=5)
+    parser.add_argument("--output", default=os.path.join(TUNING_DIR, "elite_configurations.txt"))
+    arguments = parser.parse_args()
+
+    max_experiments = arguments.max_experiments or int(read_scenario_option(arguments.scenario, "maxExperiments"))
+    parameters = read_parameters(arguments.parameters)
+    tuner = RaceTuner(
+        parameters,
+        read_instances(arguments.instances),
+        max_experiments,
+        processes=arguments.processes,
+        seed=arguments.seed,
+        first_test=arguments.first_test,
+    )
+    elites = tuner.tune()
+    write_elites(elites, parameters, arguments.output)
+    print(f"Elite configurations written to {arguments.output}:")
+    for elite in elites:
+        print(elite.id, elite.configuration)
@@ -15,14 +15,19 @@
 # RETURN VALUE:
 # This script should print one numerical value: the cost that must be minimized.
 # Exit with 0 if no error, with 1 in case of error
+#
+# If the worker service (tuning/worker_service.py) is running, the configuration
+# is forwarded to it over its Unix socket instead of importing and running the
+# simulation in this process. A socket file left behind by a crashed service
+# refuses the connection, the simulation then runs locally. The instance name
+# selects the problem (see simulation.tuning_problem).
 ###############################################################################
 
 import datetime
 import sys
 sys.path.append("..")
 
-
-from simulation import run_irace_compatible_base_simulation
+from tuning.worker_service import request_cost, worker_available, worker_socket_path
 
 # Useful function to print errors.
 def target_runner_error(msg):
@@ -40,7 +45,7 @@ if __name__=='__main__':
     # Get the parameters as command line arguments.
     configuration_id = sys.argv[1]
     instance_id = sys.argv[2]
-    seed = sys.argv[3]
+    seed = int(sys.argv[3])
     instance = sys.argv[4]
     cand_params = sys.argv[5:]
 
@@ -81,8 +86,32 @@ if __name__=='__main__':
         sys.exit(1)
         
     
-    # Run iRace compatible version of the simulation    
-    result = run_irace_compatible_base_simulation(crossover_rate, mutation_rate, migration_pop_rate, migration_interval, starting_trust, auction_weight)
+    simulation_kwargs = dict(
+        crossover_rate=crossover_rate,
+        mutation_rate=mutation_rate,
+        migration_pop_rate=migration_pop_rate,
+        migration_interval=migration_interval,
+        starting_trust=starting_trust,
+        auction_weight=auction_weight,
+        seed=seed,
+        instance=instance,
+    )
+
+    socket_path = worker_socket_path()
+    result = None
+    if worker_available(socket_path):
+        # Forward to the warm worker service
+        try:
+            result = request_cost(socket_path, **simulation_kwargs)
+        except (ConnectionRefusedError, FileNotFoundError):
+            # Stale socket of a service that did not shut down cleanly
+            pass
+        except Exception as e:
+            target_runner_error(f"worker service failed: {e}")
+    if result is None:
+        # Run iRace compatible version of the simulation    
+        from simulation import run_irace_compatible_base_simulation
+        result = run_irace_compatible_base_simulation(**simulation_kwargs)
     print(result)
     
     sys.exit(0)
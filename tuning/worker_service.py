@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+###############################################################################
+# Long-lived worker service for the irace target runner.
+#
+# Start it once from the repository root before launching irace:
+#     python -m tuning.worker_service --slots 4
+#
+# It imports the simulation (jmetal, numpy, pandas, analysis parameters) once,
+# keeps a pool of `--slots` warm worker processes and serves evaluation
+# requests sent by target-runner.py over a Unix socket, so irace can run up to
+# `--slots` experiments in parallel (parallel = N in scenario.txt).
+#
+# PROTOCOL (one request per connection, both messages are one JSON line):
+#     request:  {"kwargs": {<run_irace_compatible_base_simulation arguments>}}
+#     response: {"cost": <float>} or {"error": "<message>"}
+#
+# Only standard library modules are imported at module level, so the client
+# side (target-runner.py) stays cheap to start.
+###############################################################################
+
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+
+DEFAULT_SOCKET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "target-runner.sock")
+SOCKET_PATH_ENV_VARIABLE = "TB_IMGA_WORKER_SOCKET"
+
+
+def worker_socket_path() -> str:
+    return os.environ.get(SOCKET_PATH_ENV_VARIABLE, DEFAULT_SOCKET_PATH)
+
+
+def worker_available(socket_path: str) -> bool:
+    return hasattr(socket, "AF_UNIX") and os.path.exists(socket_path)
+
+
+def request_cost(socket_path: str, **kwargs) -> float:
+    """Client side: forwards the simulation arguments to the worker service and returns the cost."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall((json.dumps({"kwargs": kwargs}) + "\n").encode())
+        response = json.loads(client.makefile("r").readline())
+    if "error" in response:
+        raise RuntimeError(response["error"])
+    return response["cost"]
+
+
+def evaluate(kwargs: dict) -> float:
+    from simulation import run_irace_compatible_base_simulation
+
+    return float(run_irace_compatible_base_simulation(**kwargs))
+
+
+class WorkerRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            cost = self.server.executor.submit(evaluate, request["kwargs"]).result()
+            response = {"cost": cost}
+        except Exception as e:
+            response = {"error": f"{type(e).__name__}: {e}"}
+        self.wfile.write((json.dumps(response) + "\n").encode())
+
+
+class WorkerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, executor):
+        self.executor = executor
+        super().__init__(socket_path, WorkerRequestHandler)
+
+
+def _warm_up(_):
+    return os.getpid()
+
+
+def _stop_on_terminate(signum, frame):
+    raise KeyboardInterrupt
+
+
+def serve(socket_path: str, slots: int) -> None:
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Warm up in the parent, forked workers inherit the imported modules.
+    import simulation  # noqa: F401
+
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+
+    with ProcessPoolExecutor(slots) as executor:
+        # Fork all workers up front, before any request handling thread exists
+        list(executor.map(_warm_up, range(slots)))
+        signal.signal(signal.SIGTERM, _stop_on_terminate)
+        server = WorkerServer(socket_path, executor)
+        print(f"Worker service listening on {socket_path} with {slots} slots.")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("Worker service stopped by user.")
+        finally:
+            server.server_close()
+            os.remove(socket_path)
+
+
+if __name__ == "__main__":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    parser = argparse.ArgumentParser(description="Persistent worker service for the irace target runner.")
+    parser.add_argument("--socket", default=worker_socket_path(), help="Unix socket path to listen on.")
+    parser.add_argument("--slots", type=int, default=os.cpu_count(), help="Number of concurrent evaluations.")
+    arguments = parser.parse_args()
+
+    serve(arguments.socket, arguments.slots)